@@ -0,0 +1,65 @@
+import math
+import os
+import sys
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.models.pokemon import Pokemon
+from game.models.trainer import Player
+from game.logic.battle import Battle
+from game.logic.ai import random_player
+from game.logic.simulation import run_headless_battle
+from game.logic.batch_battle import BatchBattle, random_encounters
+
+# Throughput of the lockstep batch engine, and a statistical check against the scalar Battle.
+PARTY = [("Pyron", 6), ("Rattatak", 5)]
+ENCOUNTERS = (["Zappet", "Slimer"], 5, 6) # Route 2 grass
+BATCH_SIZE = 100000
+SCALAR_BATTLES = 20000
+
+def run_scalar(wild_specs, seed=0):
+    wins = 0
+    turns = []
+    for i, (species, level) in enumerate(wild_specs):
+        player = Player("Ash", PARTY)
+        battle = Battle(player, Pokemon(species, level=level), is_wild=True, link_battle=True, seed=seed + i, quiet=True)
+        turns.append(run_headless_battle(battle, random_player))
+        wins += battle.won
+    return wins, turns
+
+def z_two_proportions(w1, n1, w2, n2):
+    p = (w1 + w2) / (n1 + n2)
+    se = math.sqrt(p * (1 - p) * (1 / n1 + 1 / n2))
+    return (w1 / n1 - w2 / n2) / se if se > 0 else 0.0
+
+def main():
+    wild = random_encounters(*ENCOUNTERS, BATCH_SIZE, seed=1)
+    start = time.perf_counter()
+    batch = BatchBattle(PARTY, wild, player_policy="random", seed=2)
+    res = batch.run()
+    elapsed = time.perf_counter() - start
+    print(f"Batch engine: {BATCH_SIZE} battles in {elapsed:.3f}s -> {BATCH_SIZE / elapsed:,.0f} battles/sec (incl. setup)")
+
+    scalar_wild = wild[:SCALAR_BATTLES]
+    start = time.perf_counter()
+    wins, turns = run_scalar(scalar_wild)
+    elapsed = time.perf_counter() - start
+    print(f"Scalar Battle: {SCALAR_BATTLES} battles in {elapsed:.3f}s -> {SCALAR_BATTLES / elapsed:,.0f} battles/sec")
+
+    # Win rate: two-proportion z test; turns: Welch z on the means
+    z_win = z_two_proportions(res['wins'], res['battles'], wins, SCALAR_BATTLES)
+    b_turns = res['turns']
+    s_mean = sum(turns) / len(turns)
+    s_var = sum((t - s_mean) ** 2 for t in turns) / (len(turns) - 1)
+    se = math.sqrt(b_turns.var(ddof=1) / len(b_turns) + s_var / len(turns))
+    z_turns = (b_turns.mean() - s_mean) / se if se > 0 else 0.0
+    print(f"Win rate:   batch {res['win_rate']:.4f}  scalar {wins / SCALAR_BATTLES:.4f}  z={z_win:+.2f}")
+    print(f"Mean turns: batch {b_turns.mean():.4f}  scalar {s_mean:.4f}  z={z_turns:+.2f}")
+    ok = abs(z_win) < 3 and abs(z_turns) < 3
+    print("Statistically consistent (|z| < 3):", "yes" if ok else "NO")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
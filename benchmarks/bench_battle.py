@@ -0,0 +1,215 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.models.pokemon import Pokemon
+from game.models.trainer import Player, Trainer
+from game.logic.battle import Battle
+from game.logic.ai import greedy_player, random_player, random_opponent
+from game.logic.exploration import ExplorationLogic
+from game.logic.simulation import run_headless_battle
+from game.logic.instrumentation import BattleProfiler
+
+# Throughput benchmark suite for game.logic.battle.
+# Reports ops/sec, p50/p99 latency and peak traced bytes per op (tracemalloc high-water mark above
+# the starting point, not an allocation count), and saves/compares a JSON baseline:
+#   python benchmarks/bench_battle.py --runs 5 --save benchmarks/baseline.json
+#   python benchmarks/bench_battle.py --runs 5 --compare benchmarks/baseline.json
+# --runs N repeats the whole suite and keeps the median of every number (single runs are noisy).
+#   python benchmarks/bench_battle.py --profile     (per-phase breakdown of the story trainer battles)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+PARTY = [("Pyronite", 12), ("Zappet", 10), ("Aquade", 9)]
+INVENTORY = {"Potion": 99, "Super Potion": 99, "Pokeball": 99}
+# Bulky mirror match (link battle, ~40 turns): dominated by move execution
+LONG_PARTY = [("Geodon", 40), ("Geodon", 40), ("Rattitan", 40)]
+
+def make_player(party=PARTY):
+    player = Player("Ash", party)
+    player.inventory = dict(INVENTORY)
+    return player
+
+def story_trainers():
+    """The story trainers as ExplorationLogic builds them, in story order."""
+    player = make_player()
+    trainers = []
+    player.current_location = "Route 1"
+    trainers.append(ExplorationLogic.explore(player)["event"]["opponent"])
+    player.current_location = "Viridian City"
+    trainers.append(ExplorationLogic.challenge_gym(player)["event"]["opponent"])
+    player.story_flags["gym1_beaten"] = True
+    trainers.append(ExplorationLogic.travel(player, "Route 2")["event"]["opponent"])
+    player.current_location = "Route 2"
+    trainers.append(ExplorationLogic.travel(player, "Rocket Hideout")["event"]["opponent"])
+    player.current_location = "Rocket Hideout"
+    player.story_flags["grunt_defeated"] = True
+    trainers.append(ExplorationLogic.explore(player)["event"]["opponent"])
+    return trainers
+
+def trainer_battle(trainer, seed, profiler=None):
+    # Search AIs are benchmarked separately (bench_expectimax.py); measure the engine with random moves
+    opponent = Trainer(trainer.name, [(m.species, m.level) for m in trainer.pokemon])
+    return Battle(make_player(), opponent, opponent_ai=random_opponent, seed=seed, quiet=True, profiler=profiler)
+
+def long_battle(seed):
+    return Battle(make_player(LONG_PARTY), Trainer("Mirror", LONG_PARTY), link_battle=True, opponent_ai=random_opponent,
+                  seed=seed, quiet=True)
+
+def wild_battle(seed, species="Rattatak", level=3):
+    return Battle(make_player([("Pyron", 5)]), Pokemon(species, level=level), is_wild=True, seed=seed, quiet=True)
+
+# Cases: name -> (unit, units_per_op, setup() -> state, op(state)); only op is timed.
+# Turn cases restore a snapshot inside op (about 1 us) so every turn starts from the same state.
+
+def _turn_case(make_battle, make_action):
+    def setup():
+        battle = make_battle()
+        return battle, battle.snapshot(), make_action(battle)
+    def op(state):
+        battle, snap, action = state
+        battle.restore(snap)
+        battle.execute_turn(action)
+    return setup, op
+
+def build_cases():
+    trainers = story_trainers()
+    rocky = trainers[1]
+    seeds = iter(range(10**9))
+    cases = {}
+    cases["init_trainer"] = ("battles", 1, lambda: (make_player(), rocky),
+                             lambda s: Battle(s[0], s[1], opponent_ai=random_opponent, seed=1, quiet=True))
+    cases["init_wild"] = ("battles", 1, lambda: (make_player(), Pokemon("Rattatak", level=3)),
+                          lambda s: Battle(s[0], s[1], is_wild=True, seed=1, quiet=True))
+    cases["turn_fight"] = ("turns", 1) + _turn_case(lambda: trainer_battle(rocky, 2),
+                                                    lambda b: ("fight", b.active_player_mon.moves[0]))
+    cases["turn_item"] = ("turns", 1) + _turn_case(lambda: trainer_battle(rocky, 3),
+                                                   lambda b: ("item", "Potion", b.active_player_mon))
+    cases["turn_switch"] = ("turns", 1) + _turn_case(lambda: trainer_battle(rocky, 4),
+                                                     lambda b: ("switch", b.player.pokemon[1]))
+    cases["turn_run"] = ("turns", 1) + _turn_case(lambda: wild_battle(5), lambda b: ("run",))
+    cases["full_wild_battle"] = ("battles", 1, lambda: None,
+                                 lambda _: run_headless_battle(wild_battle(next(seeds), "Wingon", 4), greedy_player))
+    # One op plays every story trainer once
+    cases["full_trainer_battle"] = ("battles", len(trainers), lambda: trainers,
+                                    lambda ts: [run_headless_battle(trainer_battle(t, next(seeds)), greedy_player)
+                                                for t in ts])
+    cases["long_trainer_battle"] = ("battles", 1, lambda: None,
+                                    lambda _: run_headless_battle(long_battle(next(seeds)), random_player))
+    return cases
+
+def _percentile(sorted_values, q):
+    idx = min(len(sorted_values) - 1, int(q * len(sorted_values)))
+    return sorted_values[idx]
+
+def run_case(unit, units_per_op, setup, op, iterations, alloc_iterations):
+    state = setup()
+    op(state) # warm up caches
+    latencies = []
+    for _ in range(iterations):
+        t0 = time.perf_counter_ns()
+        op(state)
+        latencies.append(time.perf_counter_ns() - t0)
+    latencies.sort()
+    total_s = sum(latencies) / 1e9
+
+    # Separate pass: tracemalloc slows everything down, so it never overlaps the timing pass
+    tracemalloc.start()
+    peaks = []
+    for _ in range(alloc_iterations):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        op(state)
+        peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    tracemalloc.stop()
+
+    return {
+        'unit': unit,
+        'per_sec': iterations * units_per_op / total_s if total_s > 0 else 0.0,
+        'p50_us': _percentile(latencies, 0.50) / 1000.0,
+        'p99_us': _percentile(latencies, 0.99) / 1000.0,
+        'peak_bytes_per_op': sum(peaks) / len(peaks)
+    }
+
+def _median_results(runs):
+    """Per case, the median of every number over several suite runs."""
+    merged = {}
+    for name, first in runs[0].items():
+        merged[name] = {key: (statistics.median(r[name][key] for r in runs) if isinstance(value, (int, float)) else value)
+                        for key, value in first.items()}
+    return merged
+
+def run_suite(iterations=2000, alloc_iterations=200, only=None, runs=1):
+    all_runs = []
+    for _ in range(runs):
+        results = {}
+        for name, (unit, units_per_op, setup, op) in build_cases().items():
+            if only and name not in only:
+                continue
+            n = iterations // 10 if name.startswith("full_") else iterations
+            results[name] = run_case(unit, units_per_op, setup, op, max(n, 10), alloc_iterations)
+        all_runs.append(results)
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'runs': runs
+        },
+        'results': _median_results(all_runs)
+    }
+
+def profile_story(battles_per_trainer=200):
+    profiler = BattleProfiler()
+    seed = 0
+    for trainer in story_trainers():
+        for _ in range(battles_per_trainer):
+            run_headless_battle(trainer_battle(trainer, seed, profiler), greedy_player)
+            seed += 1
+    return profiler
+
+def print_results(report, baseline=None):
+    base = baseline['results'] if baseline else {}
+    print(f"{'case':<22} {'rate':>14} {'p50 us':>10} {'p99 us':>10} {'peak B/op':>11}  vs baseline")
+    for name, r in report['results'].items():
+        diff = ""
+        if name in base and base[name]['per_sec'] > 0:
+            change = (r['per_sec'] / base[name]['per_sec'] - 1) * 100
+            diff = f"{change:+.1f}% rate, p99 {base[name]['p99_us']:.1f} -> {r['p99_us']:.1f} us"
+        rate = f"{r['per_sec']:,.0f} {r['unit']}/s"
+        print(f"{name:<22} {rate:>14} {r['p50_us']:>10.1f} {r['p99_us']:>10.1f} {r['peak_bytes_per_op']:>11.0f}  {diff}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Battle engine throughput benchmarks")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--save", nargs="?", const=DEFAULT_BASELINE, help="write results as the JSON baseline")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, help="compare against a JSON baseline")
+    parser.add_argument("--only", nargs="*", help="run only these cases")
+    parser.add_argument("--runs", type=int, default=1, help="repeat the suite and report medians")
+    parser.add_argument("--profile", action="store_true", help="print a per-phase profile instead")
+    args = parser.parse_args()
+
+    if args.profile:
+        print(profile_story().format_summary())
+        return
+
+    report = run_suite(args.iterations, only=args.only, runs=args.runs)
+    baseline = None
+    if args.compare and os.path.exists(args.compare):
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+    print_results(report, baseline)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=4, sort_keys=True)
+        print(f"Baseline saved to {args.save}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import os
+import sys
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.models.trainer import Player, Trainer
+from game.logic.battle import Battle
+from game.logic.ai import ExpectimaxAI
+
+# Measures expectimax search cost per decision, to pick a depth that fits a 16 ms frame.
+FRAME_MS = 16.0
+MATCHUPS = [
+    ("Pyron lv11 vs Gym Leader Rocky", [("Pyron", 11)], [("Geon", 8), ("Geodon", 12)]),
+    ("Aquaria lv14 vs Rocket Boss", [("Aquaria", 14)], [("Slimer", 9), ("Florac", 12)]),
+    ("Zappet lv12 vs Slimer lv11", [("Zappet", 12)], [("Slimer", 11)]),
+]
+
+def bench(max_depth, repeats=5):
+    rows = []
+    for label, team_a, team_b in MATCHUPS:
+        times = []
+        nodes = 0
+        for _ in range(repeats):
+            ai = ExpectimaxAI(max_depth=max_depth, max_nodes=None) # cold transposition table
+            battle = Battle(Player("A", team_a), Trainer("B", team_b), opponent_ai=ai, seed=1, quiet=True)
+            start = time.perf_counter()
+            ai(battle)
+            times.append((time.perf_counter() - start) * 1000.0)
+            nodes = ai.last_stats['nodes']
+        best = min(times)
+        rows.append((label, nodes, best, nodes / (best / 1000.0) if best > 0 else 0.0))
+    return rows
+
+def main():
+    print(f"{'depth':>5}  {'matchup':<32} {'nodes':>8} {'ms':>9} {'nodes/s':>10}  fits {FRAME_MS:.0f} ms")
+    for depth in (1, 2, 3):
+        for label, nodes, ms, nps in bench(depth):
+            fits = "yes" if ms <= FRAME_MS else "no"
+            print(f"{depth:>5}  {label:<32} {nodes:>8} {ms:>9.2f} {nps:>10.0f}  {fits}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.models.pokemon import Pokemon
+from game.models.trainer import Player
+from game.logic.exploration import ExplorationLogic
+
+# Footprint and construction cost of game.models.pokemon.Pokemon, for 100k instances (a farmed storage
+# box times a few hundred, or one simulator sweep):
+#   python benchmarks/bench_pokemon.py --save      (writes benchmarks/pokemon_baseline.json)
+#   python benchmarks/bench_pokemon.py --compare
+# bytes/mon is everything a Pokemon keeps alive (instance, attribute dict if any, moves list),
+# measured with tracemalloc; shared strings and ints are not counted.
+# Also: wild spawns through ExplorationLogic.explore (a fresh Pokemon per encounter) and level-ups.
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pokemon_baseline.json")
+N = 100_000
+# Mixed storage box: low and high levels, so move lists have 1 to 4 entries
+SPECIES = [("Rattatak", 3), ("Pyronite", 20), ("Geodon", 40), ("Zappet", 8), ("Florac", 15)]
+
+def make_mons(n=N):
+    return [Pokemon(*SPECIES[i % len(SPECIES)]) for i in range(n)]
+
+def measure_memory(n=N):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    mons = make_mons(n)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    container = sys.getsizeof(mons)
+    del mons
+    return (after - before - container) / n
+
+def measure_construction(n=N, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        make_mons(n)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def measure_access(n=N, repeat=5):
+    """Reads the stats the battle engine touches every move, over the whole box."""
+    mons = make_mons(n)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for mon in mons:
+            mon.current_hp; mon.max_hp; mon.attack; mon.defense; mon.speed; mon.type; mon.status
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def measure_wild_spawn(n=N, repeat=5):
+    """ExplorationLogic.explore on Route 1 and Route 2 with a seeded stream: the per-encounter cost."""
+    player = Player("Ash", [("Pyronite", 12)])
+    player.story_flags["joey_defeated"] = True
+    best = float("inf")
+    for _ in range(repeat):
+        rng = random.Random(1)
+        start = time.perf_counter()
+        for loc in ("Route 1", "Route 2"):
+            player.current_location = loc
+            for _ in range(n // 2):
+                ExplorationLogic.explore(player, rng)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def measure_level_up(n=N // 10, repeat=5):
+    """gain_exp from level 5 to 30 (level-up moves and an evolution on the way)."""
+    best = float("inf")
+    for _ in range(repeat):
+        mons = [Pokemon("Pyron", 5) for _ in range(n)]
+        start = time.perf_counter()
+        for mon in mons:
+            while mon.level < 30:
+                mon.gain_exp(mon.exp_to_next)
+        best = min(best, time.perf_counter() - start)
+    return best / (n * 25)
+
+def run_suite(n=N):
+    construct = measure_construction(n)
+    access = measure_access(n)
+    return {
+        'n': n,
+        'bytes_per_mon': round(measure_memory(n), 1),
+        'construct_s': construct,
+        'construct_us_per_mon': construct / n * 1e6,
+        'access_ns_per_mon': access / n * 1e9,
+        'wild_spawn_us': measure_wild_spawn(n) / n * 1e6,
+        'level_up_us': measure_level_up(n // 10) * 1e6
+    }
+
+def print_results(report, baseline=None):
+    base = baseline['results'] if baseline else {}
+    print(f"{report['n']} Pokemon")
+    for key, label in (('bytes_per_mon', "bytes/mon"), ('construct_us_per_mon', "construct us/mon"),
+                       ('access_ns_per_mon', "stat reads ns/mon"), ('wild_spawn_us', "wild spawn us"),
+                       ('level_up_us', "level-up us")):
+        line = f"  {label:<18} {report[key]:>10.2f}"
+        if key in base:
+            line += f"   baseline {base[key]:>10.2f}  ({report[key] / base[key] - 1:+.1%})"
+        print(line)
+    print(f"  construct total    {report['construct_s'] * 1000:>10.1f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Pokemon footprint and construction benchmark")
+    parser.add_argument("-n", type=int, default=N)
+    parser.add_argument("--save", nargs="?", const=DEFAULT_BASELINE, help="write results as the JSON baseline")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, help="compare against a JSON baseline")
+    args = parser.parse_args()
+
+    report = run_suite(args.n)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_results(report, baseline)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({
+                'meta': {
+                    'machine': platform.machine(),
+                    'python': platform.python_version(),
+                    'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S")
+                },
+                'results': report
+            }, f, indent=4, sort_keys=True)
+        print(f"Saved baseline to {args.save}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import copy
+import os
+import sys
+import timeit
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.models.pokemon import Pokemon
+from game.models.trainer import Player, Trainer
+from game.logic.battle import Battle
+
+# Cost of forking a Battle mid-fight: snapshot()/restore() against copy.deepcopy.
+
+def make_battle():
+    player = Player("Ash", [("Pyronite", 14), ("Zappet", 12), ("Aquade", 11), ("Slimer", 10)])
+    player.inventory = {"Potion": 5, "Super Potion": 3, "Pokeball": 10, "Antidote": 2}
+    # A farmed storage box makes deepcopy pay for everything the Player drags along
+    player.storage = [Pokemon("Rattatak", level=5) for _ in range(200)]
+    leader = Trainer("Gym Leader Rocky", [("Geon", 8), ("Geodon", 12)])
+    battle = Battle(player, leader, seed=1, quiet=True)
+    battle.execute_turn(("fight", "Flamethrower"))
+    return battle
+
+def main(number=2000):
+    battle = make_battle()
+    snap = battle.snapshot()
+
+    t_snap = min(timeit.repeat(battle.snapshot, number=number, repeat=5)) / number
+    t_restore = min(timeit.repeat(lambda: battle.restore(snap), number=number, repeat=5)) / number
+    t_deep = min(timeit.repeat(lambda: copy.deepcopy(battle), number=number // 20, repeat=3)) / (number // 20)
+
+    fork = t_snap + t_restore
+    print(f"snapshot():        {t_snap * 1e6:9.2f} us")
+    print(f"restore():         {t_restore * 1e6:9.2f} us")
+    print(f"snapshot+restore:  {fork * 1e6:9.2f} us")
+    print(f"copy.deepcopy:     {t_deep * 1e6:9.2f} us  ({t_deep / fork:.0f}x slower)")
+    print(f"snapshot size:     {len(repr(snap))} chars")
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 from game.models.move import Move
+from game.logic.effects import compile_moves
 
 # Predefined moves with types, power, accuracy, and potential effects
 moves = {
@@ -21,3 +22,6 @@ moves = {
     "Hydro Pump": Move("Hydro Pump", "Water", 90, 0.8),
     "Stun Spore": Move("Stun Spore", "Grass", 0, 0.75, effect="paralyze", effect_chance=1.0)
 }
+
+# Attach effect codes and handlers once, so battles never branch on effect strings
+compile_moves(moves)
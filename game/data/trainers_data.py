@@ -0,0 +1,68 @@
+# Story trainers, in story order: key -> trainer spec (see ExplorationLogic.story_trainer)
+# A party entry is (species, level). Trainers that counter the player's starter use a dict
+# starter type -> species instead of a species name ("default" covers every other type).
+STORY_TRAINERS = {
+    "joey": {
+        "name": "Youngster Joey",
+        "party": [("Rattatak", 3)],
+        "prize": 50
+    },
+    "rocky": {
+        "name": "Gym Leader Rocky",
+        "party": [("Geon", 8), ("Geodon", 12)],
+        "prize": 500,
+        "is_gym_leader": True,
+        "badge_reward": "Boulder Badge",
+        "ai": "expectimax"
+    },
+    "rival2": {
+        "name": None, # The player's rival_name
+        # Rival takes the type advantage over the player's starter
+        "party": [({"Fire": "Aquaria", "Water": "Florac", "default": "Pyronite"}, 11), ("Rattatak", 9)],
+        "prize": 300
+    },
+    "grunt": {
+        "name": "Team Rocket Grunt",
+        "party": [("Rattatak", 6), ("Wingon", 6)],
+        "prize": 200
+    },
+    "boss": {
+        "name": "Team Rocket Boss",
+        "party": [("Slimer", 9), ({"Fire": "Florac", "Water": "Pyronite", "default": "Aquaria"}, 12)],
+        "prize": 1000,
+        "ai": "expectimax"
+    }
+}
+
+# Starter species by type
+STARTERS = {
+    "Fire": "Pyron",
+    "Water": "Aquade",
+    "Grass": "Florin"
+}
+
+# Balancing (game.logic.balancer): party of a typical player when reaching each story fight,
+# and the player win rate that fight should have.
+# "starter" stands for the player's starter, evolved if the level is past its evolve_level.
+BALANCE_TARGETS = {
+    "joey": {
+        "party": [("starter", 5)],
+        "win_rate": 0.95
+    },
+    "rocky": {
+        "party": [("starter", 9), ("Rattatak", 5)],
+        "win_rate": 0.6
+    },
+    "rival2": {
+        "party": [("starter", 11), ("Rattatak", 7)],
+        "win_rate": 0.65
+    },
+    "grunt": {
+        "party": [("starter", 11), ("Rattatak", 7), ("Zappet", 6)],
+        "win_rate": 0.85
+    },
+    "boss": {
+        "party": [("starter", 13), ("Rattitan", 9), ("Zappet", 8)],
+        "win_rate": 0.5
+    }
+}
@@ -0,0 +1,285 @@
+import time
+from game.data.moves_data import moves
+from game.logic.damage_calc import expected_damage, hit_distribution
+from game.logic.effects import STATUS_NAMES, STATUS_CODES, PARALYZED, PARALYSIS_SKIP, END_OF_TURN, TICK_DIVISOR
+
+# Battle AI policies.
+# Opponent policies are callables(battle) -> move_name and can be passed to Battle(opponent_ai=...).
+# Player policies are callables(battle) -> action tuple accepted by Battle.execute_turn.
+
+def greedy_move(attacker, defender):
+    """Picks the move with the highest expected damage, overkill ignored (first move wins ties)."""
+    best_move = None
+    best_damage = -1
+    for move_name in attacker.moves:
+        dmg = expected_damage(move_name, attacker, defender, cap=max(1, defender.current_hp))
+        if dmg > best_damage:
+            best_move = move_name
+            best_damage = dmg
+    return best_move
+
+def random_opponent(battle):
+    return battle.rng.choice(battle.active_opponent_mon.moves)
+
+def greedy_opponent(battle):
+    return greedy_move(battle.active_opponent_mon, battle.active_player_mon)
+
+def random_player(battle):
+    return ("fight", battle.rng.choice(battle.active_player_mon.moves))
+
+def greedy_player(battle):
+    return ("fight", greedy_move(battle.active_player_mon, battle.active_opponent_mon))
+
+# --- Expectimax search ---
+
+FAINT_BONUS = 0.5
+# By status code; a status missing here fails at import instead of scoring as something else
+STATUS_PENALTY = tuple({None: 0.0, "poisoned": 0.1, "burned": 0.1, "paralyzed": 0.05}[name] for name in STATUS_NAMES)
+TICK_STATUSES = frozenset(STATUS_CODES[name] for name in END_OF_TURN) # codes that take max_hp // TICK_DIVISOR
+STATUS_BITS = (len(STATUS_NAMES) - 1).bit_length()
+
+class _BudgetSpent(Exception):
+    pass
+
+class ExpectimaxAI:
+    """
+    Depth-limited expectimax opponent over the two active Pokemon.
+
+    Each search turn the opponent maximises, the player is assumed to answer with its best move
+    (minimising), and chance nodes cover speed order, paralysis, accuracy, damage rolls
+    (bucketed), status infliction and poison/burn ticks.
+    States are (player_hp, player_status, opp_hp, opp_status); a transposition table keyed on
+    (state, depth) packed into one int (field widths sized from the matchup's max HP, the status
+    count and max_depth) is kept between decisions while the matchup stays the same.
+    Iterative deepening stops when a decision has expanded max_nodes nodes (None = always search
+    max_depth). The budget counts nodes, not time, so the chosen move depends only on the battle
+    state: same seed + same actions replays the battle exactly, whatever the machine load.
+    ~1000 nodes is about 10 ms here; wall time is only reported in the stats.
+    """
+    def __init__(self, max_depth=3, max_nodes=1000, damage_buckets=3, max_tt_entries=200000):
+        self.max_depth = max_depth
+        self._depth_bits = max(1, max_depth).bit_length()
+        self.max_nodes = max_nodes
+        self.damage_buckets = damage_buckets
+        self.max_tt_entries = max_tt_entries
+        self.tt = {}
+        self._context_key = None
+        self.last_stats = {}
+        self.total_nodes = 0
+        self.total_time = 0.0
+        self.decisions = 0
+
+    def __call__(self, battle):
+        opp = battle.active_opponent_mon
+        player = battle.active_player_mon
+        if player is None or player.current_hp <= 0 or len(opp.moves) <= 1:
+            return greedy_move(opp, player) if player else opp.moves[0]
+
+        start = time.perf_counter()
+        self._prepare(player, opp)
+        self._nodes = 0
+        self._tt_hits = 0
+        self._node_limit = self.max_nodes
+
+        state = (player.current_hp, STATUS_CODES.get(player.status, 0),
+                 opp.current_hp, STATUS_CODES.get(opp.status, 0))
+        best_move = greedy_move(opp, player)
+        depth_done = 0
+        for depth in range(1, self.max_depth + 1):
+            try:
+                _, move_idx = self._max_node(state, depth)
+            except _BudgetSpent:
+                break
+            best_move = self._opp_moves[move_idx]
+            depth_done = depth
+
+        elapsed = time.perf_counter() - start
+        self.total_nodes += self._nodes
+        self.total_time += elapsed
+        self.decisions += 1
+        self.last_stats = {
+            'move': best_move,
+            'depth': depth_done,
+            'nodes': self._nodes,
+            'tt_hits': self._tt_hits,
+            'tt_size': len(self.tt),
+            'elapsed_ms': elapsed * 1000.0,
+            'nodes_per_sec': self._nodes / elapsed if elapsed > 0 else 0.0
+        }
+        return best_move
+
+    def report(self):
+        """Cumulative search statistics over all decisions."""
+        return {
+            'decisions': self.decisions,
+            'nodes': self.total_nodes,
+            'elapsed_ms': self.total_time * 1000.0,
+            'nodes_per_sec': self.total_nodes / self.total_time if self.total_time > 0 else 0.0,
+            'mean_ms_per_decision': self.total_time * 1000.0 / self.decisions if self.decisions else 0.0
+        }
+
+    # Search model
+
+    def _prepare(self, player, opp):
+        key = (player.species, player.level, player.attack, player.defense, player.speed, player.max_hp,
+               tuple(player.moves), opp.species, opp.level, opp.attack, opp.defense, opp.speed, opp.max_hp,
+               tuple(opp.moves))
+        if key == self._context_key and len(self.tt) < self.max_tt_entries:
+            return # Same matchup: move tables and transposition table still valid
+        self._context_key = key
+        self.tt = {}
+        self._p_max = player.max_hp
+        self._o_max = opp.max_hp
+        self._hp_bits = max(player.max_hp, opp.max_hp).bit_length()
+        self._p_tick = max(1, player.max_hp // TICK_DIVISOR)
+        self._o_tick = max(1, opp.max_hp // TICK_DIVISOR)
+        self._opp_first = opp.speed > player.speed
+        self._opp_moves = list(opp.moves)
+        self._player_moves = list(player.moves)
+        self._opp_table = [self._move_outcomes(m, opp, player) for m in self._opp_moves]
+        self._player_table = [self._move_outcomes(m, player, opp) for m in self._player_moves]
+
+    def _move_outcomes(self, move_name, attacker, defender):
+        """(accuracy, [(damage, prob)], effect_code, effect_chance) with damage rolls bucketed."""
+        move = moves[move_name]
+        dist = hit_distribution(move_name, attacker.attack, defender.defense, defender.type)
+        buckets = []
+        n = self.damage_buckets
+        acc_p = 0.0; acc_d = 0.0; cum = 0.0; edge = 1
+        for dmg, p in dist:
+            acc_p += p; acc_d += dmg * p; cum += p
+            if cum >= edge / n - 1e-12:
+                buckets.append((int(round(acc_d / acc_p)), acc_p))
+                acc_p = 0.0; acc_d = 0.0
+                while edge < n and cum >= edge / n - 1e-12:
+                    edge += 1
+        if acc_p > 0:
+            buckets.append((int(round(acc_d / acc_p)), acc_p))
+        effect = move.effect_code
+        return (move.accuracy, buckets, effect, move.effect_chance if effect else 0.0)
+
+    def _tick(self):
+        self._nodes += 1
+        if self._node_limit is not None and self._nodes > self._node_limit:
+            raise _BudgetSpent()
+
+    def _max_node(self, state, depth):
+        php, pst, ohp, ost = state
+        # Keyed states are never fainted, so 0 < hp <= max_hp fits in _hp_bits
+        key = ((((php << STATUS_BITS | pst) << self._hp_bits | ohp) << STATUS_BITS | ost) << self._depth_bits) | depth
+        hit = self.tt.get(key)
+        if hit is not None:
+            self._tt_hits += 1
+            return hit
+        self._tick()
+        best = -1e9
+        best_idx = 0
+        for oi in range(len(self._opp_moves)):
+            worst = 1e9
+            for pi in range(len(self._player_moves)):
+                v = self._resolve_turn(state, oi, pi, depth)
+                if v < worst:
+                    worst = v
+                if worst <= best:
+                    break # Player already has an answer worse for us than the best move so far
+            if worst > best:
+                best = worst
+                best_idx = oi
+        result = (best, best_idx)
+        self.tt[key] = result
+        return result
+
+    def _resolve_turn(self, state, oi, pi, depth):
+        self._tick()
+        if self._opp_first:
+            first = (True, self._opp_table[oi]); second = (False, self._player_table[pi])
+        else:
+            first = (False, self._player_table[pi]); second = (True, self._opp_table[oi])
+        total = 0.0
+        for p1, s1 in self._attack(state, first[0], first[1]):
+            if s1[0] <= 0 or s1[2] <= 0:
+                total += p1 * self._evaluate(s1)
+                continue
+            for p2, s2 in self._attack(s1, second[0], second[1]):
+                if s2[0] <= 0 or s2[2] <= 0:
+                    total += p1 * p2 * self._evaluate(s2)
+                    continue
+                s3 = self._end_of_turn(s2)
+                if s3[0] <= 0 or s3[2] <= 0 or depth <= 1:
+                    total += p1 * p2 * self._evaluate(s3)
+                else:
+                    total += p1 * p2 * self._max_node(s3, depth - 1)[0]
+        return total
+
+    def _attack(self, state, opp_attacks, outcome):
+        """Chance outcomes of one move: list of (prob, new_state)."""
+        php, pst, ohp, ost = state
+        accuracy, buckets, effect, effect_chance = outcome
+        att_status = ost if opp_attacks else pst
+        def_hp = php if opp_attacks else ohp
+        def_status = pst if opp_attacks else ost
+        act = 1.0 - PARALYSIS_SKIP if att_status == PARALYZED else 1.0
+
+        results = []
+        miss = 1.0 - act * accuracy
+        if miss > 0:
+            results.append((miss, state))
+        for dmg, p in buckets:
+            p *= act * accuracy
+            hp = def_hp - dmg
+            if effect and def_status == 0 and hp > 0 and effect_chance > 0:
+                if effect_chance < 1.0:
+                    results.append((p * (1.0 - effect_chance), self._with_defender(state, opp_attacks, hp, def_status)))
+                results.append((p * effect_chance, self._with_defender(state, opp_attacks, hp, effect)))
+            else:
+                results.append((p, self._with_defender(state, opp_attacks, hp, def_status)))
+        return results
+
+    def _with_defender(self, state, opp_attacks, hp, status):
+        if opp_attacks:
+            return (hp, status, state[2], state[3])
+        return (state[0], state[1], hp, status)
+
+    def _end_of_turn(self, state):
+        php, pst, ohp, ost = state
+        if pst in TICK_STATUSES:
+            php -= self._p_tick
+        if ost in TICK_STATUSES:
+            ohp -= self._o_tick
+        return (php, pst, ohp, ost)
+
+    def _evaluate(self, state):
+        """Score from the opponent's point of view."""
+        php, pst, ohp, ost = state
+        value = max(0, ohp) / self._o_max - max(0, php) / self._p_max
+        if php <= 0:
+            value += FAINT_BONUS
+        else:
+            value += STATUS_PENALTY[pst]
+        if ohp <= 0:
+            value -= FAINT_BONUS
+        else:
+            value -= STATUS_PENALTY[ost]
+        return value
+
+# Registry so policies can be referred to by name (e.g. across process boundaries)
+PLAYER_POLICIES = {
+    "random": random_player,
+    "greedy": greedy_player
+}
+
+OPPONENT_POLICIES = {
+    "random": random_opponent,
+    "greedy": greedy_opponent
+}
+
+# Stateful opponent AIs get a fresh instance per battle
+OPPONENT_AI_CLASSES = {
+    "expectimax": ExpectimaxAI
+}
+
+def make_opponent_ai(name):
+    """Returns an opponent policy callable for a registry name (e.g. Trainer.ai)."""
+    if name in OPPONENT_AI_CLASSES:
+        return OPPONENT_AI_CLASSES[name]()
+    return OPPONENT_POLICIES[name]
@@ -0,0 +1,290 @@
+import hashlib
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from game.data.pokemon_data import species_data, type_effectiveness
+from game.data.moves_data import moves
+from game.data.trainers_data import STORY_TRAINERS, STARTERS, BALANCE_TARGETS
+from game.models.trainer import Trainer
+from game.logic.exploration import ExplorationLogic
+from game.logic.simulation import _run_chunk, MAX_TURNS
+from game.logic.tournament import _load_cache, _save_cache
+from game.logic.rng import spawn_seeds
+
+# Story trainer auto-balancer.
+# For every story fight in game.data.trainers_data.BALANCE_TARGETS, the typical player party plays
+# headless battles against the trainer with all its levels shifted by an offset, and the offset is
+# binary-searched until the player win rate is as close to the target as possible.
+# Win rate falls as the offset grows, so every search step halves the range; all fights are searched
+# at the same time and each step runs its battles in one shared process pool.
+# Results are cached on disk per (player party, trainer party, settings, data of the species and moves
+# involved), so after a data change only the matchups that actually changed are simulated again.
+#   python -m game.logic.balancer --battles 400
+
+BALANCE_CACHE = ".balance_cache.json"
+CACHE_VERSION = 1 # bump when the battle engine changes in a way that invalidates old results (data is in the key)
+MAX_OFFSET = 6
+Z_95 = 1.96
+
+def wilson_interval(wins, n, z=Z_95):
+    """Wilson score interval (low, high) of a win rate of wins / n (95% with the default z)."""
+    if n <= 0:
+        return 0.0, 1.0
+    p = wins / n
+    denom = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, center - half), min(1.0, center + half)
+
+def _evolved(species, level):
+    """Species a Pokemon of this line has at level (following level evolutions)."""
+    data = species_data[species]
+    while "evolve_level" in data and level >= data["evolve_level"]:
+        species = data["evolves_to"]
+        data = species_data[species]
+    return species
+
+def reference_party(key, starter_type):
+    """The typical player party at a story fight, as (species, level) tuples."""
+    party = []
+    for species, lvl in BALANCE_TARGETS[key]["party"]:
+        if species == "starter":
+            species = _evolved(STARTERS[starter_type], lvl)
+        party.append((species, lvl))
+    return party
+
+def _opponent_policy(trainer, story_ai):
+    # Search AIs spend a node budget on every move; greedy is a fast stand-in unless story_ai is set
+    if trainer.ai is None:
+        return "random"
+    return trainer.ai if story_ai else "greedy"
+
+def _move_fields(move):
+    return [move.type, move.power, move.accuracy, move.effect, move.effect_chance]
+
+def _data_digest(parties):
+    """Hash of the species_data entries (evolutions included), their moves and the type chart a matchup can use."""
+    species = set()
+    pending = [name for party in parties for name, _ in party]
+    while pending:
+        name = pending.pop()
+        if name in species:
+            continue
+        species.add(name)
+        if "evolves_to" in species_data[name]:
+            pending.append(species_data[name]["evolves_to"])
+    move_names = {move for name in species for learned in species_data[name]["moves"].values() for move in learned}
+    payload = json.dumps([{name: species_data[name] for name in species}, {name: _move_fields(moves[name]) for name in move_names},
+                          sorted([list(k), v] for k, v in type_effectiveness.items())],
+                         sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def _matchup_key(party, trainer_party, n_battles, player_policy, opponent_policy, max_turns):
+    payload = json.dumps([party, trainer_party], separators=(",", ":"))
+    data = _data_digest([party, trainer_party])
+    raw = f"{CACHE_VERSION}|{payload}|{data}|{n_battles}|{player_policy}|{opponent_policy}|{max_turns}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+class _Evaluator:
+    """Runs (story fight, level offset) points over every starter, through the cache."""
+    def __init__(self, starters, n_battles, workers, player_policy, story_ai, cache_path, max_turns):
+        self.starters = starters
+        self.n_battles = n_battles
+        self.workers = workers
+        self.player_policy = player_policy
+        self.story_ai = story_ai
+        self.cache_path = cache_path
+        self.max_turns = max_turns
+        self.cache = _load_cache(cache_path)
+        self.simulated = 0
+        self.cached = 0
+        self.results = {} # (key, offset) -> aggregated result
+
+    def evaluate(self, points):
+        """Makes sure every (key, offset) in points has a result. Returns self.results."""
+        jobs = []
+        job_owner = []
+        matchups = {}
+        for key, offset in points:
+            if (key, offset) in self.results:
+                continue
+            keys = []
+            for starter_type in self.starters:
+                party = reference_party(key, starter_type)
+                trainer = ExplorationLogic.story_trainer(key, starter_type, level_offset=offset)
+                trainer_party = [(mon.species, mon.level) for mon in trainer.pokemon]
+                opp_policy = _opponent_policy(trainer, self.story_ai)
+                mkey = _matchup_key(party, trainer_party, self.n_battles, self.player_policy, opp_policy,
+                                    self.max_turns)
+                keys.append(mkey)
+                if mkey in self.cache or mkey in matchups:
+                    continue
+                matchups[mkey] = []
+                # Seeds follow from the key, so a cached result is exactly what a re-run would give
+                seeds = spawn_seeds(int(mkey[:16], 16), self.n_battles)
+                n_chunks = max(1, min(self.n_battles, self.workers))
+                for i in range(n_chunks):
+                    jobs.append((party, Trainer(trainer.name, trainer_party), seeds[i::n_chunks],
+                                 self.player_policy, opp_policy, False, self.max_turns))
+                    job_owner.append(mkey)
+            self.results[(key, offset)] = keys
+
+        if self.workers == 1 or len(jobs) <= 1:
+            for owner, job in zip(job_owner, jobs):
+                matchups[owner].extend(_run_chunk(job))
+        elif jobs:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                for owner, chunk in zip(job_owner, pool.map(_run_chunk, jobs)):
+                    matchups[owner].extend(chunk)
+
+        for mkey, res in matchups.items():
+            self.cache[mkey] = {
+                'wins': sum(1 for r in res if r[0] == "a"),
+                'losses': sum(1 for r in res if r[0] == "b"),
+                'draws': sum(1 for r in res if r[0] is None),
+                'battles': len(res)
+            }
+        self.simulated += len(matchups)
+        # Saved after every search step, so an interrupted run keeps what it already simulated
+        if self.cache_path and matchups:
+            _save_cache(self.cache_path, self.cache)
+
+        # Aggregate the per-starter matchups of the new points
+        for point, value in self.results.items():
+            if not isinstance(value, list):
+                continue
+            wins = battles = draws = 0
+            for mkey in value:
+                m = self.cache[mkey]
+                wins += m['wins']; draws += m['draws']; battles += m['battles']
+                if mkey not in matchups:
+                    self.cached += 1
+            low, high = wilson_interval(wins, battles)
+            self.results[point] = {
+                'wins': wins,
+                'draws': draws,
+                'battles': battles,
+                'win_rate': wins / battles if battles else 0.0,
+                'low': low,
+                'high': high
+            }
+        return self.results
+
+def balance(keys=None, n_battles=400, workers=None, starters=None, player_policy="greedy", story_ai=False,
+            cache_path=BALANCE_CACHE, max_turns=MAX_TURNS, max_offset=MAX_OFFSET):
+    """
+    Searches the level offset of every story trainer that brings the player win rate closest to its target.
+    keys: story fights to balance (None = all of BALANCE_TARGETS, in story order).
+    n_battles: battles per matchup (one matchup per starter in starters, None = all STARTERS).
+    player_policy: name in game.logic.ai PLAYER_POLICIES.
+    story_ai: use the trainers' own search AI instead of the greedy stand-in (much slower).
+    max_offset: offsets are searched in [-max_offset, max_offset].
+
+    Returns a dictionary:
+    {
+        'trainers': { key: {
+            'name': str, 'target': float, 'offset': int,
+            'at_limit': bool,                                 # offset is +-max_offset, the target may be out of reach
+            'levels': list of (species, current level, recommended level),
+            'win_rate': float, 'low': float, 'high': float,   # at the recommended levels, 95% Wilson interval
+            'battles': int,
+            'current': {'win_rate', 'low', 'high'} or None,   # at the current levels, if it was evaluated
+            'curve': { offset: win_rate }                     # every offset the search evaluated
+        } },
+        'simulated': int, 'cached': int   # matchups simulated now / read from the cache
+    }
+    """
+    if keys is None:
+        keys = list(BALANCE_TARGETS)
+    if starters is None:
+        starters = list(STARTERS)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    evaluator = _Evaluator(starters, n_battles, workers, player_policy, story_ai, cache_path, max_turns)
+
+    # Binary search for the smallest offset whose win rate is at or below the target, all fights per step
+    searches = {key: [-max_offset, max_offset] for key in keys}
+    while True:
+        step = {key: (lo + hi) // 2 for key, (lo, hi) in searches.items() if lo < hi}
+        if not step:
+            break
+        results = evaluator.evaluate(step.items())
+        for key, mid in step.items():
+            if results[(key, mid)]['win_rate'] <= BALANCE_TARGETS[key]["win_rate"]:
+                searches[key][1] = mid
+            else:
+                searches[key][0] = mid + 1
+
+    # The answer is that offset or the one below it, whichever lands closer to the target
+    candidates = []
+    for key, (lo, _) in searches.items():
+        candidates.append((key, lo))
+        if lo > -max_offset:
+            candidates.append((key, lo - 1))
+        candidates.append((key, 0))
+    results = evaluator.evaluate(candidates)
+
+    trainers = {}
+    for key, (lo, _) in searches.items():
+        target = BALANCE_TARGETS[key]["win_rate"]
+        options = [lo] if lo == -max_offset else [lo, lo - 1]
+        best = min(options, key=lambda o: abs(results[(key, o)]['win_rate'] - target))
+        r = results[(key, best)]
+        spec = STORY_TRAINERS[key]
+        levels = []
+        for species, lvl in spec["party"]:
+            if isinstance(species, dict):
+                species = "/".join(species.values())
+            levels.append((species, lvl, max(1, lvl + best)))
+        current = results.get((key, 0))
+        trainers[key] = {
+            'name': spec["name"] or "Rival",
+            'target': target,
+            'offset': best,
+            'at_limit': abs(best) == max_offset,
+            'levels': levels,
+            'win_rate': r['win_rate'],
+            'low': r['low'],
+            'high': r['high'],
+            'battles': r['battles'],
+            'current': {'win_rate': current['win_rate'], 'low': current['low'], 'high': current['high']},
+            'curve': {o: res['win_rate'] for (k, o), res in sorted(results.items()) if k == key}
+        }
+    return {
+        'trainers': trainers,
+        'simulated': evaluator.simulated,
+        'cached': evaluator.cached
+    }
+
+def format_report(result):
+    """Recommended levels as text."""
+    lines = []
+    for key, t in result['trainers'].items():
+        cur = t['current']
+        lines.append(f"{t['name']} ({key}): target {t['target']:.0%}, now {cur['win_rate']:.1%} "
+                     f"[{cur['low']:.1%}, {cur['high']:.1%}]")
+        lines.append(f"  offset {t['offset']:+d} -> {t['win_rate']:.1%} [{t['low']:.1%}, {t['high']:.1%}] "
+                     f"over {t['battles']} battles" + (" (search limit reached)" if t['at_limit'] else ""))
+        for species, lvl, new_lvl in t['levels']:
+            lines.append(f"  {species:<24} lv{lvl:>3} -> lv{new_lvl:>3}")
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    import argparse
+    import time
+    parser = argparse.ArgumentParser(description="Recommend story trainer levels for target win rates")
+    parser.add_argument("keys", nargs="*", help=f"story fights to balance (default: all of {', '.join(BALANCE_TARGETS)})")
+    parser.add_argument("--battles", type=int, default=400, help="battles per matchup (one matchup per starter)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--policy", default="greedy", choices=["greedy", "random"], help="player policy")
+    parser.add_argument("--story-ai", action="store_true", help="trainers use their own search AI (slow)")
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    result = balance(args.keys or None, args.battles, args.workers, player_policy=args.policy, story_ai=args.story_ai,
+                     cache_path=None if args.no_cache else BALANCE_CACHE)
+    print(format_report(result))
+    print(f"{result['simulated']} matchups simulated, {result['cached']} from cache "
+          f"in {time.perf_counter() - start:.2f}s")
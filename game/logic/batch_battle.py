@@ -0,0 +1,284 @@
+import numpy as np
+from game.data.moves_data import moves
+from game.data.pokemon_data import species_data, type_effectiveness
+from game.models.pokemon import Pokemon, MOVE_NAMES, MOVE_IDS
+from game.logic.effects import NO_STATUS, POISONED, BURNED, PARALYZED, PARALYSIS_SKIP
+
+# Lockstep batch engine for mass wild-vs-party simulation.
+# N independent battles are stored as NumPy columns (struct of arrays) and every phase of
+# Battle.execute_turn runs as array operations over all live battles:
+#   move choice -> speed order -> first move -> faint check -> second move -> faint check
+#   -> poison/burn ticks -> forced switch to the next alive party member.
+# Mirrors the scalar Battle with link_battle=True (no XP/level-ups), fight actions only,
+# and a fainted player Pokemon replaced without a free hit (as in simulation.run_headless_battle).
+
+ROLL_MIN = 0.85
+ROLL_MAX = 1.0
+MAX_MOVES = 4
+
+# Static tables, built once at import
+TYPE_NAMES = sorted({d["type"] for d in species_data.values()} | {m.type for m in moves.values()})
+TYPE_IDS = {name: i for i, name in enumerate(TYPE_NAMES)}
+MOVE_POWER = np.array([moves[m].power for m in MOVE_NAMES], dtype=np.int64)
+MOVE_ACCURACY = np.array([moves[m].accuracy for m in MOVE_NAMES], dtype=np.float64)
+MOVE_TYPE = np.array([TYPE_IDS[moves[m].type] for m in MOVE_NAMES], dtype=np.int64)
+MOVE_EFFECT = np.array([moves[m].effect_code for m in MOVE_NAMES], dtype=np.int8)
+MOVE_EFFECT_CHANCE = np.array([moves[m].effect_chance for m in MOVE_NAMES], dtype=np.float64)
+EFFECTIVENESS = np.ones((len(TYPE_NAMES), len(TYPE_NAMES)), dtype=np.float64)
+for (_att, _def), _mult in type_effectiveness.items():
+    EFFECTIVENESS[TYPE_IDS[_att], TYPE_IDS[_def]] = _mult
+
+class _Side:
+    """Column storage for one side: arrays of shape (N, P) (P = 1 for the wild side)."""
+    def __init__(self, parties):
+        n = len(parties)
+        p = max(len(party) for party in parties)
+        self.hp = np.zeros((n, p), dtype=np.int64)
+        self.max_hp = np.zeros((n, p), dtype=np.int64)
+        self.level = np.zeros((n, p), dtype=np.int64)
+        self.atk = np.zeros((n, p), dtype=np.int64)
+        self.dfn = np.ones((n, p), dtype=np.int64)
+        self.spd = np.zeros((n, p), dtype=np.int64)
+        self.type = np.zeros((n, p), dtype=np.int64)
+        self.status = np.zeros((n, p), dtype=np.int8)
+        self.moves = np.zeros((n, p, MAX_MOVES), dtype=np.int64)
+        self.n_moves = np.ones((n, p), dtype=np.int64)
+        self.assign(np.arange(n), parties)
+
+    def assign(self, rows, parties):
+        """(Re)loads fresh parties into the given rows (parties[k] goes to rows[k])."""
+        p = self.hp.shape[1]
+        # Pokemon are built once per distinct (species, level) and gathered into the columns
+        spec_ids = {}
+        templates = []
+        slots = np.full((len(rows), p), -1, dtype=np.int64)
+        for i, party in enumerate(parties):
+            for j, spec in enumerate(party):
+                sid = spec_ids.get(spec)
+                if sid is None:
+                    sid = spec_ids[spec] = len(templates)
+                    templates.append(Pokemon(spec[0], level=spec[1]))
+                slots[i, j] = sid
+
+        # Row 0 of every template table is an empty slot (fainted, no stats)
+        t_hp = np.array([0] + [m.max_hp for m in templates], dtype=np.int64)
+        t_level = np.array([0] + [m.level for m in templates], dtype=np.int64)
+        t_atk = np.array([0] + [m.attack for m in templates], dtype=np.int64)
+        t_def = np.array([1] + [max(1, m.defense) for m in templates], dtype=np.int64)
+        t_spd = np.array([0] + [m.speed for m in templates], dtype=np.int64)
+        t_type = np.array([0] + [TYPE_IDS[m.type] for m in templates], dtype=np.int64)
+        t_nmoves = np.array([1] + [len(m.moves) for m in templates], dtype=np.int64)
+        t_moves = np.zeros((len(templates) + 1, MAX_MOVES), dtype=np.int64)
+        for t, mon in enumerate(templates, start=1):
+            for k, m in enumerate(mon.moves):
+                t_moves[t, k] = MOVE_IDS[m]
+
+        t = slots + 1
+        self.hp[rows] = t_hp[t]
+        self.max_hp[rows] = t_hp[t]
+        self.level[rows] = t_level[t]
+        self.atk[rows] = t_atk[t]
+        self.dfn[rows] = t_def[t]
+        self.spd[rows] = t_spd[t]
+        self.type[rows] = t_type[t]
+        self.status[rows] = 0
+        self.moves[rows] = t_moves[t]
+        self.n_moves[rows] = t_nmoves[t]
+
+class BatchBattle:
+    """
+    N wild-vs-party battles advanced in lockstep.
+
+    party: list of (species, level) used by every instance, or a list of N such lists.
+    wild: list of N (species, level) tuples, one wild Pokemon per instance.
+    player_policy: "random" (uniform move) or "greedy" (highest expected damage, no overkill cap).
+    Wild Pokemon always pick a uniform random move, like the scalar Battle.
+    """
+    def __init__(self, party, wild, player_policy="random", seed=None):
+        n = len(wild)
+        if party and isinstance(party[0], tuple):
+            parties = [party] * n
+        else:
+            parties = party
+        self.n = n
+        self.rng = np.random.default_rng(seed)
+        self.parties = parties
+        self.player = _Side(parties)
+        self.wild = _Side([[spec] for spec in wild])
+        self.active = np.zeros(n, dtype=np.int64)
+        self.finished = np.zeros(n, dtype=bool)
+        self.won = np.zeros(n, dtype=bool)
+        self.turns = np.zeros(n, dtype=np.int64)
+        self.player_policy = player_policy
+        if player_policy == "greedy":
+            self._greedy_slot = self._greedy_table()
+        elif player_policy != "random":
+            raise ValueError(f"Unknown batch policy: {player_policy}")
+
+    def _greedy_table(self):
+        # Best move slot of every party member against the instance's wild Pokemon (stats never change)
+        pl = self.player
+        mv = pl.moves
+        power = MOVE_POWER[mv]
+        base = np.maximum(np.trunc(power * pl.atk[:, :, None] / self.wild.dfn[:, 0, None, None] / 2), 1)
+        eff = EFFECTIVENESS[MOVE_TYPE[mv], self.wild.type[:, 0, None, None]]
+        score = base * eff * MOVE_ACCURACY[mv]
+        slot_ok = np.arange(MAX_MOVES)[None, None, :] < pl.n_moves[:, :, None]
+        score = np.where(slot_ok, score, -1.0)
+        return np.argmax(score, axis=2)
+
+    def reset_battles(self, idx, wild):
+        """Restarts battles idx: fresh copies of their parties against new wild (species, level) specs."""
+        self.player.assign(idx, [self.parties[i] for i in idx])
+        self.wild.assign(idx, [[spec] for spec in wild])
+        self.active[idx] = 0
+        self.finished[idx] = False
+        self.won[idx] = False
+        self.turns[idx] = 0
+        if self.player_policy == "greedy":
+            self._greedy_slot = self._greedy_table()
+
+    def _pick_moves(self, idx, active, player_slots=None):
+        rng = self.rng
+        if player_slots is not None:
+            # Chosen outside (e.g. by a learning agent); slots past the moves learned fall back to slot 0
+            p_slot = player_slots[idx]
+            p_slot = np.where(p_slot < self.player.n_moves[idx, active], p_slot, 0)
+        elif self.player_policy == "greedy":
+            p_slot = self._greedy_slot[idx, active]
+        else:
+            p_slot = (rng.random(len(idx)) * self.player.n_moves[idx, active]).astype(np.int64)
+        w_slot = (rng.random(len(idx)) * self.wild.n_moves[idx, 0]).astype(np.int64)
+        return self.player.moves[idx, active, p_slot], self.wild.moves[idx, 0, w_slot]
+
+    def _attack(self, idx, att, att_col, dfn, dfn_col, move_ids):
+        """
+        One move per selected battle (Battle._execute_move).
+        idx: battle indices; *_col: party column of the attacker / defender in each battle.
+        """
+        rng = self.rng
+        k = len(idx)
+        if k == 0:
+            return
+        acts = ~((att.status[idx, att_col] == PARALYZED) & (rng.random(k) < PARALYSIS_SKIP))
+        hits = acts & ~(rng.random(k) > MOVE_ACCURACY[move_ids])
+
+        base = np.maximum(np.trunc(MOVE_POWER[move_ids] * att.atk[idx, att_col] / dfn.dfn[idx, dfn_col] / 2), 1)
+        eff = EFFECTIVENESS[MOVE_TYPE[move_ids], dfn.type[idx, dfn_col]]
+        roll = rng.uniform(ROLL_MIN, ROLL_MAX, k)
+        damage = np.maximum(np.trunc(base * eff * roll), 1).astype(np.int64)
+        hp = dfn.hp[idx, dfn_col] - np.where(hits, damage, 0)
+        dfn.hp[idx, dfn_col] = hp
+
+        effect = MOVE_EFFECT[move_ids]
+        inflict = hits & (effect != NO_STATUS) & (hp > 0) & (dfn.status[idx, dfn_col] == NO_STATUS)
+        inflict &= rng.random(k) < MOVE_EFFECT_CHANCE[move_ids]
+        dfn.status[idx, dfn_col] = np.where(inflict, effect, dfn.status[idx, dfn_col])
+
+    def _faint_player(self, idx):
+        """Player's active Pokemon fainted in battles idx (Battle._handle_faint, is_player=True)."""
+        if len(idx) == 0:
+            return
+        col = self.active[idx]
+        self.player.hp[idx, col] = 0
+        self.player.status[idx, col] = NO_STATUS
+        lost = ~(self.player.hp[idx] > 0).any(axis=1)
+        self.finished[idx[lost]] = True
+
+    def _faint_wild(self, idx):
+        if len(idx) == 0:
+            return
+        self.wild.hp[idx, 0] = 0
+        self.wild.status[idx, 0] = NO_STATUS
+        self.finished[idx] = True
+        self.won[idx] = True
+
+    def _status_tick(self, side, idx, col):
+        status = side.status[idx, col]
+        ticking = (status == POISONED) | (status == BURNED)
+        dmg = np.maximum(1, side.max_hp[idx, col] // 10)
+        side.hp[idx, col] -= np.where(ticking, dmg, 0)
+        return side.hp[idx, col] <= 0
+
+    def step(self, player_slots=None):
+        """
+        Plays one turn in every live battle. Returns the number of battles still running.
+        player_slots: optional int array (N,) of move slots for the player side instead of player_policy.
+        """
+        idx = np.nonzero(~self.finished)[0]
+        if len(idx) == 0:
+            return 0
+        pl, wd = self.player, self.wild
+        active = self.active[idx]
+        p_move, w_move = self._pick_moves(idx, active, player_slots)
+        wild_first = wd.spd[idx, 0] > pl.spd[idx, active]
+
+        # First move
+        p_first = ~wild_first
+        p1 = idx[p_first]
+        self._attack(p1, pl, self.active[p1], wd, 0, p_move[p_first])
+        w1 = idx[wild_first]
+        self._attack(w1, wd, 0, pl, self.active[w1], w_move[wild_first])
+
+        # Faint check after the first move; the second move only happens if the defender survived
+        wild_up = wd.hp[p1, 0] > 0
+        self._faint_wild(p1[~wild_up])
+        player_up = pl.hp[w1, self.active[w1]] > 0
+        self._faint_player(w1[~player_up])
+
+        p2 = p1[wild_up]
+        self._attack(p2, wd, 0, pl, self.active[p2], w_move[p_first][wild_up])
+        self._faint_player(p2[pl.hp[p2, self.active[p2]] <= 0])
+        w2 = w1[player_up]
+        self._attack(w2, pl, self.active[w2], wd, 0, p_move[wild_first][player_up])
+        self._faint_wild(w2[wd.hp[w2, 0] <= 0])
+
+        # End of turn: poison/burn, player first
+        live = idx[~self.finished[idx]]
+        p_col = self.active[live]
+        fainted = self._status_tick(pl, live, p_col)
+        self._faint_player(live[fainted])
+        live = live[~self.finished[live]]
+        fainted = self._status_tick(wd, live, np.zeros(len(live), dtype=np.int64))
+        self._faint_wild(live[fainted])
+
+        self.turns[idx] += 1
+
+        # Forced switch: next alive party member, no free hit
+        live = idx[~self.finished[idx]]
+        down = live[pl.hp[live, self.active[live]] <= 0]
+        if len(down):
+            self.active[down] = np.argmax(pl.hp[down] > 0, axis=1)
+        return int((~self.finished).sum())
+
+    def run(self, max_turns=200):
+        """
+        Plays every battle to completion (or max_turns).
+        Returns a dictionary:
+        {
+            'battles': int, 'wins': int, 'draws': int, 'win_rate': float, 'mean_turns': float,
+            'won': bool array, 'turns': int array, 'hp_remaining': float array (party HP fraction)
+        }
+        """
+        for _ in range(max_turns):
+            if self.step() == 0:
+                break
+        hp_left = np.maximum(self.player.hp, 0).sum(axis=1) / self.player.max_hp.sum(axis=1)
+        wins = int(self.won.sum())
+        return {
+            'battles': self.n,
+            'wins': wins,
+            'draws': int((~self.finished).sum()),
+            'win_rate': wins / self.n if self.n else 0.0,
+            'mean_turns': float(self.turns.mean()) if self.n else 0.0,
+            'won': self.won.copy(),
+            'turns': self.turns.copy(),
+            'hp_remaining': hp_left
+        }
+
+def random_encounters(species_names, min_level, max_level, n, seed=None):
+    """n wild (species, level) specs drawn like ExplorationLogic.explore (uniform species and level)."""
+    rng = np.random.default_rng(seed)
+    s = rng.integers(0, len(species_names), n)
+    lv = rng.integers(min_level, max_level + 1, n)
+    return [(species_names[i], int(l)) for i, l in zip(s, lv)]
@@ -2,16 +2,49 @@ import random
 from game.data.moves_data import moves
 from game.data.pokemon_data import type_effectiveness
 from game.logic.inventory import use_item
+from game.logic.rng import new_seed
+from game.logic import events as ev
+from game.logic import instrumentation as prof_phase
+from game.logic.effects import BEFORE_MOVE, END_OF_TURN
+from game.logic.ai import make_opponent_ai
+
+def _discard(event):
+    pass
 
 class Battle:
-    def __init__(self, player, opponent, is_wild=False, link_battle=False):
+    def __init__(self, player, opponent, is_wild=False, link_battle=False, opponent_ai=None, rng=None, seed=None,
+                 quiet=False, profiler=None):
         self.player = player
         self.opponent = opponent
         self.is_wild = is_wild
         self.link_battle = link_battle
-        self.logs = []
+        # Optional callable(battle) -> move_name used to pick the opponent's move.
+        # None uses the trainer's own AI if it has one, else the classic behaviour (random move).
+        if opponent_ai is None and not is_wild and getattr(opponent, "ai", None):
+            opponent_ai = make_opponent_ai(opponent.ai)
+        self.opponent_ai = opponent_ai
+        # All randomness of this battle comes from one stream, so seed + actions replays it exactly.
+        if rng is None:
+            if seed is None:
+                seed = new_seed()
+            rng = random.Random(seed)
+        self.seed = seed # None when an external stream was injected
+        self.rng = rng
+        # Quiet battles (simulations) don't record events at all
+        self.quiet = quiet
+        # Optional instrumentation.BattleProfiler; None skips all timing and counters
+        self.profiler = profiler
+        self._begin_events()
         self.finished = False
         self.won = False
+        self.turn = 0 # turns played so far
+        # List that receives every action (execute_turn / send_out) when a replay is being recorded
+        self.action_log = None
+        # (attacker, defender, move_name) -> (move, base damage * effectiveness, effectiveness)
+        # Only valid while stats stay the same: cleared on switch, replacement and level-up/evolution.
+        # Pays off when a matchup repeats for many turns (turn_fight / long_trainer_battle in
+        # bench_battle.py, ~10-20% faster); short story battles are AI-bound and see no difference.
+        self._coeff_cache = {}
         
         # Initialize active Pokemon
         self.active_player_mon = self._get_first_alive(player.pokemon)
@@ -31,17 +64,31 @@ class Battle:
                          mon.current_hp = mon.max_hp
                          mon.status = None
             
-        # Initial logs
+        # Initial events
         if is_wild:
-            self.logs.append(f"A wild {self.active_opponent_mon.species} appeared!")
+            self._emit((ev.WILD_APPEARED, self.active_opponent_mon.species))
         else:
-            self.logs.append(f"{self.opponent_name} wants to battle!")
-            self.logs.append(f"{self.opponent_name} sent out {self.active_opponent_mon.species}!")
-        self.logs.append(f"Go! {self.active_player_mon.species}!")
+            self._emit((ev.CHALLENGE, self.opponent_name))
+            self._emit((ev.TRAINER_SEND_OUT, self.opponent_name, self.active_opponent_mon.species))
+        self._emit((ev.PLAYER_SEND_OUT, self.active_player_mon.species))
         
         # Pokedex
         player.pokedex_seen.add(self.active_opponent_mon.species)
 
+    def _begin_events(self):
+        # Fresh list per turn, so lists handed out by execute_turn stay untouched
+        self.events = []
+        self._emit = _discard if self.quiet else self.events.append
+
+    def clear_events(self):
+        """Drops the events recorded so far (e.g. once a UI has queued them); new ones go to a fresh list."""
+        self._begin_events()
+
+    @property
+    def logs(self):
+        """Log lines for the events of the current turn, formatted on demand."""
+        return ev.format_events(self.events)
+
     def _get_first_alive(self, party):
         for mon in party:
             if mon.current_hp > 0:
@@ -57,16 +104,103 @@ class Battle:
           ("switch", new_mon_obj)
           ("run",)
         
-        Returns: { 'ended': bool, 'logs': list[str] }
+        Returns: { 'ended': bool, 'events': list[tuple] }
+        Events are described in game.logic.events; use format_events() for text.
         """
-        self.logs = [] # clear logs for this turn
+        prof = self._start_turn(action)
+        if prof is None:
+            return self._execute_turn(action, None)
+        try:
+            return self._execute_turn(action, prof)
+        finally:
+            prof.end_turn()
+
+    def iter_turn(self, action):
+        """
+        Streaming execute_turn: yields the events of the turn in batches as soon as each part is
+        resolved (the switch/item before the opponent picks its move, each move, each faint, the
+        end-of-turn status damage), so a UI can show the first hit while the rest is computed.
+        The battle must not be touched until the generator is exhausted. Afterwards battle.events
+        holds the whole turn and battle.finished tells whether it ended the battle.
+        """
+        prof = self._start_turn(action)
+        start = 0
+        try:
+            for _ in self._turn_steps(action, prof):
+                events = self.events
+                if len(events) > start:
+                    yield events[start:]
+                    start = len(events)
+            if len(self.events) > start:
+                yield self.events[start:]
+        finally:
+            if prof is not None: prof.end_turn()
+
+    def _start_turn(self, action):
+        self.turn += 1
+        if self.action_log is not None:
+            self.action_log.append(action)
+        prof = self.profiler
+        if prof is not None: prof.begin_turn()
+        return prof
+
+    # A turn is played in phases shared by execute_turn (straight-line, no generator: simulations run
+    # millions of turns) and iter_turn (_turn_steps yields between them). Rules live in the phases only.
+    def _execute_turn(self, action, prof):
+        self._begin_events() # clear events for this turn
+        if action[0] != "fight" and self._turn_action(action, prof):
+            return {'ended': True, 'events': self.events}
         player_mon = self.active_player_mon
         opp_mon = self.active_opponent_mon
-        
+        opp_move_name = self._opponent_choice(opp_mon, prof)
+
+        if prof is not None: prof.push(prof_phase.MOVES)
+        for attacker, defender, move_name, is_player in self._turn_moves(action, player_mon, opp_mon, opp_move_name):
+            self._execute_move(attacker, defender, move_name, is_player=is_player)
+            if defender.current_hp <= 0: # the turn's remaining move is skipped
+                self._handle_faint(defender, is_player=not is_player)
+                if self.finished: return {'ended': True, 'events': self.events}
+                break
+        if prof is not None: prof.pop()
+
+        if self._end_of_turn(player_mon, opp_mon, prof):
+            return {'ended': True, 'events': self.events}
+        return {'ended': False, 'events': self.events}
+
+    def _turn_steps(self, action, prof):
+        # iter_turn's version of _execute_turn: yields (nothing) wherever new events can be shown
+        self._begin_events() # clear events for this turn
+        if action[0] != "fight" and self._turn_action(action, prof):
+            return
+        # Switch/item messages can be shown while the opponent AI thinks
+        yield
+        player_mon = self.active_player_mon
+        opp_mon = self.active_opponent_mon
+        opp_move_name = self._opponent_choice(opp_mon, prof)
+
+        if prof is not None: prof.push(prof_phase.MOVES)
+        for attacker, defender, move_name, is_player in self._turn_moves(action, player_mon, opp_mon, opp_move_name):
+            self._execute_move(attacker, defender, move_name, is_player=is_player)
+            yield
+            if defender.current_hp <= 0: # the turn's remaining move is skipped
+                self._handle_faint(defender, is_player=not is_player)
+                if self.finished: return
+                break
+        if prof is not None: prof.pop()
+        yield
+
+        self._end_of_turn(player_mon, opp_mon, prof)
+
+    def _turn_action(self, action, prof):
+        """Run / switch / item part of a turn. Returns True if it ended the battle (escape, capture)."""
+        player_mon = self.active_player_mon
+        opp_mon = self.active_opponent_mon
+
         # 1. Handle Run
         if action[0] == "run":
+            if prof is not None: prof.push(prof_phase.RUN)
             if not self.is_wild:
-                 self.logs.append("You can't run from a trainer battle!")
+                 self._emit((ev.CANT_RUN,))
                  # Logic continues to opponent attack? Original: yes "run failed" (action='run_failed')
                  # But standard pokemon logic: Trainer battle -> fail run -> opponent attacks?
                  # Main.py Lines 567-568: "continue" (re-prompt).
@@ -79,26 +213,28 @@ class Battle:
                 if opp_mon.speed > player_mon.speed:
                     run_chance = 0.5
                 
-                if random.random() < run_chance:
-                    self.logs.append("Got away safely!")
+                if self.rng.random() < run_chance:
+                    self._emit((ev.ESCAPED,))
                     self.finished = True
-                    return {'ended': True, 'logs': self.logs}
+                    return True
                 else:
-                    self.logs.append("Couldn't escape!")
+                    self._emit((ev.ESCAPE_FAILED,))
                     # Continues to opponent turn ("run_failed")
+            if prof is not None: prof.pop()
 
         # 2. Handle Switch
         if action[0] == "switch":
+            if prof is not None: prof.push(prof_phase.SWITCH)
             new_mon = action[1]
-            self.logs.append(f"Come back, {player_mon.species}!")
-            self.logs.append(f"Go, {new_mon.species}!")
+            self._emit((ev.SWITCH, player_mon.species, new_mon.species))
             self.active_player_mon = new_mon
-            player_mon = new_mon # Update reference
+            self._coeff_cache.clear()
             # Opponent gets free hit
+            if prof is not None: prof.pop()
 
         # 3. Handle Item
-        caught_pokemon = False
         if action[0] == "item":
+            if prof is not None: prof.push(prof_phase.ITEM)
             item_name = action[1]
             target = action[2] if len(action) > 2 else None
             
@@ -106,87 +242,170 @@ class Battle:
             # Logic handled in use_item now
             
             # is_wild check passed to use_item
-            res = use_item(self.player, item_name, target=target, is_wild=self.is_wild, battle=True, opponent=opp_mon)
-            self.logs.extend(res['messages'])
+            res = use_item(self.player, item_name, target=target, is_wild=self.is_wild, battle=True, opponent=opp_mon, rng=self.rng)
+            for msg in res['messages']:
+                self._emit((ev.TEXT, msg))
             
             if res.get('captured'):
                 self.finished = True
                 self.won = True 
-                return {'ended': True, 'logs': self.logs}
+                return True
             
             if not res['success']:
                 # If item failed, does turn end? Main.py continues loop if use_item returns True (ends battle)
                 # If use_item returns False, it continues to opponent attack?
                 # Main.py: "action = ('item_used', ...)" -> Executes opponent turn.
                 pass
+            if prof is not None: prof.pop()
+        return False
 
+    def _opponent_choice(self, opp_mon, prof):
         # 4. Determine Opponent Move
+        if prof is not None: prof.push(prof_phase.OPPONENT_CHOICE)
         opp_move_name = None
         if opp_mon.moves:
-            opp_move_name = random.choice(opp_mon.moves)
-        
-        # 5. Execute Moves (if action is fight)
-        if action[0] == "fight":
-            player_move_name = action[1]
-            player_first = True
-            if opp_mon.speed > player_mon.speed:
-                player_first = False
-            
-            first = (self.player, player_mon, player_move_name) if player_first else (self.opponent, opp_mon, opp_move_name)
-            second = (self.opponent, opp_mon, opp_move_name) if player_first else (self.player, player_mon, player_move_name)
-            
-            # Execute First
-            self._execute_move(first[1], second[1], first[2], is_player=(first[0] == self.player))
-            
-            # Check Faint after first
-            if second[1].current_hp <= 0:
-                self._handle_faint(second[1], is_player=(second[0] == self.player))
-                if self.finished: return {'ended': True, 'logs': self.logs}
+            if self.opponent_ai:
+                opp_move_name = self.opponent_ai(self)
             else:
-                # Execute Second
-                self._execute_move(second[1], first[1], second[2], is_player=(second[0] == self.player))
-                # Check Faint after second
-                if first[1].current_hp <= 0:
-                     self._handle_faint(first[1], is_player=(first[0] == self.player))
-                     if self.finished: return {'ended': True, 'logs': self.logs}
+                opp_move_name = self.rng.choice(opp_mon.moves)
+        if prof is not None: prof.pop()
+        return opp_move_name
 
+    def _turn_moves(self, action, player_mon, opp_mon, opp_move_name):
+        """The moves of the turn in order, as (attacker, defender, move_name, is_player)."""
+        # 5. Execute Moves (if action is fight): faster Pokemon first, player wins ties
+        if action[0] == "fight":
+            player_move = (player_mon, opp_mon, action[1], True)
+            opp_move = (opp_mon, player_mon, opp_move_name, False)
+            if opp_mon.speed > player_mon.speed:
+                return (opp_move, player_move)
+            return (player_move, opp_move)
         # 6. Execute Opponent Move (if action was item/switch/run_fail)
-        elif action[0] in ["item", "switch", "run", "run_failed"]:
-            if opp_mon.current_hp > 0:
-                 self._execute_move(opp_mon, player_mon, opp_move_name, is_player=False)
-                 if player_mon.current_hp <= 0:
-                     self._handle_faint(player_mon, is_player=True)
-                     if self.finished: return {'ended': True, 'logs': self.logs}
-
-        # 7. Status Effects (End of turn)
-        self._handle_status(player_mon)
+        if action[0] in ("item", "switch", "run", "run_failed") and opp_mon.current_hp > 0:
+            return ((opp_mon, player_mon, opp_move_name, False),)
+        return ()
+
+    def _end_of_turn(self, player_mon, opp_mon, prof):
+        """7. Status Effects (End of turn). Returns True if a faint from status ended the battle."""
+        if prof is not None: prof.push(prof_phase.STATUS)
+        self._handle_status(player_mon, is_player=True)
         if player_mon.current_hp <= 0: # Check faint from poison
              self._handle_faint(player_mon, is_player=True)
-             if self.finished: return {'ended': True, 'logs': self.logs}
+             if self.finished: return True
              
-        self._handle_status(opp_mon)
+        self._handle_status(opp_mon, is_player=False)
         if opp_mon.current_hp <= 0:
              self._handle_faint(opp_mon, is_player=False)
-             if self.finished: return {'ended': True, 'logs': self.logs}
+             if self.finished: return True
+        if prof is not None: prof.pop()
+        return False
 
-        return {'ended': False, 'logs': self.logs}
+    def snapshot(self):
+        """
+        Captures the mutable battle state as a small immutable tuple:
+        HP/status of both parties, active indices, finished/won, inventory counts
+        and party/storage sizes (so a capture can be undone).
+        XP, levels and the RNG state are not included.
+        """
+        p_party = self.player.pokemon
+        o_party = self._opponent_party()
+        return (
+            tuple([(mon.current_hp, mon.status) for mon in p_party]),
+            tuple([(mon.current_hp, mon.status) for mon in o_party]),
+            self._index_of(p_party, self.active_player_mon),
+            self._index_of(o_party, self.active_opponent_mon),
+            self.finished,
+            self.won,
+            tuple(self.player.inventory.items()),
+            len(self.player.storage)
+        )
+
+    def restore(self, snap):
+        """Restores a state captured by snapshot(). O(party size)."""
+        p_states, o_states, p_idx, o_idx, finished, won, inventory, storage_len = snap
+        p_party = self.player.pokemon
+        o_party = self._opponent_party()
+        # Undo captures (add_pokemon appends to the party or to storage)
+        del p_party[len(p_states):]
+        del self.player.storage[storage_len:]
+        for mon, (hp, status) in zip(p_party, p_states):
+            mon.current_hp = hp
+            mon.status = status
+        for mon, (hp, status) in zip(o_party, o_states):
+            mon.current_hp = hp
+            mon.status = status
+        self.active_player_mon = p_party[p_idx] if p_idx is not None else None
+        self.active_opponent_mon = o_party[o_idx] if o_idx is not None else None
+        self.finished = finished
+        self.won = won
+        self.player.inventory.clear()
+        self.player.inventory.update(inventory)
+
+    def _opponent_party(self):
+        if self.is_wild:
+            return [self.opponent]
+        return self.opponent.pokemon
+
+    def _index_of(self, party, mon):
+        for i, p in enumerate(party):
+            if p is mon:
+                return i
+        return None
+
+    def send_out(self, new_mon):
+        """
+        Replaces the player's fainted active Pokemon without spending a turn.
+        Returns list of events.
+        """
+        if self.action_log is not None:
+            self.action_log.append(("send_out", new_mon))
+        self._begin_events()
+        self.active_player_mon = new_mon
+        self._coeff_cache.clear()
+        self._emit((ev.REPLACE, new_mon.species))
+        return self.events
 
     def _execute_move(self, attacker, defender, move_name, is_player):
         if not move_name: return
+        prof = self.profiler
         
-        # Check Paralysis
-        if attacker.status == "paralyzed":
-            if random.random() < 0.25:
-                self.logs.append(f"{attacker.species} is paralyzed and can't move!")
-                return
-
-        move = moves[move_name]
-        self.logs.append(f"{attacker.species} used {move_name}!")
+        # Status checks before moving (paralysis)
+        check = BEFORE_MOVE.get(attacker.status)
+        if check is not None and check(self, attacker, is_player):
+            if prof is not None: prof.record_move(move_name, prof_phase.PARALYZED)
+            return
+
+        # Damage before the roll only depends on the matchup, so it is computed once per pair
+        key = (attacker, defender, move_name)
+        coeff = self._coeff_cache.get(key)
+        if coeff is None:
+            coeff = self._coeff_cache[key] = self._damage_coefficient(moves[move_name], attacker, defender)
+        move, scaled, eff_mult = coeff
         
-        if random.random() > move.accuracy:
-            self.logs.append("But it missed!")
+        self._emit((ev.MOVE_USED, is_player, attacker.species, move_name))
+        
+        if self.rng.random() > move.accuracy:
+            self._emit((ev.MISSED, is_player))
+            if prof is not None: prof.record_move(move_name, prof_phase.MISS)
             return
-            
+        
+        damage = int(scaled * self.rng.uniform(0.85, 1.0))
+        if damage < 1: damage = 1
+        
+        defender.current_hp -= damage
+        self._emit((ev.DAMAGE, not is_player, defender.species, damage, defender.current_hp))
+        
+        if eff_mult != 1.0: self._emit((ev.EFFECTIVENESS, eff_mult))
+        if prof is not None: prof.record_move(move_name, prof_phase.HIT, damage, eff_mult)
+        
+        # Move Effects (handler compiled onto the move, see game.logic.effects)
+        on_hit = move.on_hit
+        if on_hit is not None and defender.current_hp > 0:
+            if on_hit(self, move, attacker, defender, is_player) and prof is not None:
+                prof.record_status(move_name)
+
+    def _damage_coefficient(self, move, attacker, defender):
+        """(move, base damage * type effectiveness, effectiveness) for this attacker/defender pair."""
         damage = int(move.power * attacker.attack / max(1, defender.defense) / 2)
         if damage < 1: damage = 1
         
@@ -196,70 +415,56 @@ class Battle:
             key = (move.type, defender.type)
             if key in type_effectiveness:
                 eff_mult = type_effectiveness[key]
-        
-        damage = int(damage * eff_mult * random.uniform(0.85, 1.0))
-        if damage < 1: damage = 1
-        
-        defender.current_hp -= damage
-        self.logs.append(f"It did {damage} damage.")
-        
-        if eff_mult > 1: self.logs.append("It's super effective!")
-        elif 0 < eff_mult < 1: self.logs.append("It's not very effective...")
-        
-        # Move Effects
-        if move.effect and defender.current_hp > 0:
-            if defender.status is None and random.random() < move.effect_chance:
-                # Grammar adjustment
-                status = move.effect + "ed" if move.effect != "paralyze" else "paralyzed"
-                defender.status = status
-                self.logs.append(f"{defender.species} was {status}!")
+        return move, damage * eff_mult, eff_mult
 
     def _handle_faint(self, mon, is_player):
+        prof = self.profiler
+        if prof is not None: prof.push(prof_phase.FAINT)
         mon.current_hp = 0
         mon.status = None # Reset status on faint
         if is_player:
-            self.logs.append(f"Your {mon.species} fainted!")
+            self._emit((ev.FAINT, True, mon.species))
             pass # TODO: Logic for forced switch?
             # In this engine, we check if any alive.
             if not any(p.current_hp > 0 for p in self.player.pokemon):
-                self.logs.append("You have no more Pokemon!")
+                self._emit((ev.NO_MORE_POKEMON,))
                 self.finished = True
                 self.won = False
             else:
                 pass # Game/UI needs to prompt switch. 
                 # Ideally, we return specific state "WAITING_FOR_SWITCH".
         else:
-            self.logs.append(f"{mon.species} fainted!")
+            self._emit((ev.FAINT, False, mon.species))
             # XP Gain
             if not self.link_battle:
                 exp = mon.level * 20
+                self._emit((ev.EXP, self.active_player_mon.species, exp))
                 res = self.active_player_mon.gain_exp(exp)
-                self.logs.append(f"Gained {exp} XP.")
-                self.logs.extend(res['messages'])
+                if res['leveled_up']:
+                    self._coeff_cache.clear() # New stats (and maybe species/type after evolving)
+                for msg in res['messages']:
+                    self._emit((ev.TEXT, msg))
                 # "gain_exp" logic changed in new model.
             
             if self.is_wild:
                 self.finished = True
                 self.won = True
-                return
-            
-            # Trainer battle: check next mon
-            next_mon = self._get_first_alive(self.opponent.pokemon)
-            if next_mon:
-                self.active_opponent_mon = next_mon
-                self.logs.append(f"{self.opponent_name} sent out {next_mon.species}!")
-                self.player.pokedex_seen.add(next_mon.species)
             else:
-                self.finished = True
-                self.won = True
-                self.logs.append("You won the battle!")
-
-    def _handle_status(self, mon):
-        if mon.status == "poisoned":
-            dmg = max(1, mon.max_hp // 10)
-            mon.current_hp -= dmg
-            self.logs.append(f"{mon.species} is hurt by poison!")
-        elif mon.status == "burned":
-            dmg = max(1, mon.max_hp // 10)
-            mon.current_hp -= dmg
-            self.logs.append(f"{mon.species} is hurt by its burn!")
+                # Trainer battle: check next mon
+                next_mon = self._get_first_alive(self.opponent.pokemon)
+                if next_mon:
+                    self.active_opponent_mon = next_mon
+                    self._coeff_cache.clear()
+                    self._emit((ev.TRAINER_SEND_OUT, self.opponent_name, next_mon.species))
+                    self.player.pokedex_seen.add(next_mon.species)
+                else:
+                    self.finished = True
+                    self.won = True
+                    self._emit((ev.WON,))
+        if prof is not None: prof.pop()
+
+    def _handle_status(self, mon, is_player):
+        # End-of-turn status damage (poison, burn)
+        tick = END_OF_TURN.get(mon.status)
+        if tick is not None:
+            tick(self, mon, is_player)
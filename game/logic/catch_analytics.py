@@ -0,0 +1,154 @@
+from functools import lru_cache
+import numpy as np
+from game.data.items_data import items
+from game.data.pokemon_data import species_data
+from game.logic.inventory import CATCH_HP_WEIGHT, CATCH_BASE, CATCH_MIN, CATCH_MAX
+from game.logic.damage_grid import stat_arrays
+
+# Catch odds tables.
+# use_item catches when random() < clamp((0.8 * (1 - hp / max_hp) + 0.1) * catch_rate, 0.05, 0.95),
+# with the same chance on every throw while the target's HP stays the same, so the number of balls
+# to catch is geometric: E[balls] = 1 / chance, E[cost] = price / chance.
+# catch_grid evaluates that with NumPy for every ball x species x level x current HP (or HP fraction);
+# for a given HP every cell matches the scalar path bit for bit.
+# catch_table(ball) builds the exact table of one ball once per process, so the battle UI can
+# look odds up every frame (an array index); warm_tables() builds them all ahead of time.
+
+LEVELS = range(1, 101)
+
+def ball_names():
+    """Items that can catch Pokemon, in items_data order."""
+    return [name for name, item in items.items() if item.category == "ball"]
+
+def catch_chance(hp_ratio, catch_rate):
+    """Catch chance per throw for HP ratio(s) in (0, 1] (scalars or arrays broadcast together)."""
+    chance = (CATCH_HP_WEIGHT * (1 - np.asarray(hp_ratio, dtype=np.float64)) + CATCH_BASE) * catch_rate
+    return np.clip(chance, CATCH_MIN, CATCH_MAX)
+
+def balls_for_confidence(chance, confidence=0.9):
+    """Balls needed to have caught the Pokemon with the given probability: ceil(log(1 - c) / log(1 - chance))."""
+    chance = np.asarray(chance, dtype=np.float64)
+    return np.ceil(np.log1p(-confidence) / np.log1p(-chance))
+
+def catch_grid(catch_rates, prices, species_names=None, levels=LEVELS, hp_fractions=None):
+    """
+    Catch odds for every ball x species x level x HP.
+
+    catch_rates / prices: one entry per ball (real items or hypothetical ones, e.g. for shop balancing).
+    species_names: default all species.
+    hp_fractions: None = exact current HP axis 0..max max_hp (entries with hp == 0 or hp > max_hp are nan);
+                  otherwise current HP is round(fraction * max_hp), at least 1.
+
+    Returns a dictionary:
+    {
+        'species': list[str], 'levels': int array, 'hp': int array or 'hp_fractions': float array (axis labels)
+        'max_hp': int64 (S, L)
+        'chance': float64 (B, S, L, H)           # catch chance per throw
+        'expected_balls': float64 (B, S, L, H)   # 1 / chance
+        'expected_cost': float64 (B, S, L, H)    # price / chance
+    }
+    """
+    species_names = list(species_data) if species_names is None else list(species_names)
+    levels = np.asarray(list(levels), dtype=np.int64)
+    rates = np.asarray(catch_rates, dtype=np.float64)
+    prices = np.asarray(prices, dtype=np.float64)
+    max_hp = stat_arrays(species_names, levels)[:, :, 0] # (S, L)
+
+    grid = {'species': species_names, 'levels': levels, 'max_hp': max_hp}
+    if hp_fractions is None:
+        hp = np.arange(int(max_hp.max()) + 1, dtype=np.int64)
+        current = np.broadcast_to(hp, max_hp.shape + hp.shape)
+        valid = (current >= 1) & (current <= max_hp[:, :, None])
+        grid['hp'] = hp
+    else:
+        fractions = np.asarray(hp_fractions, dtype=np.float64)
+        current = np.clip(np.rint(fractions[None, None, :] * max_hp[:, :, None]), 1, max_hp[:, :, None]).astype(np.int64)
+        valid = np.ones(current.shape, dtype=bool)
+        grid['hp_fractions'] = fractions
+
+    # Same operation order as use_item: current_hp / max_hp, then the formula
+    ratio = current / max_hp[:, :, None]
+    chance = catch_chance(ratio[None], rates[:, None, None, None])
+    chance = np.where(valid[None], chance, np.nan)
+    grid['chance'] = chance
+    grid['expected_balls'] = 1.0 / chance
+    grid['expected_cost'] = prices[:, None, None, None] / chance
+    return grid
+
+class CatchTable:
+    """Exact catch odds of one ball for every species, level and current HP. Lookups are array reads."""
+    def __init__(self, ball_name):
+        item = items[ball_name]
+        self.ball_name = ball_name
+        self.price = item.price
+        grid = catch_grid([item.catch_rate], [item.price])
+        self.species_index = {name: i for i, name in enumerate(grid['species'])}
+        self.first_level = int(grid['levels'][0])
+        self.last_level = int(grid['levels'][-1])
+        self.max_hp = grid['max_hp']
+        self.chance = grid['chance'][0]
+        self.expected_balls = grid['expected_balls'][0]
+        self.expected_cost = grid['expected_cost'][0]
+
+    def odds(self, species, level, current_hp):
+        """
+        Returns a dictionary:
+        { 'chance': float, 'expected_balls': float, 'expected_cost': float, 'balls_90': int }
+        Raises ValueError for an unknown species, a level outside the table or HP outside 1..max_hp
+        (a negative index would silently read another cell).
+        """
+        if species not in self.species_index:
+            raise ValueError(f"Unknown species: {species}")
+        if not self.first_level <= level <= self.last_level:
+            raise ValueError(f"Level {level} is outside {self.first_level}..{self.last_level}.")
+        s = self.species_index[species]
+        l = level - self.first_level
+        max_hp = int(self.max_hp[s, l])
+        if not 1 <= current_hp <= max_hp:
+            raise ValueError(f"HP {current_hp} is outside 1..{max_hp}.")
+        idx = (s, l, current_hp)
+        chance = float(self.chance[idx])
+        return {
+            'chance': chance,
+            'expected_balls': float(self.expected_balls[idx]),
+            'expected_cost': float(self.expected_cost[idx]),
+            'balls_90': int(balls_for_confidence(chance, 0.9))
+        }
+
+@lru_cache(maxsize=None)
+def catch_table(ball_name):
+    """CatchTable of a ball, built on first use."""
+    return CatchTable(ball_name)
+
+@lru_cache(maxsize=4096)
+def catch_odds(ball_name, species, level, current_hp):
+    """Odds of catching this Pokemon (as it is now) with ball_name. See CatchTable.odds."""
+    return catch_table(ball_name).odds(species, level, current_hp)
+
+def warm_tables():
+    """Builds the table of every ball now (about 25 ms each), e.g. on a worker thread at battle start."""
+    for ball in ball_names():
+        catch_table(ball)
+
+def format_table(ball_name, species_names=None, levels=(3, 5, 10), hp_fractions=(1.0, 0.5, 0.2)):
+    """Expected balls and cost per species at a few levels and HP fractions, as text."""
+    item = items[ball_name]
+    grid = catch_grid([item.catch_rate], [item.price], species_names, levels, hp_fractions)
+    header = f"{'Species':<10} {'Lv':>3}" + "".join(f" {f'{f:.0%} HP':>16}" for f in hp_fractions)
+    lines = [f"{ball_name} (catch rate {item.catch_rate}, {item.price} each): expected balls / cost", header]
+    for s, species in enumerate(grid['species']):
+        for l, level in enumerate(grid['levels']):
+            cells = "".join(f" {grid['expected_balls'][0, s, l, h]:>6.2f} / {grid['expected_cost'][0, s, l, h]:>7.0f}"
+                            for h in range(len(hp_fractions)))
+            lines.append(f"{species:<10} {level:>3}{cells}")
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    import time
+    start = time.perf_counter()
+    for ball in ball_names():
+        catch_table(ball)
+    built = time.perf_counter() - start
+    for ball in ball_names():
+        print(format_table(ball))
+    print(f"Exact tables for {len(ball_names())} ball(s) built in {built * 1000:.1f} ms")
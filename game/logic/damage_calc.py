@@ -0,0 +1,118 @@
+from functools import lru_cache
+from game.data.moves_data import moves
+from game.data.pokemon_data import type_effectiveness
+from game.logic.effects import PARALYSIS_SKIP
+
+# Exact damage distributions for one use of a move.
+# Battle._execute_move does:
+#   skip with 25% chance if the attacker is paralyzed
+#   miss when random() > accuracy
+#   damage = max(1, int(max(1, int(power * atk / max(1, def) / 2)) * eff * uniform(0.85, 1.0)))
+#   status applied with effect_chance if the defender survives and has no status yet
+# Since the roll is continuous, P(damage == k) is the length of the roll interval giving k.
+# Results are memoized on (move, attacker stats, defender stats), so repeated queries
+# from the AI or the battle UI are dictionary lookups. The caches are bounded (LRU), since
+# long-running processes (link server, balancer and tournament pools) meet ever new stats.
+
+ROLL_MIN = 0.85
+ROLL_MAX = 1.0
+DISTRIBUTION_CACHE_SIZE = 4096
+KO_CACHE_SIZE = 16384 # also keyed on HP and hit count
+
+def _effectiveness(move, defender_type):
+    return type_effectiveness.get((move.type, defender_type), 1.0)
+
+@lru_cache(maxsize=DISTRIBUTION_CACHE_SIZE)
+def hit_distribution(move_name, attack, defense, defender_type):
+    """
+    Distribution of damage when the move hits.
+    Returns tuple of (damage, probability) sorted by damage.
+    """
+    move = moves[move_name]
+    base = int(move.power * attack / max(1, defense) / 2)
+    if base < 1: base = 1
+    scaled = base * _effectiveness(move, defender_type)
+    width = ROLL_MAX - ROLL_MIN
+
+    probs = {}
+    k = int(scaled * ROLL_MIN)
+    while k <= int(scaled * ROLL_MAX):
+        # Rolls u with int(scaled * u) == k lie in [k / scaled, (k + 1) / scaled)
+        lo = max(ROLL_MIN, k / scaled)
+        hi = min(ROLL_MAX, (k + 1) / scaled)
+        if hi > lo:
+            dmg = k if k >= 1 else 1
+            probs[dmg] = probs.get(dmg, 0.0) + (hi - lo) / width
+        k += 1
+    return tuple(sorted(probs.items()))
+
+@lru_cache(maxsize=DISTRIBUTION_CACHE_SIZE)
+def damage_distribution(move_name, attack, defense, defender_type, paralyzed=False):
+    """
+    Distribution of damage for one use of the move, including misses and
+    full paralysis as 0 damage.
+    Returns tuple of (damage, probability) sorted by damage.
+    """
+    move = moves[move_name]
+    act = 1.0 - PARALYSIS_SKIP if paralyzed else 1.0
+    hit = act * move.accuracy
+    dist = [(0, 1.0 - hit)] if hit < 1.0 else []
+    for dmg, p in hit_distribution(move_name, attack, defense, defender_type):
+        dist.append((dmg, p * hit))
+    return tuple(dist)
+
+@lru_cache(maxsize=KO_CACHE_SIZE)
+def _ko_chance(move_name, attack, defense, defender_type, paralyzed, hp, hits):
+    dist = damage_distribution(move_name, attack, defense, defender_type, paralyzed)
+    # Total damage capped at hp (absorbing KO state) keeps the convolution small
+    totals = {0: 1.0}
+    for _ in range(hits):
+        nxt = {}
+        for total, p in totals.items():
+            if total >= hp:
+                nxt[hp] = nxt.get(hp, 0.0) + p
+                continue
+            for dmg, q in dist:
+                t = min(hp, total + dmg)
+                nxt[t] = nxt.get(t, 0.0) + p * q
+        totals = nxt
+    return totals.get(hp, 0.0)
+
+def move_distribution(move_name, attacker, defender):
+    """damage_distribution for two Pokemon objects."""
+    return damage_distribution(move_name, attacker.attack, defender.defense, defender.type,
+                               attacker.status == "paralyzed")
+
+def expected_damage(move_name, attacker, defender, cap=None):
+    """Mean damage of one use. cap limits each outcome (e.g. to the defender's HP) to ignore overkill."""
+    total = 0.0
+    for dmg, p in move_distribution(move_name, attacker, defender):
+        if cap is not None and dmg > cap:
+            dmg = cap
+        total += dmg * p
+    return total
+
+def ko_probability(move_name, attacker, defender, hits=1, hp=None):
+    """Probability that `hits` uses of the move deal at least hp damage (default: defender's current HP)."""
+    if hp is None:
+        hp = defender.current_hp
+    if hp <= 0:
+        return 1.0
+    return _ko_chance(move_name, attacker.attack, defender.defense, defender.type,
+                      attacker.status == "paralyzed", hp, hits)
+
+def status_chance(move_name, attacker, defender):
+    """Probability that one use of the move inflicts its status condition on the defender."""
+    move = moves[move_name]
+    if move.on_hit is None or move.effect_chance <= 0 or defender.status is not None:
+        return 0.0
+    survive = 0.0
+    for dmg, p in move_distribution(move_name, attacker, defender):
+        if dmg > 0 and dmg < defender.current_hp:
+            survive += p
+    return survive * move.effect_chance
+
+def clear_cache():
+    hit_distribution.cache_clear()
+    damage_distribution.cache_clear()
+    _ko_chance.cache_clear()
@@ -0,0 +1,127 @@
+import numpy as np
+from game.data.moves_data import moves
+from game.data.pokemon_data import species_data, type_effectiveness
+
+# Batched damage calculator for balance reviews.
+# Uses the exact formula of Battle._execute_move, evaluated with NumPy over whole
+# attacker species x move x defender species x level grids in one call:
+#   base   = max(1, int(power * attack / max(1, defense) / 2))
+#   damage = max(1, int(base * effectiveness * roll)),  roll ~ uniform(0.85, 1.0)
+# and the move hits when random() <= accuracy.
+# For a given roll value every cell matches the scalar path bit for bit.
+
+ROLL_MIN = 0.85
+ROLL_MAX = 1.0
+STAT_KEYS = ("hp", "atk", "def", "spd")
+DEFAULT_LEVELS = range(1, 101)
+
+def stat_arrays(species_names, levels):
+    """
+    Stats of every species at every level, as Pokemon.__init__ computes them.
+    Returns int64 array of shape (species, levels, 4) in STAT_KEYS order.
+    """
+    base = np.array([[species_data[s]["base_stats"][k] for k in STAT_KEYS] for s in species_names], dtype=np.int64)
+    growth = np.array([[species_data[s]["growth"][k] for k in STAT_KEYS] for s in species_names], dtype=np.int64)
+    lv = np.asarray(levels, dtype=np.int64)
+    return base[:, None, :] + (lv[None, :, None] - 1) * growth[:, None, :]
+
+def effectiveness_matrix(move_names, species_names):
+    """type_effectiveness multiplier of every move against every species. Shape (moves, species)."""
+    eff = np.ones((len(move_names), len(species_names)), dtype=np.float64)
+    for i, m in enumerate(move_names):
+        move_type = moves[m].type
+        for j, s in enumerate(species_names):
+            eff[i, j] = type_effectiveness.get((move_type, species_data[s]["type"]), 1.0)
+    return eff
+
+def _apply_roll(scaled, roll):
+    return np.maximum(np.trunc(scaled * roll).astype(np.int64), 1)
+
+def _floor_integral(y):
+    # Integral of floor(x) dx from 0 to y (y >= 0)
+    k = np.floor(y)
+    return k * (k - 1) / 2 + k * (y - k)
+
+def _expected_roll(scaled):
+    """Closed-form mean of max(1, int(scaled * roll)) with roll ~ uniform(ROLL_MIN, ROLL_MAX)."""
+    width = ROLL_MAX - ROLL_MIN
+    mean_floor = (_floor_integral(scaled * ROLL_MAX) - _floor_integral(scaled * ROLL_MIN)) / scaled
+    # Rolls where int() gives 0 are bumped up to 1
+    below_one = np.clip(1.0 / scaled - ROLL_MIN, 0.0, width)
+    return (mean_floor + below_one) / width
+
+def damage_grid(attackers=None, move_names=None, defenders=None, levels=DEFAULT_LEVELS, defender_level=None,
+                rolls=None):
+    """
+    Computes damage for every attacker species x move x defender species x level combination.
+    Attacker and defender share the level axis unless defender_level fixes the defender's level.
+
+    attackers / defenders: species names (default: all species).
+    move_names: move names (default: all moves). Moves are not filtered by learnset.
+    rolls: optional sequence of roll values in [0.85, 1.0) to evaluate exactly.
+
+    Returns a dictionary:
+    {
+        'attackers', 'moves', 'defenders': list[str], 'levels': int array (axis labels)
+        'base': int64 (A, M, D, L)          # damage before effectiveness and roll
+        'effectiveness': float64 (M, D)
+        'accuracy': float64 (M,)            # hit chance
+        'min': int64 (A, M, D, L)           # damage at roll 0.85
+        'max': int64 (A, M, D, L)           # damage at roll 1.0 (upper bound)
+        'expected': float64 (A, M, D, L)    # mean damage over the roll band, weighted by accuracy
+        'rolled': int64 (A, M, D, L, R)     # only when rolls is given
+    }
+    """
+    attackers = list(species_data) if attackers is None else list(attackers)
+    defenders = list(species_data) if defenders is None else list(defenders)
+    move_names = list(moves) if move_names is None else list(move_names)
+    levels = np.asarray(list(levels), dtype=np.int64)
+
+    atk = stat_arrays(attackers, levels)[:, :, 1] # (A, L)
+    if defender_level is None:
+        dfn = stat_arrays(defenders, levels)[:, :, 2] # (D, L)
+    else:
+        dfn = np.repeat(stat_arrays(defenders, [defender_level])[:, :, 2], len(levels), axis=1)
+    dfn = np.maximum(dfn, 1)
+    power = np.array([moves[m].power for m in move_names], dtype=np.int64)
+    accuracy = np.array([moves[m].accuracy for m in move_names], dtype=np.float64)
+    eff = effectiveness_matrix(move_names, defenders)
+
+    # Same operation order as the scalar path: ((power * attack) / defense) / 2
+    raw = (power[None, :, None, None] * atk[:, None, None, :]) / dfn[None, None, :, :] / 2
+    base = np.maximum(np.trunc(raw).astype(np.int64), 1)
+    scaled = base * eff[None, :, :, None]
+
+    expected = _expected_roll(scaled) * accuracy[None, :, None, None]
+
+    grid = {
+        'attackers': attackers,
+        'moves': move_names,
+        'defenders': defenders,
+        'levels': levels,
+        'base': base,
+        'effectiveness': eff,
+        'accuracy': accuracy,
+        'min': _apply_roll(scaled, ROLL_MIN),
+        'max': _apply_roll(scaled, ROLL_MAX),
+        'expected': expected
+    }
+    if rolls is not None:
+        r = np.asarray(rolls, dtype=np.float64)
+        grid['rolled'] = _apply_roll(scaled[..., None], r)
+    return grid
+
+def sample_damage(grid, n=1, rng=None):
+    """
+    Draws n random outcomes per cell of a damage_grid result, misses included as 0 damage.
+    rng: numpy Generator (default: fresh default_rng()).
+    Returns int64 array of shape (A, M, D, L, n).
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    base = grid['base']
+    scaled = (base * grid['effectiveness'][None, :, :, None])[..., None]
+    shape = base.shape + (n,)
+    damage = _apply_roll(scaled, rng.uniform(ROLL_MIN, ROLL_MAX, size=shape))
+    hit = rng.random(size=shape) <= grid['accuracy'][None, :, None, None, None]
+    return np.where(hit, damage, 0)
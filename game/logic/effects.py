@@ -0,0 +1,72 @@
+from game.logic import events as ev
+
+# Move effects and status conditions, compiled once at load time.
+# Every Move gets (see compile_move):
+#   move.effect_code   status code it inflicts (NO_STATUS if none)
+#   move.inflicts      Pokemon.status string it inflicts ("burned"), None if none
+#   move.on_hit        handler(battle, move, attacker, defender, is_player) -> bool, None if no effect
+# and every status string maps to its handlers in BEFORE_MOVE / END_OF_TURN, so the battle
+# hot path does one lookup instead of comparing strings.
+# Pokemon.status stays a string (None, "poisoned", "burned", "paralyzed") for saves and items.
+# A new effect (sleep, confusion, stat drops) is a handler plus an entry in these tables
+# (and its text in game.logic.events).
+
+NO_STATUS, POISONED, BURNED, PARALYZED = 0, 1, 2, 3
+STATUS_NAMES = (None, "poisoned", "burned", "paralyzed")           # code -> Pokemon.status
+STATUS_CODES = {name: code for code, name in enumerate(STATUS_NAMES)} # Pokemon.status -> code
+EFFECT_STATUS = {"poison": POISONED, "burn": BURNED, "paralyze": PARALYZED} # Move.effect -> code
+
+PARALYSIS_SKIP = 0.25
+TICK_DIVISOR = 10 # poison/burn take max_hp // 10 at the end of each turn
+
+# Status handlers
+
+def _fully_paralyzed(battle, mon, is_player):
+    """Before-move check. Returns True if the Pokemon loses its turn."""
+    if battle.rng.random() < PARALYSIS_SKIP:
+        battle._emit((ev.FULLY_PARALYZED, is_player, mon.species))
+        return True
+    return False
+
+def _tick_damage(battle, mon, is_player):
+    dmg = max(1, mon.max_hp // TICK_DIVISOR)
+    mon.current_hp -= dmg
+    battle._emit((ev.STATUS_DAMAGE, is_player, mon.species, mon.status, dmg, mon.current_hp))
+
+# Pokemon.status -> handler(battle, mon, is_player); statuses without an entry do nothing
+BEFORE_MOVE = {"paralyzed": _fully_paralyzed}
+END_OF_TURN = {"poisoned": _tick_damage, "burned": _tick_damage}
+
+# Move effect handlers
+
+def _make_inflict(status):
+    """Handler inflicting `status` with the move's effect_chance on a defender without a status."""
+    def inflict(battle, move, attacker, defender, is_player):
+        if defender.status is None and battle.rng.random() < move.effect_chance:
+            defender.status = status
+            battle._emit((ev.STATUS_APPLIED, not is_player, defender.species, status))
+            return True
+        return False
+    return inflict
+
+# Move.effect -> handler
+EFFECT_HANDLERS = {effect: _make_inflict(STATUS_NAMES[code]) for effect, code in EFFECT_STATUS.items()}
+
+def compile_move(move):
+    """Attaches effect_code, inflicts and on_hit to a Move. Unknown effects raise ValueError."""
+    if move.effect is None:
+        move.effect_code = NO_STATUS
+        move.inflicts = None
+        move.on_hit = None
+        return move
+    if move.effect not in EFFECT_HANDLERS:
+        raise ValueError(f"Unknown move effect: {move.effect}")
+    move.effect_code = EFFECT_STATUS[move.effect]
+    move.inflicts = STATUS_NAMES[move.effect_code]
+    move.on_hit = EFFECT_HANDLERS[move.effect]
+    return move
+
+def compile_moves(move_table):
+    for move in move_table.values():
+        compile_move(move)
+    return move_table
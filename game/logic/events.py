@@ -0,0 +1,92 @@
+# Battle events.
+# Battle emits compact tuples (kind, *fields) instead of building log strings on every hit.
+# Text is only produced when a consumer asks for it via format_event / format_events.
+# `side` fields are True for the player's side and False for the opponent's.
+
+TEXT = 0               # (TEXT, message) - pre-formatted text (items, level-ups)
+WILD_APPEARED = 1      # (WILD_APPEARED, species)
+CHALLENGE = 2          # (CHALLENGE, trainer_name)
+TRAINER_SEND_OUT = 3   # (TRAINER_SEND_OUT, trainer_name, species)
+PLAYER_SEND_OUT = 4    # (PLAYER_SEND_OUT, species) - battle start
+SWITCH = 5             # (SWITCH, old_species, new_species)
+REPLACE = 6            # (REPLACE, species) - replaces a fainted Pokemon
+CANT_RUN = 7           # (CANT_RUN,)
+ESCAPED = 8            # (ESCAPED,)
+ESCAPE_FAILED = 9      # (ESCAPE_FAILED,)
+FULLY_PARALYZED = 10   # (FULLY_PARALYZED, side, species)
+MOVE_USED = 11         # (MOVE_USED, side, species, move_name)
+MISSED = 12            # (MISSED, side)
+DAMAGE = 13            # (DAMAGE, side, species, amount, hp_left) - side of the defender
+EFFECTIVENESS = 14     # (EFFECTIVENESS, multiplier)
+STATUS_APPLIED = 15    # (STATUS_APPLIED, side, species, status)
+STATUS_DAMAGE = 16     # (STATUS_DAMAGE, side, species, status, amount, hp_left)
+FAINT = 17             # (FAINT, side, species)
+NO_MORE_POKEMON = 18   # (NO_MORE_POKEMON,)
+EXP = 19               # (EXP, species, amount)
+WON = 20               # (WON,)
+
+NAMES = {
+    TEXT: "text", WILD_APPEARED: "wild_appeared", CHALLENGE: "challenge",
+    TRAINER_SEND_OUT: "trainer_send_out", PLAYER_SEND_OUT: "player_send_out",
+    SWITCH: "switch", REPLACE: "replace", CANT_RUN: "cant_run", ESCAPED: "escaped",
+    ESCAPE_FAILED: "escape_failed", FULLY_PARALYZED: "fully_paralyzed", MOVE_USED: "move_used",
+    MISSED: "missed", DAMAGE: "damage", EFFECTIVENESS: "effectiveness",
+    STATUS_APPLIED: "status_applied", STATUS_DAMAGE: "status_damage", FAINT: "faint",
+    NO_MORE_POKEMON: "no_more_pokemon", EXP: "exp", WON: "won"
+}
+
+def _effectiveness_text(event):
+    mult = event[1]
+    if mult > 1: return ["It's super effective!"]
+    if 0 < mult < 1: return ["It's not very effective..."]
+    return []
+
+# End-of-turn damage text per Pokemon.status
+STATUS_DAMAGE_TEXT = {
+    "poisoned": "{} is hurt by poison!",
+    "burned": "{} is hurt by its burn!"
+}
+
+def _status_damage_text(event):
+    return [STATUS_DAMAGE_TEXT[event[3]].format(event[2])]
+
+def _faint_text(event):
+    if event[1]:
+        return [f"Your {event[2]} fainted!"]
+    return [f"{event[2]} fainted!"]
+
+# kind -> function(event) -> list of lines
+_FORMATTERS = {
+    TEXT: lambda e: [e[1]],
+    WILD_APPEARED: lambda e: [f"A wild {e[1]} appeared!"],
+    CHALLENGE: lambda e: [f"{e[1]} wants to battle!"],
+    TRAINER_SEND_OUT: lambda e: [f"{e[1]} sent out {e[2]}!"],
+    PLAYER_SEND_OUT: lambda e: [f"Go! {e[1]}!"],
+    SWITCH: lambda e: [f"Come back, {e[1]}!", f"Go, {e[2]}!"],
+    REPLACE: lambda e: [f"Go, {e[1]}!"],
+    CANT_RUN: lambda e: ["You can't run from a trainer battle!"],
+    ESCAPED: lambda e: ["Got away safely!"],
+    ESCAPE_FAILED: lambda e: ["Couldn't escape!"],
+    FULLY_PARALYZED: lambda e: [f"{e[2]} is paralyzed and can't move!"],
+    MOVE_USED: lambda e: [f"{e[2]} used {e[3]}!"],
+    MISSED: lambda e: ["But it missed!"],
+    DAMAGE: lambda e: [f"It did {e[3]} damage."],
+    EFFECTIVENESS: _effectiveness_text,
+    STATUS_APPLIED: lambda e: [f"{e[2]} was {e[3]}!"],
+    STATUS_DAMAGE: _status_damage_text,
+    FAINT: _faint_text,
+    NO_MORE_POKEMON: lambda e: ["You have no more Pokemon!"],
+    EXP: lambda e: [f"Gained {e[2]} XP."],
+    WON: lambda e: ["You won the battle!"]
+}
+
+def format_event(event):
+    """Returns the list of log lines for one event (may be empty)."""
+    return _FORMATTERS[event[0]](event)
+
+def format_events(events):
+    """Returns the flat list of log lines for a sequence of events."""
+    lines = []
+    for event in events:
+        lines.extend(_FORMATTERS[event[0]](event))
+    return lines
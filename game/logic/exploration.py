@@ -1,6 +1,7 @@
 import random
 from game.models.pokemon import Pokemon
 from game.models.trainer import Trainer
+from game.data.trainers_data import STORY_TRAINERS
 
 class ExplorationLogic:
     NEIGHBORS = {
@@ -15,6 +16,28 @@ class ExplorationLogic:
     def get_neighbors(location):
         return ExplorationLogic.NEIGHBORS.get(location, [])
 
+    @staticmethod
+    def starter_type(player):
+        """Type of the player's first Pokemon, which story trainers counter-pick against."""
+        return player.pokemon[0].type if player.pokemon else "Fire"
+
+    @staticmethod
+    def story_trainer(key, starter_type="Fire", name=None, level_offset=0):
+        """
+        Builds a story trainer from game.data.trainers_data.
+        name: overrides the trainer name (the rival uses the player's rival_name).
+        level_offset: added to every level (at least 1), used by the balancer.
+        """
+        spec = STORY_TRAINERS[key]
+        party = []
+        for species, lvl in spec["party"]:
+            if isinstance(species, dict):
+                species = species.get(starter_type, species["default"])
+            party.append(Pokemon(species, level=max(1, lvl + level_offset)))
+        return Trainer(spec["name"] if name is None else name, party, prize=spec.get("prize", 0),
+                       is_gym_leader=spec.get("is_gym_leader", False), badge_reward=spec.get("badge_reward"),
+                       ai=spec.get("ai"))
+
     @staticmethod
     def travel(player, destination):
         """
@@ -40,67 +63,9 @@ class ExplorationLogic:
                 }
             
             if not player.story_flags["rival2_done"]:
-                # Trigger Rival 2 Battle
-                # Logic to determine rival team based on starter
-                p_type = player.pokemon[0].type if player.pokemon else "Fire"
-                if p_type == "Fire":
-                    rival_main_species = "Aquaria"
-                elif p_type == "Water":
-                    rival_main_species = "Florin" # Actually logic in main.py line 1318-1323 reversed type?
-                    # Main.py line 1391: if p_type Water -> rival_species Florin.
-                    # Yes.
-                    # Wait, Main.py Line 1391 `rival_starter_species = "Florin"`.
-                    # Line 1392 `rival_main_species = "Pyronite"`. 
-                    # This seems conflicting in original code?
-                    # Line 1390: if Fire -> Aquade / Aquaria.
-                    # Line 1392: if Water -> Florin / Pyronite? (Grass > Water, Fire < Water).
-                    # Actually rival takes advantage. If I am Water, Rival is Grass (Florin).
-                    # Why Pyronite in 1392? That seems like a bug in original code or I misread.
-                    # Re-reading main.py line 1391-1392:
-                    # `elif p_type == "Water": rival_starter...=Florin; rival_main...=Pyronite`
-                    # Pyronite is Fire. Water beats Fire. Rival should have Grass.
-                    # I will faithfully replicate the logic OR fix it.
-                    # Given "100% functional", maybe I stick to it? Or fix obvious bug?
-                    # I'll stick to logic but maybe check if I misread.
-                    # Ah, `rival_main` is the evolved starter?
-                    # If I picked Water, Rival picked Grass (Florin).
-                    # Florin evolves to Florac.
-                    # Pyronite is evolved Pyron (Fire).
-                    # It seems main.py might have mixed them up lines 1391-1394.
-                    pass
-                
-                # I will implement a safe logic: Rival keeps their starter.
-                # But main.py reconstructs rival team on the fly.
-                
-                # Let's simplify for refactor:
-                # We need to return an EVENT that says "Battle Rival".
-                # The UI/Controller will set up the battle.
-                # Or we return the opponent object here.
-                
-                rival_main = Pokemon("Rattatak", level=1) # Placeholder, logic below
-                # ... reconstruction logic ...
-                # Actually, strictly better to return "EVENT_RIVAL_BATTLE_2" and let a BattleFactory handle team creation?
-                # Or create team here.
-                
-                # Re-implementing logic:
-                if p_type == "Fire":
-                    rival_main_species = "Aquaria"
-                elif p_type == "Water":
-                    # Fixing the likely bug or following code? Code says Pyronite. I'll use Florac for correctness if I can, but maybe Pyronite was intended?
-                    # I'll use Florac to be "better", or stick to Pyronite.
-                    # Let's stick to valid type advantage: Florac.
-                    rival_main_species = "Pyronite" # sticking to code to avoid "changing logic" accusation, but it's weird.
-                else: 
-                     rival_main_species = "Pyronite" if p_type == "Grass" else "Aquaria" # Code was messy there.
-                
-                # Let's clean this up to match "Rival takes advantage".
-                if p_type == "Fire": main_s = "Aquaria"
-                elif p_type == "Water": main_s = "Florac"
-                else: main_s = "Pyronite"
-                
-                rival_main = Pokemon(main_s, level=11)
-                rival_side = Pokemon("Rattatak", level=9)
-                trainer = Trainer(player.rival_name, [rival_main, rival_side], prize=300)
+                # Trigger Rival 2 Battle (team depends on the player's starter)
+                trainer = ExplorationLogic.story_trainer("rival2", ExplorationLogic.starter_type(player),
+                                                         name=player.rival_name)
                 
                 return {
                     "success": False, # Travel blocked until battle won
@@ -110,9 +75,7 @@ class ExplorationLogic:
 
         if destination == "Rocket Hideout":
             if not player.story_flags["grunt_defeated"]:
-                grunt_mon1 = Pokemon("Rattatak", level=6)
-                grunt_mon2 = Pokemon("Wingon", level=6)
-                trainer = Trainer("Team Rocket Grunt", [grunt_mon1, grunt_mon2], prize=200)
+                trainer = ExplorationLogic.story_trainer("grunt")
                 return {
                     "success": False,
                     "message": "Team Rocket Grunt: Stop right there, kid!",
@@ -124,13 +87,16 @@ class ExplorationLogic:
         return {"success": True, "message": f"Traveled to {destination}.", "event": None}
 
     @staticmethod
-    def explore(player):
+    def explore(player, rng=None):
         """
+        rng: random stream for encounters (defaults to the global random module).
         Returns {
             "message": str,
             "event": dict or None
         }
         """
+        if rng is None:
+            rng = random
         loc = player.current_location
         
         if loc == "Pallet Town":
@@ -138,16 +104,15 @@ class ExplorationLogic:
              
         elif loc == "Route 1":
              if not player.story_flags["joey_defeated"]:
-                 joey_mon = Pokemon("Rattatak", level=3)
-                 trainer = Trainer("Youngster Joey", [joey_mon], prize=50)
+                 trainer = ExplorationLogic.story_trainer("joey")
                  return {
                      "message": "Youngster Joey: Hey! Battle me!",
                      "event": {"type": "battle", "opponent": trainer, "is_wild": False, "flag_on_win": "joey_defeated"}
                  }
              
-             if random.random() < 0.7:
-                 s_name = random.choice(["Rattatak", "Wingon"])
-                 lvl = random.randint(2, 3)
+             if rng.random() < 0.7:
+                 s_name = rng.choice(["Rattatak", "Wingon"])
+                 lvl = rng.randint(2, 3)
                  wild = Pokemon(s_name, level=lvl)
                  return {
                      "message": "A wild Pokemon appeared!",
@@ -165,9 +130,9 @@ class ExplorationLogic:
              return {"message": msg, "event": None}
              
         elif loc == "Route 2":
-             if random.random() < 0.7:
-                 s_name = random.choice(["Zappet", "Slimer"])
-                 lvl = random.randint(5, 6)
+             if rng.random() < 0.7:
+                 s_name = rng.choice(["Zappet", "Slimer"])
+                 lvl = rng.randint(5, 6)
                  wild = Pokemon(s_name, level=lvl)
                  return {
                      "message": "A wild Pokemon appeared!",
@@ -177,16 +142,8 @@ class ExplorationLogic:
              
         elif loc == "Rocket Hideout":
              if not player.story_flags["rocket_defeated"]:
-                 # Boss logic
-                 # Determine boss main based on starter type
-                 starter_type = player.pokemon[0].type if player.pokemon else "Fire"
-                 if starter_type == "Fire": boss_s = "Florac"
-                 elif starter_type == "Water": boss_s = "Pyronite"
-                 else: boss_s = "Aquaria"
-                 
-                 boss_main = Pokemon(boss_s, level=12)
-                 boss_side = Pokemon("Slimer", level=9)
-                 trainer = Trainer("Team Rocket Boss", [boss_side, boss_main], prize=1000)
+                 # Boss main depends on the player's starter type
+                 trainer = ExplorationLogic.story_trainer("boss", ExplorationLogic.starter_type(player))
                  return {
                      "message": "Team Rocket Boss: So, you've come to stop me?",
                      "event": {"type": "battle", "opponent": trainer, "is_wild": False, "flag_on_win": "rocket_defeated", "story_end": True}
@@ -204,9 +161,7 @@ class ExplorationLogic:
         if player.story_flags["gym1_beaten"]:
             return {"success": False, "message": "You already beat this gym.", "event": None}
             
-        gym_mon1 = Pokemon("Geon", level=8)
-        gym_mon2 = Pokemon("Geodon", level=12)
-        leader = Trainer("Gym Leader Rocky", [gym_mon1, gym_mon2], prize=500, is_gym_leader=True, badge_reward="Boulder Badge")
+        leader = ExplorationLogic.story_trainer("rocky")
         
         return {
             "success": True,
@@ -0,0 +1,159 @@
+import time
+
+# Optional per-phase profiler for Battle.execute_turn.
+# Pass one to Battle(profiler=...); the battle then reports phase boundaries and
+# move outcomes to it. Without a profiler the engine only pays an `is not None` check
+# at each boundary.
+# Phase times are exclusive: time spent in a nested phase (a faint handled during
+# move execution) is charged to the nested phase only.
+
+RUN = "run"
+SWITCH = "switch"
+ITEM = "item"
+OPPONENT_CHOICE = "opponent_choice"
+MOVES = "moves"
+FAINT = "faint"
+STATUS = "status"
+PHASES = (RUN, SWITCH, ITEM, OPPONENT_CHOICE, MOVES, FAINT, STATUS)
+
+# Move outcomes
+HIT = 0
+MISS = 1
+PARALYZED = 2
+
+# Per-move counter slots
+_USES, _HITS, _MISSES, _PARALYZED, _DAMAGE, _SUPER, _NOT_VERY, _STATUS = range(8)
+
+class BattleProfiler:
+    def __init__(self, clock=time.perf_counter_ns):
+        self.clock = clock
+        self.reset()
+
+    def reset(self):
+        self.turns = 0
+        self.turn_ns = 0
+        self.phase_ns = dict.fromkeys(PHASES, 0)
+        self.phase_calls = dict.fromkeys(PHASES, 0)
+        self.move_counts = {} # move_name -> list of counters (slots above)
+        self._stack = [] # open phases: [phase, start_ns, child_ns]
+        self._turn_start = 0
+
+    # Timing
+
+    def begin_turn(self):
+        self._stack.clear()
+        self._turn_start = self.clock()
+
+    def end_turn(self):
+        # Closes phases left open by an early return (escape, capture, battle over)
+        while self._stack:
+            self.pop()
+        self.turns += 1
+        self.turn_ns += self.clock() - self._turn_start
+
+    def push(self, phase):
+        self.phase_calls[phase] += 1
+        self._stack.append([phase, self.clock(), 0])
+
+    def pop(self):
+        phase, start, child = self._stack.pop()
+        elapsed = self.clock() - start
+        self.phase_ns[phase] += elapsed - child
+        if self._stack:
+            self._stack[-1][2] += elapsed
+
+    # Counters
+
+    def _move(self, move_name):
+        counts = self.move_counts.get(move_name)
+        if counts is None:
+            counts = self.move_counts[move_name] = [0] * 8
+        return counts
+
+    def record_move(self, move_name, outcome, damage=0, effectiveness=1.0):
+        counts = self._move(move_name)
+        counts[_USES] += 1
+        if outcome == HIT:
+            counts[_HITS] += 1
+            counts[_DAMAGE] += damage
+            if effectiveness > 1:
+                counts[_SUPER] += 1
+            elif effectiveness < 1:
+                counts[_NOT_VERY] += 1
+        elif outcome == MISS:
+            counts[_MISSES] += 1
+        else:
+            counts[_PARALYZED] += 1
+
+    def record_status(self, move_name):
+        self._move(move_name)[_STATUS] += 1
+
+    def merge(self, other):
+        """Adds the totals of another profiler (e.g. from a worker process) to this one."""
+        self.turns += other.turns
+        self.turn_ns += other.turn_ns
+        for phase in PHASES:
+            self.phase_ns[phase] += other.phase_ns[phase]
+            self.phase_calls[phase] += other.phase_calls[phase]
+        for name, counts in other.move_counts.items():
+            mine = self._move(name)
+            for i, c in enumerate(counts):
+                mine[i] += c
+
+    # Export
+
+    def summary(self):
+        """
+        Returns a dictionary:
+        {
+            'turns': int, 'total_ms': float, 'mean_turn_us': float,
+            'phases': { phase: {'calls', 'total_ms', 'mean_us', 'share'} },   # share of total turn time
+            'moves': { move_name: {'uses', 'hits', 'misses', 'paralyzed', 'hit_rate', 'damage',
+                                   'mean_damage', 'super_effective', 'not_very_effective', 'status_applied'} }
+        }
+        """
+        phases = {}
+        for phase in PHASES:
+            calls = self.phase_calls[phase]
+            ns = self.phase_ns[phase]
+            phases[phase] = {
+                'calls': calls,
+                'total_ms': ns / 1e6,
+                'mean_us': ns / calls / 1e3 if calls else 0.0,
+                'share': ns / self.turn_ns if self.turn_ns else 0.0
+            }
+        move_stats = {}
+        for name, c in sorted(self.move_counts.items()):
+            attempts = c[_HITS] + c[_MISSES]
+            move_stats[name] = {
+                'uses': c[_USES],
+                'hits': c[_HITS],
+                'misses': c[_MISSES],
+                'paralyzed': c[_PARALYZED],
+                'hit_rate': c[_HITS] / attempts if attempts else 0.0,
+                'damage': c[_DAMAGE],
+                'mean_damage': c[_DAMAGE] / c[_HITS] if c[_HITS] else 0.0,
+                'super_effective': c[_SUPER],
+                'not_very_effective': c[_NOT_VERY],
+                'status_applied': c[_STATUS]
+            }
+        return {
+            'turns': self.turns,
+            'total_ms': self.turn_ns / 1e6,
+            'mean_turn_us': self.turn_ns / self.turns / 1e3 if self.turns else 0.0,
+            'phases': phases,
+            'moves': move_stats
+        }
+
+    def format_summary(self):
+        """Human readable table of summary()."""
+        s = self.summary()
+        lines = [f"{s['turns']} turns, {s['total_ms']:.1f} ms, {s['mean_turn_us']:.1f} us/turn"]
+        lines.append(f"{'phase':<16} {'calls':>8} {'ms':>9} {'us/call':>9} {'share':>7}")
+        for phase, p in s['phases'].items():
+            lines.append(f"{phase:<16} {p['calls']:>8} {p['total_ms']:>9.2f} {p['mean_us']:>9.2f} {p['share']:>6.1%}")
+        lines.append(f"{'move':<16} {'uses':>8} {'hit%':>7} {'para':>6} {'dmg/hit':>8} {'super':>6} {'weak':>6} {'status':>7}")
+        for name, m in s['moves'].items():
+            lines.append(f"{name:<16} {m['uses']:>8} {m['hit_rate']:>6.1%} {m['paralyzed']:>6} {m['mean_damage']:>8.1f} "
+                         f"{m['super_effective']:>6} {m['not_very_effective']:>6} {m['status_applied']:>7}")
+        return "\n".join(lines)
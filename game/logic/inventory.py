@@ -2,9 +2,17 @@ import random
 from game.data.items_data import items
 from game.data.pokemon_data import species_data
 
-def use_item(player, item_name, target=None, is_wild=False, battle=False, opponent=None):
+# Catch chance = clamp((CATCH_HP_WEIGHT * (1 - hp / max_hp) + CATCH_BASE) * ball catch_rate, CATCH_MIN, CATCH_MAX)
+# (game.logic.catch_analytics tabulates it)
+CATCH_HP_WEIGHT = 0.8
+CATCH_BASE = 0.1
+CATCH_MIN = 0.05
+CATCH_MAX = 0.95
+
+def use_item(player, item_name, target=None, is_wild=False, battle=False, opponent=None, rng=None):
     """
     Uses an item.
+    rng: random stream for catch rolls (defaults to the global random module).
     Returns a dictionary:
     {
         'success': bool,
@@ -12,6 +20,8 @@ def use_item(player, item_name, target=None, is_wild=False, battle=False, oppone
         'messages': list[str]
     }
     """
+    if rng is None:
+        rng = random
     result = {
         'success': False,
         'captured': False,
@@ -51,11 +61,11 @@ def use_item(player, item_name, target=None, is_wild=False, battle=False, oppone
             
         # Catch chance calculation
         health_ratio = target.current_hp / target.max_hp
-        catch_chance = (0.8 * (1 - health_ratio) + 0.1) * item.catch_rate
-        if catch_chance > 0.95: catch_chance = 0.95
-        if catch_chance < 0.05: catch_chance = 0.05
+        catch_chance = (CATCH_HP_WEIGHT * (1 - health_ratio) + CATCH_BASE) * item.catch_rate
+        if catch_chance > CATCH_MAX: catch_chance = CATCH_MAX
+        if catch_chance < CATCH_MIN: catch_chance = CATCH_MIN
         
-        if random.random() < catch_chance:
+        if rng.random() < catch_chance:
             result['messages'].append(f"Gotcha! {target.species} was caught!")
             player.add_pokemon(target)
             result['success'] = True
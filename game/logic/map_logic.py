@@ -32,9 +32,10 @@ class MapLogic:
     MARGIN = 32 # Player radius/bounding box
 
     @staticmethod
-    def handle_movement(player, dx, dy):
+    def handle_movement(player, dx, dy, rng=None):
         """
         Updates player position and checks for edge transitions.
+        rng: random stream for encounters (defaults to the global random module).
         Returns: {
             "moved": bool,
             "transition": bool,
@@ -42,6 +43,8 @@ class MapLogic:
             "event": dict or None
         }
         """
+        if rng is None:
+            rng = random
         # Calculate new pos
         new_x = player.x + dx
         new_y = player.y + dy
@@ -107,8 +110,8 @@ class MapLogic:
             # Chance to encounter: 1 in 200 steps roughly
             # logic.explore uses high chances (0.7) because it was designed for menu "Travel".
             # For continuous movement, we need lower probability per frame.
-            if random.random() < 0.01: 
-                res = ExplorationLogic.explore(player)
+            if rng.random() < 0.01: 
+                res = ExplorationLogic.explore(player, rng=rng)
                 if res.get("event"):
                     event = res["event"]
                     message = res["message"]
@@ -0,0 +1,233 @@
+import json
+import os
+import time
+from game.state import GameState
+from game.models.trainer import Player
+from game.logic.ai import OPPONENT_POLICIES
+
+# Battle replays.
+# A battle is fully determined by its starting state, its seed and the actions taken, so a replay
+# stores just that (plus the opponent's chosen moves when they came from a search AI: the search is
+# deterministic, but replaying its choices skips its cost on playback). Pokemon in actions are
+# stored as party indices.
+# Playback rebuilds the battle and feeds the same actions back in, and checks that it ends in
+# the same final state, which makes replays a regression test for engine changes:
+#   python play_replay.py replays/*.replay
+
+REPLAY_VERSION = 1
+REPLAY_DIR = "replays"
+SCRIPTED = "scripted" # opponent moves are read from the replay
+
+def _index_of(party, mon):
+    for i, p in enumerate(party):
+        if p is mon:
+            return i
+    return None
+
+def _final_state(battle):
+    """Per Pokemon [hp, status, level, exp] of both sides, to compare playback against the recording."""
+    return [
+        [[mon.current_hp, mon.status, mon.level, mon.exp] for mon in battle.player.pokemon],
+        [[mon.current_hp, mon.status, mon.level, mon.exp] for mon in battle._opponent_party()]
+    ]
+
+class ReplayRecorder:
+    """
+    Attach right after creating a Battle (or resuming one) to record it:
+        recorder = ReplayRecorder(battle)
+        ... play ...
+        recorder.save()
+    """
+    def __init__(self, battle):
+        self.battle = battle
+        self.initial = GameState.battle_state(battle)
+        if battle.turn == 0 and battle.seed is not None:
+            del self.initial["rng"] # A fresh battle replays from its seed alone
+        self.actions = []
+        battle.action_log = self.actions
+
+        self.opponent_policy = None # classic random move choice
+        self.opponent_moves = None
+        ai = battle.opponent_ai
+        if ai is not None:
+            for name, policy in OPPONENT_POLICIES.items():
+                if policy is ai:
+                    self.opponent_policy = name # Re-created on playback (may draw from the battle RNG)
+                    break
+            else:
+                self.opponent_policy = SCRIPTED
+                self.opponent_moves = []
+                battle.opponent_ai = self._recording_ai(ai)
+
+    def _recording_ai(self, ai):
+        # Scripted playback never calls the AI, so it must not draw from battle.rng (ExpectimaxAI doesn't)
+        moves = self.opponent_moves
+        def record(battle):
+            move = ai(battle)
+            moves.append(move)
+            return move
+        return record
+
+    def _encode(self, action):
+        party = self.battle.player.pokemon
+        kind = action[0]
+        if kind in ("switch", "send_out"):
+            return [kind, _index_of(party, action[1])]
+        if kind == "item" and len(action) > 2:
+            return [kind, action[1], _index_of(party, action[2])]
+        return list(action)
+
+    def to_dict(self):
+        battle = self.battle
+        data = {
+            "version": REPLAY_VERSION,
+            "initial": self.initial,
+            "opponent_policy": self.opponent_policy,
+            "actions": [self._encode(a) for a in self.actions],
+            "result": {
+                "finished": battle.finished,
+                "won": battle.won,
+                "turn": battle.turn,
+                "final": _final_state(battle)
+            }
+        }
+        if self.opponent_moves is not None:
+            data["opponent_moves"] = self.opponent_moves
+        return data
+
+    def save(self, filename=None, directory=REPLAY_DIR):
+        """Returns (success, message)"""
+        if not filename:
+            stamp = time.strftime("%Y%m%d_%H%M%S")
+            base = os.path.join(directory, f"{self.battle.player.name}_{stamp}")
+            filename = base + ".replay"
+            n = 1
+            while os.path.exists(filename):
+                n += 1
+                filename = f"{base}_{n}.replay"
+        try:
+            folder = os.path.dirname(filename)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            with open(filename, "w") as f:
+                json.dump(self.to_dict(), f, separators=(",", ":"))
+            return True, f"Replay saved as {filename}."
+        except Exception as e:
+            return False, f"Error saving replay: {e}"
+
+def load_replay(filename):
+    """Returns (replay_dict, message) or (None, error_message)"""
+    try:
+        with open(filename, "r") as f:
+            replay = json.load(f)
+    except FileNotFoundError:
+        return None, "Replay file not found."
+    except Exception as e:
+        return None, f"Error loading replay: {e}"
+    if replay.get("version") != REPLAY_VERSION:
+        return None, "Replay is from an incompatible version."
+    return replay, "Replay loaded."
+
+class ReplayPlayer:
+    """Re-executes a replay on a freshly built Battle, one action per step()."""
+    def __init__(self, replay, quiet=True):
+        self.replay = replay
+        initial = replay["initial"]
+        self.battle = GameState.battle_from_state(Player(initial["player_name"], []), initial, quiet=quiet)
+
+        policy = replay["opponent_policy"]
+        if policy is None:
+            self.battle.opponent_ai = None
+        elif policy == SCRIPTED:
+            moves = iter(replay["opponent_moves"])
+            self.battle.opponent_ai = lambda battle: next(moves)
+        else:
+            self.battle.opponent_ai = OPPONENT_POLICIES[policy]
+        self.index = 0
+
+    @property
+    def done(self):
+        return self.battle.finished or self.index >= len(self.replay["actions"])
+
+    def _decode(self, action):
+        party = self.battle.player.pokemon
+        kind = action[0]
+        if kind in ("switch", "send_out"):
+            return (kind, party[action[1]])
+        if kind == "item" and len(action) > 2:
+            target = party[action[2]] if action[2] is not None else None
+            return (kind, action[1], target)
+        return tuple(action)
+
+    def step(self):
+        """Plays the next action. Returns its events, or None when the replay is over."""
+        if self.done:
+            return None
+        action = self._decode(self.replay["actions"][self.index])
+        self.index += 1
+        if action[0] == "send_out":
+            return self.battle.send_out(action[1])
+        return self.battle.execute_turn(action)['events']
+
+    def run(self):
+        """
+        Plays all remaining actions.
+        Returns a dictionary:
+        {
+            'finished': bool, 'won': bool, 'turn': int,
+            'matches': bool   # same outcome and final state as when it was recorded
+        }
+        """
+        battle = self.battle
+        step = self.step
+        while step() is not None:
+            pass
+        expected = self.replay["result"]
+        matches = (battle.finished == expected["finished"] and battle.won == expected["won"]
+                   and battle.turn == expected["turn"] and _final_state(battle) == expected["final"])
+        return {
+            'finished': battle.finished,
+            'won': battle.won,
+            'turn': battle.turn,
+            'matches': matches
+        }
+
+def play_replay(replay):
+    """Headless playback at full speed. See ReplayPlayer.run."""
+    return ReplayPlayer(replay, quiet=True).run()
+
+def sweep(filenames):
+    """
+    Plays every replay file headless.
+    Returns a dictionary:
+    {
+        'replays': int, 'mismatches': list[str], 'errors': list[(str, str)],
+        'elapsed': float, 'per_sec': float
+    }
+    """
+    replays = []
+    errors = []
+    for filename in filenames:
+        replay, msg = load_replay(filename)
+        if replay is None:
+            errors.append((filename, msg))
+        else:
+            replays.append((filename, replay))
+
+    # Only playback is timed, file reading is excluded
+    mismatches = []
+    start = time.perf_counter()
+    for filename, replay in replays:
+        try:
+            if not play_replay(replay)['matches']:
+                mismatches.append(filename)
+        except Exception as e:
+            errors.append((filename, f"Playback failed: {e}"))
+    elapsed = time.perf_counter() - start
+    return {
+        'replays': len(replays),
+        'mismatches': mismatches,
+        'errors': errors,
+        'elapsed': elapsed,
+        'per_sec': len(replays) / elapsed if elapsed > 0 else 0.0
+    }
@@ -0,0 +1,331 @@
+import numpy as np
+from game.data.items_data import items
+from game.data.moves_data import moves
+from game.data.pokemon_data import type_effectiveness
+from game.models.trainer import Trainer, Player
+from game.logic.battle import Battle
+from game.logic.ai import make_opponent_ai
+from game.logic.effects import STATUS_NAMES, STATUS_CODES
+from game.logic.simulation import build_party, MAX_TURNS
+from game.logic.batch_battle import (BatchBattle, random_encounters, TYPE_NAMES, TYPE_IDS, MOVE_POWER,
+                                     MOVE_ACCURACY, MOVE_TYPE, EFFECTIVENESS)
+
+# Reinforcement learning environments (Gymnasium-style API, without depending on gymnasium).
+#   env = BattleEnv(party=[("Pyron", 9)], opponents=[Trainer("Rocky", [("Geon", 8)])])
+#   obs, info = env.reset(seed=1)
+#   obs, reward, terminated, truncated, info = env.step(action)
+# The agent plays the player side. Battles run quiet (no event tuples or text), observations are
+# read straight from the Pokemon into fixed-size float32 vectors, and a fainted player Pokemon is
+# replaced by the next alive one automatically (as in simulation.run_headless_battle).
+#
+# Actions (N_ACTIONS discrete):
+#   0..3                 fight with move slot k
+#   4..9                 switch to party member j
+#   10..                 use ITEM_ACTIONS[i] on the active Pokemon (balls target the wild Pokemon)
+# info["action_mask"] flags the legal ones; an illegal action falls back to the first move.
+#
+# Observation (OBS_SIZE float32), see the O_* offsets:
+#   player active: HP fraction, level / 100, type one-hot, status one-hot
+#   player moves:  per slot power / 100, accuracy, effectiveness against the opponent / 2
+#   opponent active: as the player active
+#   player party / opponent party HP fractions (PARTY_SIZE each), bag counts / 10 for ITEM_ACTIONS
+#
+# Reward: +1 win (or catch), -1 loss, 0 on truncation at max_turns, plus optional shaping
+# (hp_shaping * change in opponent HP lost minus player HP lost, as party fractions).
+#
+# VecEnv steps many BattleEnvs per call; BatchVecEnv runs wild battles on the NumPy batch engine
+# (game.logic.batch_battle), fight actions only, for millions of steps per minute.
+
+N_MOVES = 4
+PARTY_SIZE = 6
+ITEM_ACTIONS = [name for name, item in items.items() if item.category in ("heal", "status", "ball")]
+SWITCH_ACTION = N_MOVES
+ITEM_ACTION = N_MOVES + PARTY_SIZE
+N_ACTIONS = ITEM_ACTION + len(ITEM_ACTIONS)
+
+N_TYPES = len(TYPE_NAMES)
+N_STATUSES = len(STATUS_NAMES)
+MON_FEATURES = 2 + N_TYPES + N_STATUSES
+MOVE_FEATURES = 3
+O_PLAYER = 0
+O_MOVES = O_PLAYER + MON_FEATURES
+O_OPPONENT = O_MOVES + N_MOVES * MOVE_FEATURES
+O_PARTY = O_OPPONENT + MON_FEATURES
+O_OPPONENT_PARTY = O_PARTY + PARTY_SIZE
+O_ITEMS = O_OPPONENT_PARTY + PARTY_SIZE
+OBS_SIZE = O_ITEMS + len(ITEM_ACTIONS)
+
+def _write_mon(out, offset, mon):
+    out[offset] = max(0, mon.current_hp) / mon.max_hp if mon.max_hp > 0 else 0.0
+    out[offset + 1] = mon.level / 100
+    out[offset + 2 + TYPE_IDS[mon.type]] = 1.0
+    out[offset + 2 + N_TYPES + STATUS_CODES[mon.status]] = 1.0
+
+def _write_party(out, offset, party):
+    for j, mon in enumerate(party[:PARTY_SIZE]):
+        out[offset + j] = max(0, mon.current_hp) / mon.max_hp if mon.max_hp > 0 else 0.0
+
+class BattleEnv:
+    """
+    One battle at a time against opponents drawn from a list.
+
+    party: list of (species, level) and/or Pokemon (copied at every reset).
+    opponents: list of teams (Trainer or list of (species, level)); each reset picks one at random.
+    is_wild: the opponent is the first Pokemon of the team, met as a wild Pokemon.
+    opponent_policy: name in game.logic.ai (None = random moves, or the Trainer's own ai).
+    inventory: bag at the start of every episode, e.g. {"Potion": 2}.
+    """
+    def __init__(self, party, opponents, is_wild=False, opponent_policy=None, inventory=None, max_turns=MAX_TURNS,
+                 hp_shaping=0.0, seed=None):
+        self.party = party
+        self.opponents = opponents
+        self.is_wild = is_wild
+        self.opponent_policy = opponent_policy
+        self.inventory = dict(inventory or {})
+        self.max_turns = max_turns
+        self.hp_shaping = hp_shaping
+        self.rng = np.random.default_rng(seed)
+        self.battle = None
+
+    def reset(self, seed=None, options=None):
+        """Returns (obs, info)."""
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        team = self.opponents[self.rng.integers(len(self.opponents))]
+        player = Player("Agent", build_party(self.party))
+        player.inventory = dict(self.inventory)
+        if self.is_wild:
+            opponent = build_party(team)[0]
+        else:
+            opponent = Trainer(team.name if isinstance(team, Trainer) else "Opponent", build_party(team))
+            if isinstance(team, Trainer):
+                opponent.ai = team.ai
+        opponent_ai = make_opponent_ai(self.opponent_policy) if self.opponent_policy else None
+        self.battle = Battle(player, opponent, is_wild=self.is_wild, link_battle=True, opponent_ai=opponent_ai,
+                             seed=int(self.rng.integers(2 ** 63)), quiet=True)
+        self._hp_balance = self._hp_lost()
+        return self.observe(), {"action_mask": self.action_mask()}
+
+    def _hp_lost(self):
+        # Opponent party HP lost minus player party HP lost (fractions), for reward shaping
+        b = self.battle
+        return _lost(b._opponent_party()) - _lost(b.player.pokemon)
+
+    def observe(self, out=None):
+        """Observation of the current state (written into out if given)."""
+        if out is None:
+            out = np.zeros(OBS_SIZE, dtype=np.float32)
+        else:
+            out.fill(0.0)
+        b = self.battle
+        mon, opp = b.active_player_mon, b.active_opponent_mon
+        _write_mon(out, O_PLAYER, mon)
+        for k, name in enumerate(mon.moves[:N_MOVES]):
+            move = moves[name]
+            o = O_MOVES + k * MOVE_FEATURES
+            out[o] = move.power / 100
+            out[o + 1] = move.accuracy
+            out[o + 2] = type_effectiveness.get((move.type, opp.type), 1.0) / 2
+        _write_mon(out, O_OPPONENT, opp)
+        _write_party(out, O_PARTY, b.player.pokemon)
+        _write_party(out, O_OPPONENT_PARTY, b._opponent_party())
+        inventory = b.player.inventory
+        for i, name in enumerate(ITEM_ACTIONS):
+            out[O_ITEMS + i] = min(inventory.get(name, 0), 10) / 10
+        return out
+
+    def action_mask(self, out=None):
+        """Bool array (N_ACTIONS,) of the legal actions."""
+        if out is None:
+            out = np.zeros(N_ACTIONS, dtype=bool)
+        else:
+            out.fill(False)
+        b = self.battle
+        mon = b.active_player_mon
+        out[:min(len(mon.moves), N_MOVES)] = True
+        for j, member in enumerate(b.player.pokemon[:PARTY_SIZE]):
+            out[SWITCH_ACTION + j] = member.current_hp > 0 and member is not mon
+        inventory = b.player.inventory
+        for i, name in enumerate(ITEM_ACTIONS):
+            if inventory.get(name, 0) <= 0:
+                continue
+            item = items[name]
+            if item.category == "heal":
+                out[ITEM_ACTION + i] = mon.current_hp < mon.max_hp
+            elif item.category == "status":
+                out[ITEM_ACTION + i] = mon.status is not None and mon.status == item.cure_status
+            else:
+                out[ITEM_ACTION + i] = b.is_wild
+        return out
+
+    def _action(self, action, mask):
+        b = self.battle
+        if not mask[action]:
+            action = 0 # First move is always legal
+        if action < N_MOVES:
+            return ("fight", b.active_player_mon.moves[action])
+        if action < ITEM_ACTION:
+            return ("switch", b.player.pokemon[action - SWITCH_ACTION])
+        return ("item", ITEM_ACTIONS[action - ITEM_ACTION], b.active_player_mon)
+
+    def _step(self, action):
+        """Plays one turn. Returns (reward, terminated, truncated, legal)."""
+        b = self.battle
+        mask = self.action_mask()
+        legal = bool(mask[action])
+        b.execute_turn(self._action(action, mask))
+        if not b.finished and b.active_player_mon.current_hp <= 0:
+            b.send_out(b._get_first_alive(b.player.pokemon))
+
+        reward = 0.0
+        if self.hp_shaping:
+            balance = self._hp_lost()
+            reward += self.hp_shaping * (balance - self._hp_balance)
+            self._hp_balance = balance
+        if b.finished:
+            return reward + (1.0 if b.won else -1.0), True, False, legal
+        return reward, False, b.turn >= self.max_turns, legal
+
+    def step(self, action):
+        """Returns (obs, reward, terminated, truncated, info)."""
+        reward, terminated, truncated, legal = self._step(int(action))
+        info = {"action_mask": self.action_mask(), "won": self.battle.won, "legal_action": legal}
+        return self.observe(), reward, terminated, truncated, info
+
+def _lost(party):
+    max_total = sum(mon.max_hp for mon in party)
+    if max_total <= 0:
+        return 0.0
+    return 1.0 - sum(max(0, mon.current_hp) for mon in party) / max_total
+
+class VecEnv:
+    """
+    Steps a list of BattleEnvs together, with automatic reset: when an episode ends, the returned
+    observation is already the first one of the next episode and info["final_obs"] holds the last.
+    Returned arrays are reused by the next call (copy them to keep them).
+    """
+    def __init__(self, envs, seed=None):
+        self.envs = envs
+        self.n = len(envs)
+        self.seed = seed
+        self.obs = np.zeros((self.n, OBS_SIZE), dtype=np.float32)
+        self.final_obs = np.zeros((self.n, OBS_SIZE), dtype=np.float32)
+        self.masks = np.zeros((self.n, N_ACTIONS), dtype=bool)
+        self.rewards = np.zeros(self.n, dtype=np.float32)
+        self.terminated = np.zeros(self.n, dtype=bool)
+        self.truncated = np.zeros(self.n, dtype=bool)
+        self.won = np.zeros(self.n, dtype=bool)
+
+    def reset(self, seed=None):
+        """Returns (obs (N, OBS_SIZE), info)."""
+        seed = self.seed if seed is None else seed
+        seeds = np.random.SeedSequence(seed).spawn(self.n)
+        for i, env in enumerate(self.envs):
+            env.rng = np.random.default_rng(seeds[i])
+            env.reset()
+            env.observe(self.obs[i])
+            env.action_mask(self.masks[i])
+        return self.obs, {"action_mask": self.masks}
+
+    def step(self, actions):
+        """
+        actions: int array (N,).
+        Returns (obs, rewards, terminated, truncated, info) with info arrays
+        {'action_mask': (N, N_ACTIONS), 'final_obs': (N, OBS_SIZE) (rows of finished episodes), 'won': (N,)}
+        """
+        for i, env in enumerate(self.envs):
+            reward, terminated, truncated, _ = env._step(int(actions[i]))
+            self.rewards[i] = reward
+            self.terminated[i] = terminated
+            self.truncated[i] = truncated
+            self.won[i] = env.battle.won
+            if terminated or truncated:
+                env.observe(self.final_obs[i])
+                env.reset()
+            env.observe(self.obs[i])
+            env.action_mask(self.masks[i])
+        return self.obs, self.rewards, self.terminated, self.truncated, {
+            "action_mask": self.masks, "final_obs": self.final_obs, "won": self.won}
+
+class BatchVecEnv:
+    """
+    n wild battles on the batch engine: the party against wild Pokemon drawn uniformly from
+    species_names and [min_level, max_level] (like a route). Only fight actions are legal (the batch
+    engine has no items or voluntary switches); the observation layout is the same as BattleEnv's,
+    so a policy trained here runs in BattleEnv too. Same auto-reset and info as VecEnv.
+    """
+    def __init__(self, party, species_names, min_level, max_level, n_envs, max_turns=MAX_TURNS, seed=None):
+        self.party = party
+        self.species_names = list(species_names)
+        self.min_level = min_level
+        self.max_level = max_level
+        self.n = n_envs
+        self.max_turns = max_turns
+        self.seed = seed
+        self.rows = np.arange(n_envs)
+        self.obs = np.zeros((n_envs, OBS_SIZE), dtype=np.float32)
+        self.final_obs = np.zeros((n_envs, OBS_SIZE), dtype=np.float32)
+        self.masks = np.zeros((n_envs, N_ACTIONS), dtype=bool)
+        self.battle = None
+
+    def _encounters(self, n):
+        return random_encounters(self.species_names, self.min_level, self.max_level, n,
+                                 seed=int(self.rng.integers(2 ** 63)))
+
+    def reset(self, seed=None):
+        """Returns (obs (N, OBS_SIZE), info)."""
+        self.rng = np.random.default_rng(self.seed if seed is None else seed)
+        self.battle = BatchBattle(self.party, self._encounters(self.n), player_policy="random",
+                                  seed=int(self.rng.integers(2 ** 63)))
+        self.observe(self.obs)
+        self._mask(self.masks)
+        return self.obs, {"action_mask": self.masks}
+
+    def observe(self, out):
+        b = self.battle
+        pl, wd = b.player, b.wild
+        rows, act = self.rows, b.active
+        zero = np.zeros(self.n, dtype=np.int64)
+        out.fill(0.0)
+        for offset, side, col in ((O_PLAYER, pl, act), (O_OPPONENT, wd, zero)):
+            max_hp = side.max_hp[rows, col]
+            out[:, offset] = np.maximum(side.hp[rows, col], 0) / np.maximum(max_hp, 1)
+            out[:, offset + 1] = side.level[rows, col] / 100
+            out[rows, offset + 2 + side.type[rows, col]] = 1.0
+            out[rows, offset + 2 + N_TYPES + side.status[rows, col]] = 1.0
+
+        mv = pl.moves[rows, act] # (N, 4)
+        learned = np.arange(N_MOVES)[None, :] < pl.n_moves[rows, act][:, None]
+        feats = np.stack([MOVE_POWER[mv] / 100, MOVE_ACCURACY[mv],
+                          EFFECTIVENESS[MOVE_TYPE[mv], wd.type[:, 0, None]] / 2], axis=2)
+        out[:, O_MOVES:O_MOVES + N_MOVES * MOVE_FEATURES] = (feats * learned[:, :, None]).reshape(self.n, -1)
+
+        p = min(pl.hp.shape[1], PARTY_SIZE)
+        out[:, O_PARTY:O_PARTY + p] = np.maximum(pl.hp[:, :p], 0) / np.maximum(pl.max_hp[:, :p], 1)
+        out[:, O_OPPONENT_PARTY] = np.maximum(wd.hp[:, 0], 0) / np.maximum(wd.max_hp[:, 0], 1)
+        return out
+
+    def _mask(self, out):
+        b = self.battle
+        out.fill(False)
+        out[:, :N_MOVES] = np.arange(N_MOVES)[None, :] < b.player.n_moves[self.rows, b.active][:, None]
+        return out
+
+    def step(self, actions):
+        """See VecEnv.step. Actions other than fight fall back to the first move."""
+        b = self.battle
+        actions = np.asarray(actions, dtype=np.int64)
+        b.step(player_slots=np.where(actions < N_MOVES, actions, 0))
+
+        rewards = np.where(b.finished, np.where(b.won, 1.0, -1.0), 0.0).astype(np.float32)
+        terminated = b.finished.copy()
+        truncated = ~terminated & (b.turns >= self.max_turns)
+        won = b.won.copy()
+        done = np.nonzero(terminated | truncated)[0]
+        if len(done):
+            self.observe(self.final_obs)
+            b.reset_battles(done, self._encounters(len(done)))
+        self.observe(self.obs)
+        self._mask(self.masks)
+        return self.obs, rewards, terminated, truncated, {
+            "action_mask": self.masks, "final_obs": self.final_obs, "won": won}
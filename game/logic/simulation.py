@@ -0,0 +1,178 @@
+import copy
+import os
+from concurrent.futures import ProcessPoolExecutor
+from game.models.pokemon import Pokemon
+from game.models.trainer import Trainer, Player
+from game.logic.battle import Battle
+from game.logic.ai import PLAYER_POLICIES, make_opponent_ai
+from game.logic.rng import new_seed, spawn_seeds
+
+# Safety net for battles that can't finish (e.g. both sides stuck on 1-damage moves)
+MAX_TURNS = 200
+HISTOGRAM_BINS = 10
+
+def build_party(team):
+    """
+    Builds a fresh list of Pokemon from a team spec.
+    team: Trainer, or list of (species, level) tuples and/or Pokemon objects (copied, never mutated).
+    """
+    if isinstance(team, Trainer):
+        team = team.pokemon
+    party = []
+    for p in team:
+        if isinstance(p, Pokemon):
+            party.append(copy.deepcopy(p))
+        else:
+            species, lvl = p
+            party.append(Pokemon(species, level=lvl))
+    return party
+
+def run_headless_battle(battle, player_policy, max_turns=MAX_TURNS):
+    """
+    Drives a Battle to completion without any UI.
+    Fainted player Pokemon are replaced by the next alive one (no free hit), like a forced switch;
+    with none left the battle ends as a loss.
+    Returns the number of turns played.
+    """
+    turns = 0
+    while not battle.finished and turns < max_turns:
+        active = battle.active_player_mon
+        if active is None or active.current_hp <= 0:
+            replacement = battle._get_first_alive(battle.player.pokemon)
+            if replacement is None:
+                battle.finished = True
+                battle.won = False
+                break
+            battle.send_out(replacement)
+        battle.execute_turn(player_policy(battle))
+        turns += 1
+    return turns
+
+def _hp_fraction(party):
+    max_total = sum(mon.max_hp for mon in party)
+    if max_total <= 0:
+        return 0.0
+    return sum(max(0, mon.current_hp) for mon in party) / max_total
+
+def _can_battle(party):
+    return any(mon.current_hp > 0 for mon in party)
+
+def _run_chunk(job):
+    """
+    Worker entry point. Runs one battle per seed and returns a list of (winner, turns, hp_a, hp_b).
+    Every battle gets its own stream from its seed, so no state is shared between workers.
+    """
+    team_a, team_b, seeds, policy_a, policy_b, link_battle, max_turns = job
+    player_policy = PLAYER_POLICIES[policy_a]
+    opponent_policy = make_opponent_ai(policy_b)
+    name_b = team_b.name if isinstance(team_b, Trainer) else "Team B"
+
+    results = []
+    for battle_seed in seeds:
+        player = Player("Team A", build_party(team_a))
+        opponent = Trainer(name_b, build_party(team_b))
+        # Battle sends out the first alive Pokemon of each side (the opponent's before any healing):
+        # a team that can't field anyone loses on the spot
+        can_a = _can_battle(player.pokemon)
+        can_b = _can_battle(opponent.pokemon)
+        if not (can_a and can_b):
+            winner = "a" if can_a else "b" if can_b else None
+            results.append((winner, 0, _hp_fraction(player.pokemon), _hp_fraction(opponent.pokemon)))
+            continue
+        battle = Battle(player, opponent, is_wild=False, link_battle=link_battle, opponent_ai=opponent_policy, seed=battle_seed,
+                        quiet=True)
+        turns = run_headless_battle(battle, player_policy, max_turns)
+
+        if not battle.finished:
+            winner = None # Draw (turn limit)
+        elif battle.won:
+            winner = "a"
+        else:
+            winner = "b"
+        results.append((winner, turns, _hp_fraction(player.pokemon), _hp_fraction(opponent.pokemon)))
+    return results
+
+def _histogram(values, bins=HISTOGRAM_BINS):
+    """Counts of values in [0, 1] split into equal-width bins (1.0 goes into the last bin)."""
+    counts = [0] * bins
+    for v in values:
+        idx = min(int(v * bins), bins - 1)
+        counts[idx] += 1
+    return counts
+
+def simulate_matchup(team_a, team_b, n_battles=1000, workers=None, policy_a="greedy", policy_b="greedy",
+                     link_battle=True, seed=None, max_turns=MAX_TURNS):
+    """
+    Plays n_battles headless trainer battles of team_a (player side) against team_b (opponent side)
+    spread over a process pool.
+
+    team_a / team_b: Trainer, or list of (species, level) tuples and/or Pokemon objects.
+    workers: number of processes (None = all cores, 1 = run in this process).
+    policy_a / policy_b: names from game.logic.ai PLAYER_POLICIES / make_opponent_ai().
+    link_battle: True disables XP gain so both sides keep their levels during the fight.
+    seed: makes the whole run reproducible regardless of worker count (None = fresh seed).
+
+    Returns a dictionary:
+    {
+        'battles': int,
+        'wins_a': int, 'wins_b': int, 'draws': int,
+        'win_rate_a': float, 'win_rate_b': float,
+        'mean_turns': float,
+        'hp_remaining_a': list[float], # fraction of team HP left, per battle
+        'hp_remaining_b': list[float],
+        'hp_histogram_a': list[int],   # HISTOGRAM_BINS buckets over [0, 1]
+        'hp_histogram_b': list[int]
+    }
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, n_battles)) if n_battles > 0 else 1
+
+    # Several chunks per worker keeps the pool busy when battles have uneven lengths
+    n_chunks = min(n_battles, workers * 4) if workers > 1 else 1
+    if seed is None:
+        seed = new_seed()
+    # Per-battle seeds are spawned up front so results don't depend on how battles are chunked
+    battle_seeds = spawn_seeds(seed, n_battles)
+    jobs = []
+    for i in range(n_chunks):
+        jobs.append((team_a, team_b, battle_seeds[i::n_chunks], policy_a, policy_b, link_battle, max_turns))
+
+    results = []
+    if workers == 1:
+        for job in jobs:
+            results.extend(_run_chunk(job))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for chunk in pool.map(_run_chunk, jobs):
+                results.extend(chunk)
+
+    wins_a = sum(1 for r in results if r[0] == "a")
+    wins_b = sum(1 for r in results if r[0] == "b")
+    total = len(results)
+    hp_a = [r[2] for r in results]
+    hp_b = [r[3] for r in results]
+    return {
+        'battles': total,
+        'wins_a': wins_a,
+        'wins_b': wins_b,
+        'draws': total - wins_a - wins_b,
+        'win_rate_a': wins_a / total if total else 0.0,
+        'win_rate_b': wins_b / total if total else 0.0,
+        'mean_turns': sum(r[1] for r in results) / total if total else 0.0,
+        'hp_remaining_a': hp_a,
+        'hp_remaining_b': hp_b,
+        'hp_histogram_a': _histogram(hp_a),
+        'hp_histogram_b': _histogram(hp_b)
+    }
+
+if __name__ == "__main__":
+    # Example: does Pyron lv11 beat Gym Leader Rocky?
+    import time
+    start = time.perf_counter()
+    res = simulate_matchup([("Pyron", 11)], Trainer("Gym Leader Rocky", [("Geon", 8), ("Geodon", 12)]), n_battles=2000)
+    elapsed = time.perf_counter() - start
+    print(f"Pyron lv11 vs Gym Leader Rocky: {res['win_rate_a']:.1%} wins over {res['battles']} battles")
+    print(f"Mean turns: {res['mean_turns']:.2f}")
+    print(f"HP remaining (A): {res['hp_histogram_a']}")
+    print(f"Elapsed: {elapsed:.2f}s")
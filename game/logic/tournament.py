@@ -0,0 +1,231 @@
+import glob
+import hashlib
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from game.state import GameState
+from game.models.trainer import Trainer
+from game.logic.simulation import _run_chunk, MAX_TURNS
+from game.logic.rng import spawn_seeds
+
+# Headless round-robin ladder between saved profiles.
+# Every profile plays every other one n_battles times from each side (player side / opponent side),
+# as link battles with their current parties, and the ladder is rated on the Elo scale.
+# Match results are cached on disk keyed by a content hash of both parties (plus the match settings),
+# so re-running after one profile changed only re-simulates the matches involving it.
+#   python -m game.logic.tournament --battles 500
+
+TOURNAMENT_CACHE = ".tournament_cache.json"
+CACHE_VERSION = 1 # bump when the battle engine changes in a way that invalidates old results
+BASE_RATING = 1500
+ELO_SCALE = 400
+ELO_ITERATIONS = 500
+
+def _mon_spec(mon):
+    return [mon.species, mon.level, mon.current_hp, mon.status, list(mon.moves)]
+
+def party_hash(party):
+    """sha256 of everything in a party that affects a battle (species, level, HP, status, moves)."""
+    payload = json.dumps([_mon_spec(mon) for mon in party], separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def load_profiles(directory=".", pattern="*.json"):
+    """
+    Loads every save profile in directory.
+    Files that are not save games, and profiles without a Pokemon able to battle, are skipped.
+    Returns (profiles, skipped): profiles maps profile name (file name without .json) -> Player,
+    skipped is a list of (file name, reason).
+    """
+    profiles = {}
+    skipped = []
+    for path in sorted(glob.glob(os.path.join(directory, pattern))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        player, msg = GameState.load_game(path)
+        if player is None:
+            skipped.append((os.path.basename(path), msg))
+        elif not any(mon.current_hp > 0 for mon in player.pokemon):
+            skipped.append((os.path.basename(path), "No Pokemon able to battle."))
+        else:
+            profiles[name] = player
+    return profiles, skipped
+
+def _load_cache(path):
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {} # Unreadable cache: simulate everything again
+
+def _save_cache(path, cache):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(cache, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+def match_key(hash_a, hash_b, n_battles, policy, max_turns):
+    """Cache key of one ordered match (a on the player side)."""
+    raw = f"{CACHE_VERSION}|{hash_a}|{hash_b}|{n_battles}|{policy}|{max_turns}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+def elo_ratings(names, records, base=BASE_RATING):
+    """
+    Order-independent Elo ratings: Bradley-Terry strengths fitted to the aggregate scores
+    (MM algorithm), expressed on the Elo scale so a 400 point gap means 10:1 odds.
+    records: dict (name_a, name_b) -> (wins_a, wins_b, draws); draws count half for each side.
+    Every pair that played also gets one virtual draw, so unbeaten players get a finite rating.
+    Returns dict name -> rating.
+    """
+    games = {n: {} for n in names}
+    score = dict.fromkeys(names, 0.0)
+    for (a, b), (wins_a, wins_b, draws) in records.items():
+        n = wins_a + wins_b + draws + 1
+        games[a][b] = games[a].get(b, 0) + n
+        games[b][a] = games[b].get(a, 0) + n
+        score[a] += wins_a + 0.5 * draws + 0.5
+        score[b] += wins_b + 0.5 * draws + 0.5
+
+    strength = dict.fromkeys(names, 1.0)
+    for _ in range(ELO_ITERATIONS):
+        new = {}
+        for i in names:
+            denom = sum(n / (strength[i] + strength[j]) for j, n in games[i].items())
+            new[i] = score[i] / denom if denom > 0 else strength[i]
+        # Normalize to geometric mean 1 (average player sits at the base rating)
+        log_mean = sum(math.log(s) for s in new.values()) / len(new)
+        strength = {i: s / math.exp(log_mean) for i, s in new.items()}
+    return {i: base + ELO_SCALE * math.log10(s) for i, s in strength.items()}
+
+def run_tournament(directory=".", n_battles=200, workers=None, policy="greedy", cache_path=TOURNAMENT_CACHE,
+                   max_turns=MAX_TURNS):
+    """
+    Plays the round robin between all profiles in directory.
+    n_battles: battles per ordered pair (each pair plays 2 * n_battles in total).
+    policy: name in game.logic.ai PLAYER_POLICIES / OPPONENT_POLICIES, used by both sides.
+    cache_path: JSON cache file (None disables caching). Relative paths are inside directory.
+
+    Returns a dictionary:
+    {
+        'ladder': list of {'name', 'rating', 'wins', 'losses', 'draws', 'score'} sorted by rating,
+        'matches': { (name_a, name_b): {'wins_a', 'wins_b', 'draws', 'battles', 'mean_turns'} },
+        'skipped': list of (file name, reason),
+        'simulated': int, 'cached': int   # ordered matches simulated now / read from the cache
+    }
+    """
+    profiles, skipped = load_profiles(directory)
+    names = list(profiles)
+    hashes = {name: party_hash(p.pokemon) for name, p in profiles.items()}
+    if cache_path and not os.path.isabs(cache_path):
+        cache_path = os.path.join(directory, cache_path)
+    cache = _load_cache(cache_path)
+
+    # Split every uncached ordered match into chunks for one shared pool
+    if workers is None:
+        workers = os.cpu_count() or 1
+    pending = {}
+    jobs = []
+    job_owner = []
+    for a in names:
+        for b in names:
+            if a == b:
+                continue
+            key = match_key(hashes[a], hashes[b], n_battles, policy, max_turns)
+            if key in cache:
+                continue
+            pending[(a, b)] = key
+            # Seeds follow from the key, so a cached result is exactly what a re-run would give
+            seeds = spawn_seeds(int(key[:16], 16), n_battles)
+            n_chunks = max(1, min(n_battles, workers))
+            for i in range(n_chunks):
+                jobs.append((profiles[a].pokemon, Trainer(b, profiles[b].pokemon),
+                             seeds[i::n_chunks], policy, policy, True, max_turns))
+                job_owner.append((a, b))
+
+    results = {pair: [] for pair in pending}
+    if workers == 1 or len(jobs) <= 1:
+        for owner, job in zip(job_owner, jobs):
+            results[owner].extend(_run_chunk(job))
+    elif jobs:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for owner, chunk in zip(job_owner, pool.map(_run_chunk, jobs)):
+                results[owner].extend(chunk)
+
+    for pair, key in pending.items():
+        res = results[pair]
+        cache[key] = {
+            'wins_a': sum(1 for r in res if r[0] == "a"),
+            'wins_b': sum(1 for r in res if r[0] == "b"),
+            'draws': sum(1 for r in res if r[0] is None),
+            'battles': len(res),
+            'mean_turns': sum(r[1] for r in res) / len(res) if res else 0.0
+        }
+    if cache_path and pending:
+        _save_cache(cache_path, cache)
+
+    matches = {}
+    records = {}
+    for a in names:
+        for b in names:
+            if a == b:
+                continue
+            m = cache[match_key(hashes[a], hashes[b], n_battles, policy, max_turns)]
+            matches[(a, b)] = m
+            records[(a, b)] = (m['wins_a'], m['wins_b'], m['draws'])
+
+    ratings = elo_ratings(names, records) if names else {}
+    ladder = []
+    for name in names:
+        wins = losses = draws = 0
+        for (a, b), (wa, wb, d) in records.items():
+            if a == name:
+                wins += wa; losses += wb; draws += d
+            elif b == name:
+                wins += wb; losses += wa; draws += d
+        played = wins + losses + draws
+        ladder.append({
+            'name': name,
+            'rating': ratings[name],
+            'wins': wins,
+            'losses': losses,
+            'draws': draws,
+            'score': (wins + 0.5 * draws) / played if played else 0.0
+        })
+    ladder.sort(key=lambda row: row['rating'], reverse=True)
+
+    return {
+        'ladder': ladder,
+        'matches': matches,
+        'skipped': skipped,
+        'simulated': len(pending),
+        'cached': len(names) * (len(names) - 1) - len(pending)
+    }
+
+def format_ladder(result):
+    """Elo table as text."""
+    lines = [f"{'#':>2} {'Profile':<16} {'Elo':>6} {'W':>6} {'L':>6} {'D':>5} {'Score':>7}"]
+    for rank, row in enumerate(result['ladder'], start=1):
+        lines.append(f"{rank:>2} {row['name']:<16} {row['rating']:>6.0f} {row['wins']:>6} {row['losses']:>6} "
+                     f"{row['draws']:>5} {row['score']:>6.1%}")
+    for filename, reason in result['skipped']:
+        lines.append(f"Skipped {filename}: {reason}")
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    import argparse
+    import time
+    parser = argparse.ArgumentParser(description="Round-robin Elo ladder between saved profiles")
+    parser.add_argument("--dir", default=".", help="directory with the *.json save profiles")
+    parser.add_argument("--battles", type=int, default=200, help="battles per ordered pair")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--policy", default="greedy", choices=["greedy", "random"])
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    result = run_tournament(args.dir, args.battles, args.workers, args.policy,
+                            cache_path=None if args.no_cache else TOURNAMENT_CACHE)
+    print(format_ladder(result))
+    print(f"{result['simulated']} matches simulated, {result['cached']} from cache "
+          f"in {time.perf_counter() - start:.2f}s")
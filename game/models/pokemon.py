@@ -1,6 +1,93 @@
 from game.data.pokemon_data import species_data
+from game.data.moves_data import moves
+
+# Integer IDs for species and moves (in data order), for array code and compact serialization
+SPECIES_NAMES = list(species_data)
+SPECIES_IDS = {name: i for i, name in enumerate(SPECIES_NAMES)}
+MOVE_NAMES = list(moves)
+MOVE_IDS = {name: i for i, name in enumerate(MOVE_NAMES)}
+# Name -> the one shared str object of that move, so thousands of loaded Pokemon don't each
+# hold their own copy of "Quick Attack"
+_CANONICAL_MOVES = {name: name for name in MOVE_NAMES}
+
+# Stats follow base + (level - 1) * growth; STAT_TABLE[species_id][level] holds
+# (max_hp, attack, defense, speed) for levels 0..MAX_LEVEL, so building and leveling Pokemon is a lookup
+MAX_LEVEL = 100
+
+def _compute_stats(data, level):
+    base = data["base_stats"]; growth = data["growth"]
+    return (base["hp"] + (level - 1) * growth["hp"],
+            base["atk"] + (level - 1) * growth["atk"],
+            base["def"] + (level - 1) * growth["def"],
+            base["spd"] + (level - 1) * growth["spd"])
+
+STAT_TABLE = [[_compute_stats(species_data[name], level) for level in range(MAX_LEVEL + 1)] for name in SPECIES_NAMES]
+_STAT_ROWS = dict(zip(SPECIES_NAMES, STAT_TABLE))
+
+def stats_at(species, level):
+    """(max_hp, attack, defense, speed) of a species at a level (computed past MAX_LEVEL)."""
+    if 0 <= level <= MAX_LEVEL:
+        return _STAT_ROWS[species][level]
+    return _compute_stats(species_data[species], level)
+
+# Learnsets: LEARNSET_TABLE[species_id][level] is the move list a Pokemon built at that level knows
+# (every move up to the level, learned in order, oldest forgotten past 4), and
+# LEVEL_MOVES[species_id][level] the moves learned on reaching exactly that level
+MAX_MOVES = 4
+
+def _learnset_rows(learnset):
+    known = []
+    for lv in sorted(learnset):
+        if lv <= 0:
+            known = _learn_all(known, learnset[lv])
+    moves_at = [known[:]]
+    new_at = [()]
+    for level in range(1, MAX_LEVEL + 1):
+        new = tuple(_CANONICAL_MOVES.get(name, name) for name in learnset.get(level, ()))
+        known = _learn_all(known, new)
+        moves_at.append(known[:])
+        new_at.append(new)
+    return moves_at, new_at
+
+def _learn_all(known, move_names):
+    # Pokemon.learn_move, silently
+    for move_name in move_names:
+        move_name = _CANONICAL_MOVES.get(move_name, move_name)
+        if move_name in known:
+            continue
+        if len(known) >= MAX_MOVES:
+            known.pop(0)
+        known.append(move_name)
+    return known
+
+_LEARNSETS = [_learnset_rows(species_data[name]["moves"]) for name in SPECIES_NAMES]
+LEARNSET_TABLE = [rows[0] for rows in _LEARNSETS]
+LEVEL_MOVES = [rows[1] for rows in _LEARNSETS]
+_LEARNSET_ROWS = dict(zip(SPECIES_NAMES, LEARNSET_TABLE))
+_LEVEL_MOVE_ROWS = dict(zip(SPECIES_NAMES, LEVEL_MOVES))
+
+def moves_at(species, level):
+    """New list of the moves a species knows when built at a level."""
+    if 0 <= level <= MAX_LEVEL:
+        return _LEARNSET_ROWS[species][level][:]
+    learnset = species_data[species]["moves"]
+    return _learn_all([], [m for lv in sorted(learnset) if lv <= level for m in learnset[lv]])
+
+def level_moves(species, level):
+    """Moves a species learns on reaching a level (empty tuple for most levels)."""
+    if 0 <= level <= MAX_LEVEL:
+        return _LEVEL_MOVE_ROWS[species][level]
+    return tuple(move_list(species_data[species]["moves"].get(level, ())))
+
+def move_list(names):
+    """A moves list for Pokemon.moves, reusing the shared move name strings."""
+    return [_CANONICAL_MOVES.get(name, name) for name in names]
 
 class Pokemon:
+    # No per-instance __dict__: storage boxes and simulators keep many thousands of these
+    __slots__ = ("species", "level", "type", "max_hp", "attack", "defense", "speed",
+                 "current_hp", "status", "moves", "exp", "exp_to_next")
+
     def __init__(self, species_name, level=1):
         self.species = species_name
         self.level = level
@@ -10,22 +97,21 @@ class Pokemon:
              
         data = species_data[species_name]
         self.type = data["type"]
-        # Calculate stats based on base and growth
-        base = data["base_stats"]; growth = data["growth"]
-        self.max_hp = base["hp"] + (level - 1) * growth["hp"]
-        self.attack = base["atk"] + (level - 1) * growth["atk"]
-        self.defense = base["def"] + (level - 1) * growth["def"]
-        self.speed = base["spd"] + (level - 1) * growth["spd"]
+        self.max_hp, self.attack, self.defense, self.speed = stats_at(species_name, level)
         self.current_hp = self.max_hp
         self.status = None # status condition
-        self.moves = []
+        # Every move up to the current level, as if learned one by one
+        self.moves = moves_at(species_name, level)
         self.exp = 0
         self.exp_to_next = 50 + self.level * 10
-        # Learn moves up to current level
-        for lv in sorted(species_data[species_name]["moves"].keys()):
-            if lv <= self.level:
-                for move_name in species_data[species_name]["moves"][lv]:
-                    self.learn_move(move_name, silent=True)
+
+    @property
+    def species_id(self):
+        return SPECIES_IDS[self.species]
+
+    @property
+    def move_ids(self):
+        return [MOVE_IDS[name] for name in self.moves]
 
     def learn_move(self, move_name, silent=False):
         """Returns a list of message strings describing what happened."""
@@ -51,11 +137,7 @@ class Pokemon:
         old_max_hp = self.max_hp
         self.species = new_species
         self.type = species_data[new_species]["type"]
-        base = species_data[new_species]["base_stats"]; growth = species_data[new_species]["growth"]
-        self.max_hp = base["hp"] + (self.level - 1) * growth["hp"]
-        self.attack = base["atk"] + (self.level - 1) * growth["atk"]
-        self.defense = base["def"] + (self.level - 1) * growth["def"]
-        self.speed = base["spd"] + (self.level - 1) * growth["spd"]
+        self.max_hp, self.attack, self.defense, self.speed = stats_at(new_species, self.level)
         if old_max_hp > 0:
             # Adjust current HP proportional to new max HP
             self.current_hp = int(self.current_hp * self.max_hp / old_max_hp)
@@ -85,12 +167,8 @@ class Pokemon:
             self.exp -= self.exp_to_next
             self.level += 1
             leveled_up = True
-            base = species_data[self.species]["base_stats"]; growth = species_data[self.species]["growth"]
             old_max = self.max_hp
-            self.max_hp = base["hp"] + (self.level - 1) * growth["hp"]
-            self.attack = base["atk"] + (self.level - 1) * growth["atk"]
-            self.defense = base["def"] + (self.level - 1) * growth["def"]
-            self.speed = base["spd"] + (self.level - 1) * growth["spd"]
+            self.max_hp, self.attack, self.defense, self.speed = stats_at(self.species, self.level)
             # Increase current HP by the amount max HP increased (to maintain HP ratio)
             self.current_hp += (self.max_hp - old_max)
             if self.current_hp > self.max_hp:
@@ -99,10 +177,9 @@ class Pokemon:
             messages.append(f"{self.species} leveled up to level {self.level}!")
             
             # Learn new moves at this level, if any
-            if self.level in species_data[self.species]["moves"]:
-                for move_name in species_data[self.species]["moves"][self.level]:
-                    msgs = self.learn_move(move_name)
-                    messages.extend(msgs)
+            for move_name in level_moves(self.species, self.level):
+                msgs = self.learn_move(move_name)
+                messages.extend(msgs)
             
             # Check for evolution by level
             if "evolve_level" in species_data[self.species] and species_data[self.species]["evolve_level"] == self.level:
@@ -110,10 +187,9 @@ class Pokemon:
                 msgs = self.evolve(new_species)
                 messages.extend(msgs)
                 # Immediately learn moves of new species at this level, if any
-                if self.level in species_data[self.species]["moves"]:
-                    for move_name in species_data[self.species]["moves"][self.level]:
-                        msgs = self.learn_move(move_name)
-                        messages.extend(msgs)
+                for move_name in level_moves(self.species, self.level):
+                    msgs = self.learn_move(move_name)
+                    messages.extend(msgs)
             
             self.exp_to_next = 50 + self.level * 10
             
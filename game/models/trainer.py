@@ -1,7 +1,7 @@
 from game.models.pokemon import Pokemon
 
 class Trainer:
-    def __init__(self, name, pokemon_list, prize=0, is_gym_leader=False, badge_reward=None):
+    def __init__(self, name, pokemon_list, prize=0, is_gym_leader=False, badge_reward=None, ai=None):
         self.name = name
         self.pokemon = []
         for p in pokemon_list:
@@ -13,6 +13,7 @@ class Trainer:
         self.prize = prize
         self.is_gym_leader = is_gym_leader
         self.badge_reward = badge_reward
+        self.ai = ai # Name of the battle AI (see game.logic.ai), None = random moves
 
 class Player(Trainer):
     def __init__(self, name, pokemon_list):
@@ -0,0 +1,215 @@
+import asyncio
+import random
+import time
+from game.models.pokemon import Pokemon
+from game.logic.ai import greedy_move
+from game.state import GameState
+from game.net import protocol as proto
+from game.net.server import LinkServer, DEFAULT_HOST, DEFAULT_PORT
+from game.net.spectator import SpectatorHub
+
+# Scripted link battle client, the local stand-in for a second player.
+# It plays the lockstep protocol like a real client would: builds the Battle from the "start" message,
+# replays every "turn" locally and checks its checksum against the server's.
+# Policies must not draw from battle.rng (ai.random_player does): that stream is shared with the server,
+# so random choices come from the client's own random.Random.
+# run_load_test starts many clients at once (and a server in this process unless one is given):
+#   python -m game.net.client --battles 300
+
+LINK_PARTY = [("Pyronite", 20), ("Aquaria", 20), ("Florac", 20)]
+SWITCH_CHANCE = 0.1 # random policy, player side
+
+def make_party(party=LINK_PARTY):
+    """(species, level) list -> party states for the hello message."""
+    return [GameState.pokemon_state(Pokemon(species, level=level)) for species, level in party]
+
+class LinkClient:
+    def __init__(self, name, party, policy="greedy", seed=None, corrupt_turn=None):
+        """
+        policy: "greedy" or "random".
+        corrupt_turn: damage our local copy after this turn (tests desync detection).
+        """
+        self.name = name
+        self.party = party
+        self.policy = policy
+        self.rng = random.Random(seed)
+        self.corrupt_turn = corrupt_turn
+        self.role = None
+        self.battle = None
+        self.pending = [None]
+        self.latencies = []
+        self.errors = []
+
+    def choose(self):
+        """Wire action for the next turn."""
+        battle = self.battle
+        if self.role == proto.OPPONENT:
+            mon, foe = battle.active_opponent_mon, battle.active_player_mon
+        else:
+            mon, foe = battle.active_player_mon, battle.active_opponent_mon
+        if self.policy == "random":
+            if self.role == proto.PLAYER and self.rng.random() < SWITCH_CHANCE:
+                bench = [i for i, m in enumerate(battle.player.pokemon) if m.current_hp > 0 and m is not mon]
+                if bench:
+                    return ["switch", self.rng.choice(bench)]
+            return ["fight", self.rng.choice(mon.moves)]
+        return ["fight", greedy_move(mon, foe)]
+
+    async def play(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """
+        Plays one link battle.
+        Returns a dictionary:
+        { 'role': str, 'winner': str or None, 'reason': str, 'turns': int,
+          'desync': bool (our checksum disagreed with the server's), 'latencies': list of seconds }
+        """
+        reader, writer = await asyncio.open_connection(host, port, limit=proto.MAX_LINE)
+        result = {'role': None, 'winner': None, 'reason': "disconnect", 'turns': 0, 'desync': False,
+                  'latencies': self.latencies}
+        try:
+            writer.write(proto.encode({"type": "hello", "name": self.name, "party": self.party}))
+            await writer.drain()
+            sent_at = None
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                message = proto.decode(line)
+                kind = message.get("type")
+                if kind == "start":
+                    self.role = result['role'] = message["role"]
+                    self.battle = proto.build_battle(message["seed"], message["player"], message["opponent"],
+                                                     lambda: self.pending[0])
+                    if proto.state_checksum(self.battle) != message["checksum"]:
+                        result['desync'] = True
+                elif kind == "turn":
+                    if sent_at is not None:
+                        self.latencies.append(time.perf_counter() - sent_at)
+                    player_action = proto.decode_action(self.battle, message["player_action"], proto.PLAYER)
+                    proto.apply_turn(self.battle, player_action, message["opponent_action"][1], self.pending)
+                    if self.battle.turn == self.corrupt_turn:
+                        mon = self.battle.active_player_mon
+                        mon.current_hp = max(0, mon.current_hp - 1)
+                    if proto.state_checksum(self.battle) != message["checksum"]:
+                        result['desync'] = True
+                    result['turns'] = self.battle.turn
+                elif kind == "end":
+                    result['winner'] = message["winner"]
+                    result['reason'] = message["reason"]
+                    break
+                elif kind == "error":
+                    # A scripted client only sends legal actions, so this means we are out of sync
+                    self.errors.append(message["message"])
+                    if self.battle is None:
+                        result['reason'] = "rejected"
+                        break
+                else:
+                    continue
+                if self.battle is not None and not self.battle.finished and kind in ("start", "turn"):
+                    writer.write(proto.encode({"type": "action", "turn": self.battle.turn + 1, "action": self.choose(),
+                                               "checksum": proto.state_checksum(self.battle)}))
+                    await writer.drain()
+                    sent_at = time.perf_counter()
+        finally:
+            writer.close()
+        return result
+
+async def watch(host, port, counts, match=None):
+    """Spectator connection: counts the messages it receives by type until cancelled or disconnected."""
+    reader, writer = await asyncio.open_connection(host, port, limit=proto.MAX_LINE)
+    try:
+        writer.write(proto.encode({"type": "watch", "match": match}))
+        await writer.drain()
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            kind = proto.decode(line).get("type")
+            counts[kind] = counts.get(kind, 0) + 1
+    finally:
+        writer.close()
+
+def _percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+async def run_load_test(n_battles=100, host=None, port=DEFAULT_PORT, policy="greedy", party=LINK_PARTY,
+                        desync_battles=0, spectators=0, seed=None):
+    """
+    Plays n_battles link battles at the same time (2 * n_battles clients).
+    host None starts a LinkServer in this process on a free port.
+    desync_battles: that many clients corrupt their state after turn 1 (their battles should end in "desync").
+    spectators: TCP spectators watching every match (the server needs a SpectatorHub).
+
+    Returns a dictionary:
+    {
+        'battles': int, 'finished': int, 'desyncs': int, 'turns': int, 'seconds': float,
+        'battles_per_s': float, 'turns_per_s': float,
+        'latency_p50_ms': float, 'latency_p99_ms': float,   # action sent -> turn received
+        'spectated': dict,                                  # messages the spectators received, by type
+        'server': dict or None                              # LinkServer.stats of the in-process server
+    }
+    """
+    server = None
+    if host is None:
+        server = LinkServer(DEFAULT_HOST, 0, hub=SpectatorHub() if spectators else None)
+        port = await server.start()
+        host = DEFAULT_HOST
+    rng = random.Random(seed)
+    states = make_party(party)
+    clients = [LinkClient(f"Bot{i}", states, policy, rng.getrandbits(64), corrupt_turn=1 if i < desync_battles else None)
+               for i in range(2 * n_battles)]
+    spectated = {}
+    watchers = [asyncio.create_task(watch(host, port, spectated)) for _ in range(spectators)]
+    await asyncio.sleep(0.1) # let the spectators join before the first match starts
+    start = time.perf_counter()
+    try:
+        results = await asyncio.gather(*(client.play(host, port) for client in clients))
+    finally:
+        for task in watchers:
+            task.cancel()
+        await asyncio.gather(*watchers, return_exceptions=True)
+        if server is not None:
+            await server.close()
+    seconds = time.perf_counter() - start
+
+    players = [r for r in results if r['role'] == proto.PLAYER]
+    latencies = [t for r in results for t in r['latencies']]
+    turns = sum(r['turns'] for r in players)
+    return {
+        'battles': n_battles,
+        'finished': sum(1 for r in players if r['reason'] == "finished"),
+        'desyncs': sum(1 for r in players if r['reason'] == "desync"),
+        'turns': turns,
+        'seconds': seconds,
+        'battles_per_s': len(players) / seconds,
+        'turns_per_s': turns / seconds,
+        'latency_p50_ms': _percentile(latencies, 0.5) * 1000,
+        'latency_p99_ms': _percentile(latencies, 0.99) * 1000,
+        'spectated': spectated,
+        'server': server.stats if server is not None else None
+    }
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Link battle load test with scripted clients")
+    parser.add_argument("--battles", type=int, default=100, help="simultaneous battles")
+    parser.add_argument("--host", default=None, help="server to connect to (default: start one in-process)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--policy", default="greedy", choices=["greedy", "random"])
+    parser.add_argument("--desync", type=int, default=0, help="clients that corrupt their state (detection check)")
+    parser.add_argument("--spectators", type=int, default=0, help="TCP spectators watching every match")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    r = asyncio.run(run_load_test(args.battles, args.host, args.port, args.policy, desync_battles=args.desync,
+                                  spectators=args.spectators, seed=args.seed))
+    print(f"{r['battles']} battles: {r['finished']} finished, {r['desyncs']} desynced, {r['turns']} turns "
+          f"in {r['seconds']:.2f}s")
+    print(f"{r['battles_per_s']:.1f} battles/s, {r['turns_per_s']:.0f} turns/s, "
+          f"latency p50 {r['latency_p50_ms']:.2f} ms, p99 {r['latency_p99_ms']:.2f} ms")
+    if r['spectated']:
+        print(f"spectators received: {r['spectated']}")
+    if r['server']:
+        print(f"server: {r['server']}")
@@ -0,0 +1,140 @@
+import json
+import zlib
+from game.data.moves_data import moves
+from game.data.pokemon_data import species_data
+from game.models.trainer import Trainer, Player
+from game.logic.battle import Battle
+from game.logic.effects import STATUS_CODES
+from game.state import GameState
+
+# Link battle protocol: newline-delimited JSON over TCP.
+# Both clients and the server run the same Battle from the same seed and parties, and only actions
+# travel over the wire (lockstep). Every turn the server sends the state checksum it reached, and the
+# clients send theirs back with their next action, so any divergence is caught on the turn it happens.
+#
+#   client -> server  {"type": "hello", "name": str, "party": [pokemon_state, ...]}
+#   server -> client  {"type": "start", "match": int, "seed": int, "role": "player" | "opponent",
+#                      "player": {"name", "party"}, "opponent": {"name", "party"}, "checksum": int}
+#   client -> server  {"type": "action", "turn": int, "action": [...], "checksum": int}
+#   server -> client  {"type": "turn", "turn": int, "player_action": [...], "opponent_action": [...],
+#                      "checksum": int}
+#   server -> client  {"type": "end", "winner": "player" | "opponent" | None, "reason": str}
+#   server -> client  {"type": "error", "message": str}   (the action was rejected, send another)
+#
+# Spectators send {"type": "watch", "match": int or null} instead of hello (null = every match) and then
+# only receive game.net.spectator messages (snapshot / events / end), with slow readers coalesced.
+#
+# The Battle engine gives the "player" side fight/switch/item and the "opponent" side moves only, so
+# actions are ["fight", move] / ["switch", party_idx] / ["item", item_name, party_idx] for the player
+# and ["fight", move] for the opponent. A fainted player Pokemon is replaced by the next alive one
+# (no action needed), as in simulation.run_headless_battle.
+
+PROTOCOL_VERSION = 1
+MAX_LINE = 64 * 1024
+PARTY_SIZE = 6
+PLAYER = "player"
+OPPONENT = "opponent"
+
+def encode(message):
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode("utf-8")
+
+def decode(line):
+    return json.loads(line.decode("utf-8"))
+
+def state_checksum(battle):
+    """crc32 of everything both sides must agree on after a turn (Battle.snapshot, turn and RNG position)."""
+    payload = repr((battle.turn, battle.snapshot(), battle.rng.getstate()[1][-1]))
+    return zlib.crc32(payload.encode("utf-8"))
+
+def validate_party(party):
+    """Returns an error message for a malformed or impossible party, None if it is fine."""
+    if not isinstance(party, list) or not 1 <= len(party) <= PARTY_SIZE:
+        return f"A party has 1 to {PARTY_SIZE} Pokemon."
+    alive = False
+    for state in party:
+        try:
+            species, level, hp, status, exp, move_names = state
+        except (TypeError, ValueError):
+            return "Malformed Pokemon."
+        if species not in species_data:
+            return f"Unknown species: {species}"
+        if type(level) is not int or not 1 <= level <= 100: # bool is an int subclass: rejected too
+            return "Levels go from 1 to 100."
+        if type(exp) is not int or exp < 0:
+            return f"{species} has impossible EXP."
+        if status not in STATUS_CODES:
+            return f"Unknown status: {status}"
+        if not isinstance(move_names, list) or not 1 <= len(move_names) <= 4 or any(m not in moves for m in move_names):
+            return f"{species} needs 1 to 4 known moves."
+        max_hp = GameState.pokemon_from_state(state).max_hp
+        if type(hp) is not int or not 0 <= hp <= max_hp:
+            return f"{species} has impossible HP."
+        alive = alive or hp > 0
+    if not alive:
+        return "No Pokemon able to battle."
+    return None
+
+def build_battle(seed, player, opponent, opponent_moves, quiet=True):
+    """
+    The lockstep Battle every participant builds from a "start" message.
+    player / opponent: {"name", "party"}; opponent_moves: callable() -> move name for this turn.
+    quiet: skip event recording (events don't affect the state, only spectators need them).
+    """
+    me = Player(player["name"], [GameState.pokemon_from_state(s) for s in player["party"]])
+    rival = Trainer(opponent["name"], [GameState.pokemon_from_state(s) for s in opponent["party"]])
+    return Battle(me, rival, link_battle=True, opponent_ai=lambda battle: opponent_moves(), seed=seed, quiet=quiet)
+
+def decode_action(battle, action, role):
+    """Wire action -> Battle action tuple. Raises ValueError if it isn't legal now."""
+    if not isinstance(action, list) or not action:
+        raise ValueError("Malformed action.")
+    kind = action[0]
+    if kind == "fight" and len(action) == 2:
+        mon = battle.active_player_mon if role == PLAYER else battle.active_opponent_mon
+        if action[1] not in mon.moves:
+            raise ValueError(f"{mon.species} doesn't know {action[1]}.")
+        return ("fight", action[1])
+    if role != PLAYER:
+        raise ValueError("The opponent side can only fight.")
+    party = battle.player.pokemon
+    if kind == "switch" and len(action) == 2:
+        idx = action[1]
+        if not isinstance(idx, int) or not 0 <= idx < len(party):
+            raise ValueError("No such party member.")
+        if party[idx].current_hp <= 0 or party[idx] is battle.active_player_mon:
+            raise ValueError("Cannot switch to that Pokemon!")
+        return ("switch", party[idx])
+    if kind == "item" and len(action) == 3:
+        idx = action[2]
+        if not isinstance(idx, int) or not 0 <= idx < len(party):
+            raise ValueError("No such party member.")
+        return ("item", action[1], party[idx])
+    raise ValueError("Unknown action.")
+
+def encode_action(battle, action):
+    """Battle action tuple (as returned by game.logic.ai player policies) -> wire action."""
+    kind = action[0]
+    party = battle.player.pokemon
+    if kind == "switch":
+        return ["switch", next(i for i, mon in enumerate(party) if mon is action[1])]
+    if kind == "item":
+        target = action[2] if len(action) > 2 else battle.active_player_mon
+        return ["item", action[1], next(i for i, mon in enumerate(party) if mon is target)]
+    return list(action)
+
+def apply_turn(battle, player_action, opponent_move, pending):
+    """
+    Plays one lockstep turn: pending is the one-slot list the opponent_moves callable reads from.
+    Then replaces a fainted player Pokemon with the next alive one.
+    Returns the events of the turn (empty for a quiet battle).
+    """
+    pending[0] = opponent_move
+    events = battle.execute_turn(player_action)['events']
+    if not battle.finished and battle.active_player_mon.current_hp <= 0:
+        events = events + battle.send_out(battle._get_first_alive(battle.player.pokemon))
+    return events
+
+def winner(battle):
+    if not battle.finished:
+        return None
+    return PLAYER if battle.won else OPPONENT
@@ -0,0 +1,302 @@
+import asyncio
+import itertools
+from game.logic.rng import new_seed
+from game.net import protocol as proto
+from game.net.spectator import SpectatorHub
+
+# Asyncio link battle server.
+# Clients are paired in arrival order; each pair gets a match task that owns the authoritative Battle,
+# collects both actions for a turn, checks the checksums the clients report, plays the turn and
+# broadcasts it. Connections only read lines and queue them for their match, so hundreds of matches
+# share one event loop (a turn costs microseconds of engine time).
+# With a SpectatorHub every match is also streamed to "watch" connections and local subscribers.
+#   python -m game.net.server --port 7777
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7777
+TURN_TIMEOUT = 60.0 # seconds to send an action before forfeiting
+HELLO_TIMEOUT = 10.0
+ENCODE_CACHE_SIZE = 4096
+
+class _EncodeCache:
+    """Hub messages are shared by every spectator: encode each one once. Keyed by id, so it keeps the message alive."""
+    def __init__(self, size=ENCODE_CACHE_SIZE):
+        self.size = size
+        self.entries = {} # id(message) -> (message, bytes), oldest first
+
+    def encode(self, message):
+        entry = self.entries.get(id(message))
+        if entry is not None:
+            return entry[1]
+        data = proto.encode(message)
+        if len(self.entries) >= self.size:
+            del self.entries[next(iter(self.entries))]
+        self.entries[id(message)] = (message, data)
+        return data
+
+class _Connection:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.name = None
+        self.party = None
+        self.inbox = asyncio.Queue() # messages for the match; None when the connection closed
+        self.in_match = False
+
+    async def send(self, message):
+        await self.send_many([message])
+
+    async def send_many(self, messages, encode=proto.encode):
+        if self.writer.is_closing():
+            return
+        self.writer.write(b"".join([encode(message) for message in messages]))
+        try:
+            await self.writer.drain()
+        except ConnectionError:
+            pass
+
+    async def read(self):
+        """Next message, or None on EOF / garbage."""
+        try:
+            line = await self.reader.readline()
+        except (ConnectionError, ValueError): # ValueError: line over the limit
+            return None
+        if not line:
+            return None
+        try:
+            message = proto.decode(line)
+        except ValueError:
+            return None
+        return message if isinstance(message, dict) else None
+
+    def close(self):
+        if not self.writer.is_closing():
+            self.writer.close()
+
+class _Match:
+    def __init__(self, match_id, player, opponent, seed, quiet=True):
+        self.id = match_id
+        self.conns = {proto.PLAYER: player, proto.OPPONENT: opponent}
+        self.seed = seed
+        self.sides = {
+            proto.PLAYER: {"name": player.name, "party": player.party},
+            proto.OPPONENT: {"name": opponent.name, "party": opponent.party}
+        }
+        self.pending = [None] # opponent move of the turn being played
+        self.battle = proto.build_battle(seed, self.sides[proto.PLAYER], self.sides[proto.OPPONENT],
+                                         lambda: self.pending[0], quiet=quiet)
+
+class LinkServer:
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, turn_timeout=TURN_TIMEOUT, hub=None):
+        """hub: SpectatorHub to stream matches to (None = no spectators)."""
+        self.host = host
+        self.port = port
+        self.turn_timeout = turn_timeout
+        self.hub = hub
+        self.server = None
+        self.waiting = None # connection waiting for a partner
+        self.match_ids = itertools.count(1)
+        self.tasks = set()
+        self.connections = set()
+        self.handlers = set()
+        self.spectator_cache = _EncodeCache()
+        self.stats = {'matches_started': 0, 'matches_finished': 0, 'turns': 0, 'desyncs': 0, 'forfeits': 0}
+
+    async def start(self):
+        """Starts listening. Returns the bound port (useful with port=0)."""
+        self.server = await asyncio.start_server(self._handle, self.host, self.port, limit=proto.MAX_LINE)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def serve_forever(self):
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for task in list(self.tasks):
+            task.cancel()
+        # Let the connection handlers return on their own (a cancelled handler is reported as an error)
+        for conn in list(self.connections):
+            conn.close()
+        if self.hub is not None:
+            for subs in list(self.hub.subscribers.values()):
+                for sub in list(subs):
+                    sub.close()
+        await asyncio.gather(*self.handlers, return_exceptions=True)
+
+    async def _handle(self, reader, writer):
+        conn = _Connection(reader, writer)
+        self.connections.add(conn)
+        self.handlers.add(asyncio.current_task())
+        try:
+            try:
+                hello = await asyncio.wait_for(conn.read(), HELLO_TIMEOUT)
+            except asyncio.TimeoutError:
+                hello = None
+            if hello and hello.get("type") == "watch":
+                await self._watch(conn, hello.get("match"))
+                return
+            if not hello or hello.get("type") != "hello":
+                await conn.send({"type": "error", "message": "Expected hello."})
+                return
+            error = proto.validate_party(hello.get("party"))
+            if error:
+                await conn.send({"type": "error", "message": error})
+                return
+            conn.name = str(hello.get("name", "Trainer"))[:20]
+            conn.party = hello["party"]
+            self._pair(conn)
+
+            # From here on the match task consumes what this connection sends
+            while True:
+                message = await conn.read()
+                if message is None:
+                    break
+                conn.inbox.put_nowait(message)
+        finally:
+            self.connections.discard(conn)
+            self.handlers.discard(asyncio.current_task())
+            conn.inbox.put_nowait(None)
+            if self.waiting is conn:
+                self.waiting = None
+            if not conn.in_match:
+                conn.close()
+
+    def _pair(self, conn):
+        if self.waiting is None:
+            self.waiting = conn
+            return
+        player, self.waiting = self.waiting, None
+        player.in_match = conn.in_match = True
+        match = _Match(next(self.match_ids), player, conn, new_seed(), quiet=self.hub is None)
+        task = asyncio.create_task(self._run_match(match))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def _watch(self, conn, match_id):
+        """Streams hub messages to a spectator until it disconnects (or its match ends)."""
+        if self.hub is None:
+            await conn.send({"type": "error", "message": "Spectating is off."})
+            return
+        sub = self.hub.subscribe(match_id)
+
+        async def wait_for_eof():
+            while await conn.read() is not None:
+                pass # spectators are read-only
+            sub.close()
+        eof = asyncio.create_task(wait_for_eof())
+        try:
+            while True:
+                message = await sub.get()
+                if message is None:
+                    break
+                # Everything queued meanwhile goes out in one write; a slow socket only holds up this queue
+                messages = [message] + sub.drain()
+                await conn.send_many(messages, self.spectator_cache.encode)
+                if match_id is not None and any(m["type"] == "end" for m in messages):
+                    break
+        finally:
+            sub.close()
+            eof.cancel()
+
+    async def _broadcast(self, match, message):
+        await asyncio.gather(*(conn.send(message) for conn in match.conns.values()))
+
+    async def _next_action(self, match, role, checksum):
+        """Waits for a legal action from one side. Returns (action tuple or None on disconnect, checksum ok)."""
+        conn = match.conns[role]
+        battle = match.battle
+        while True:
+            message = await conn.inbox.get()
+            if message is None:
+                return None, True
+            if message.get("type") != "action" or message.get("turn") != battle.turn + 1:
+                await conn.send({"type": "error", "message": f"Expected the action for turn {battle.turn + 1}."})
+                continue
+            try:
+                action = proto.decode_action(battle, message.get("action"), role)
+            except ValueError as e:
+                await conn.send({"type": "error", "message": str(e)})
+                continue
+            return (action, message["action"]), message.get("checksum") == checksum
+
+    async def _run_match(self, match):
+        battle = match.battle
+        self.stats['matches_started'] += 1
+        checksum = proto.state_checksum(battle)
+        for role, conn in match.conns.items():
+            other = proto.OPPONENT if role == proto.PLAYER else proto.PLAYER
+            await conn.send({"type": "start", "version": proto.PROTOCOL_VERSION, "match": match.id,
+                             "seed": match.seed, "role": role, "player": match.sides[proto.PLAYER],
+                             "opponent": match.sides[proto.OPPONENT], "checksum": checksum,
+                             "rival": match.sides[other]["name"]})
+        if self.hub is not None:
+            self.hub.open(match.id, battle)
+        winner = None
+        reason = "finished"
+        try:
+            while not battle.finished:
+                try:
+                    (p_res, p_ok), (o_res, o_ok) = await asyncio.wait_for(asyncio.gather(
+                        self._next_action(match, proto.PLAYER, checksum),
+                        self._next_action(match, proto.OPPONENT, checksum)), self.turn_timeout)
+                except asyncio.TimeoutError:
+                    reason = "timeout"
+                    self.stats['forfeits'] += 1
+                    break
+                if p_res is None or o_res is None:
+                    # A side left: the one still connected wins
+                    reason = "disconnect"
+                    winner = proto.OPPONENT if p_res is None else proto.PLAYER
+                    if p_res is None and o_res is None:
+                        winner = None
+                    self.stats['forfeits'] += 1
+                    break
+                if not (p_ok and o_ok):
+                    reason = "desync"
+                    self.stats['desyncs'] += 1
+                    break
+
+                opponent_move = o_res[0][1]
+                events = proto.apply_turn(battle, p_res[0], opponent_move, match.pending)
+                if self.hub is not None:
+                    self.hub.publish(match.id, battle, events)
+                checksum = proto.state_checksum(battle)
+                self.stats['turns'] += 1
+                await self._broadcast(match, {"type": "turn", "turn": battle.turn, "player_action": p_res[1],
+                                              "opponent_action": o_res[1], "checksum": checksum})
+            if battle.finished:
+                winner = proto.winner(battle)
+            await self._broadcast(match, {"type": "end", "winner": winner, "reason": reason})
+            self.stats['matches_finished'] += 1
+        finally:
+            if self.hub is not None:
+                self.hub.close(match.id, winner)
+            for conn in match.conns.values():
+                conn.close()
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Pykemon link battle server")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--turn-timeout", type=float, default=TURN_TIMEOUT)
+    parser.add_argument("--no-spectators", action="store_true")
+    args = parser.parse_args()
+
+    async def main():
+        server = LinkServer(args.host, args.port, args.turn_timeout,
+                            hub=None if args.no_spectators else SpectatorHub())
+        port = await server.start()
+        print(f"Link battle server listening on {args.host}:{port}")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,271 @@
+import asyncio
+from collections import deque
+
+# Spectator fan-out.
+# A SpectatorHub takes the events of live battles (one channel per battle) and hands them to any number
+# of read-only subscribers: tournament viewers, a lobby screen, replay archiving, TCP spectators.
+# Publishing never waits on a reader: every subscriber has its own bounded queue, and a reader that
+# falls behind loses queued events instead of slowing the battle down:
+#   "coalesce" (default) - the backlog is thrown away and the reader gets one fresh snapshot of each
+#                          battle it missed messages of (its "end" if it finished meanwhile), built
+#                          when it reads (so a lagging reader costs nothing while it lags)
+#   "drop"               - the oldest queued message is dropped, "end" messages included
+# maxlen bounds every message type: a reader that never reads holds at most maxlen messages plus one
+# pending snapshot per live battle (and per recent result, the hub keeps RESULT_HISTORY of them).
+# A new subscriber starts with a snapshot of every battle it follows. Views are only built for
+# readers: publishing to a battle nobody follows does not touch the Battle.
+# Everything runs on one thread (the event loop's); Subscription.get() is for asyncio readers,
+# get_nowait() / drain() for polling ones (a pygame screen, an archiver).
+#
+# Messages (dicts, JSON-friendly):
+#   {"type": "snapshot", "battle": id, "turn": int, "state": battle_view}
+#   {"type": "events", "battle": id, "turn": int, "events": [event, ...]}   (game.logic.events tuples)
+#   {"type": "end", "battle": id, "turn": int, "winner": ...}
+
+DEFAULT_MAXLEN = 64
+RESULT_HISTORY = 1024 # "end" messages kept for readers whose backlog was coalesced
+
+def battle_view(battle):
+    """What a spectator needs to draw a battle: both sides' parties and active Pokemon."""
+    def side(name, party, active):
+        return {
+            "name": name,
+            "party": [[mon.species, mon.level, mon.current_hp, mon.max_hp, mon.status] for mon in party],
+            "active": next((i for i, mon in enumerate(party) if mon is active), None)
+        }
+    return {
+        "player": side(battle.player.name, battle.player.pokemon, battle.active_player_mon),
+        "opponent": side(battle.opponent_name, battle._opponent_party(), battle.active_opponent_mon),
+        "finished": battle.finished,
+        "won": battle.won
+    }
+
+class Subscription:
+    def __init__(self, hub, channel, maxlen, on_overflow):
+        self.hub = hub
+        self.channel = channel # None = every battle
+        self.maxlen = maxlen   # None = unbounded (e.g. an archiver that drains every frame)
+        self.on_overflow = on_overflow
+        self.queue = deque()
+        self.stale = set() # battles whose queued messages were coalesced into a snapshot (or their end)
+        self.dropped = 0
+        self.closed = False
+        self._waiter = None
+
+    def push(self, message):
+        """Called by the hub. Never blocks."""
+        queue = self.queue
+        if self.maxlen is not None and len(queue) >= self.maxlen:
+            if self.on_overflow == "drop":
+                if queue:
+                    queue.popleft()
+                else:
+                    message = None # maxlen 0
+                self.dropped += 1
+            else:
+                self.dropped += len(queue) + 1
+                queue.append(message)
+                self._mark_stale(m["battle"] for m in queue)
+                queue.clear()
+                message = None
+        if message is not None:
+            queue.append(message)
+        self._wake()
+
+    def _mark_stale(self, battle_ids):
+        self.stale.update(battle_ids)
+        hub = self.hub
+        if len(self.stale) > 2 * (len(hub.battles) + RESULT_HISTORY):
+            # Forget battles that ended too long ago to have a result, so stale stays bounded as well
+            self.stale = {b for b in self.stale if b in hub.battles or b in hub.results}
+
+    def _wake(self):
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    def get_nowait(self):
+        """Next message, or None if there is nothing to read."""
+        while self.stale:
+            battle_id = self.stale.pop()
+            snapshot = self.hub.snapshot_message(battle_id)
+            if snapshot is not None:
+                # The snapshot (or the end) already covers everything queued for that battle
+                self.queue = deque(m for m in self.queue if m["battle"] != battle_id)
+                return snapshot
+        if self.queue:
+            return self.queue.popleft()
+        return None
+
+    def drain(self):
+        """Every message available now."""
+        messages = []
+        while True:
+            message = self.get_nowait()
+            if message is None:
+                return messages
+            messages.append(message)
+
+    async def get(self):
+        """Next message, waiting for one. None once the subscription is closed."""
+        while True:
+            message = self.get_nowait()
+            if message is not None or self.closed:
+                return message
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+
+    def close(self):
+        self.hub.unsubscribe(self)
+
+class SpectatorHub:
+    def __init__(self, maxlen=DEFAULT_MAXLEN, on_overflow="coalesce"):
+        self.maxlen = maxlen
+        self.on_overflow = on_overflow
+        self.battles = {}       # battle id -> Battle, while live
+        self.views = {}         # battle id -> battle_view as of the last publish, built on demand
+        self.results = {}       # battle id -> "end" message of the last RESULT_HISTORY battles, oldest first
+        self.subscribers = {}   # battle id or None -> list of Subscription
+        self.stats = {'published': 0, 'delivered': 0}
+
+    def subscribe(self, battle_id=None, maxlen=-1, on_overflow=None):
+        """
+        Follows one battle (or every battle with battle_id None). Returns a Subscription that
+        starts with a snapshot of each live battle it follows.
+        maxlen: queue bound (-1 = the hub default, None = unbounded).
+        """
+        sub = Subscription(self, battle_id, self.maxlen if maxlen == -1 else maxlen,
+                           on_overflow or self.on_overflow)
+        self.subscribers.setdefault(battle_id, []).append(sub)
+        sub.stale.update(self.battles if battle_id is None else [b for b in [battle_id] if b in self.battles])
+        return sub
+
+    def unsubscribe(self, sub):
+        subs = self.subscribers.get(sub.channel)
+        if subs and sub in subs:
+            subs.remove(sub)
+        sub.closed = True
+        sub._wake()
+
+    def snapshot_message(self, battle_id):
+        """Snapshot of a live battle, its "end" message if it finished recently, else None."""
+        battle = self.battles.get(battle_id)
+        if battle is None:
+            return self.results.get(battle_id)
+        view = self.views.get(battle_id)
+        if view is None:
+            view = self.views[battle_id] = battle_view(battle)
+        return {"type": "snapshot", "battle": battle_id, "turn": battle.turn, "state": view}
+
+    def _listened(self, battle_id):
+        return bool(self.subscribers.get(battle_id) or self.subscribers.get(None))
+
+    def _fan_out(self, battle_id, message):
+        delivered = 0
+        for key in (battle_id, None):
+            subs = self.subscribers.get(key)
+            if subs:
+                for sub in subs:
+                    sub.push(message)
+                delivered += len(subs)
+        self.stats['published'] += 1
+        self.stats['delivered'] += delivered
+
+    def open(self, battle_id, battle):
+        """A battle starts: current subscribers get a snapshot of it (opening send-outs included) on their next read."""
+        self.battles[battle_id] = battle
+        self.views.pop(battle_id, None)
+        self.results.pop(battle_id, None)
+        for key in (battle_id, None):
+            for sub in self.subscribers.get(key, ()):
+                sub._mark_stale((battle_id,))
+                sub._wake()
+
+    def publish(self, battle_id, battle, events):
+        """Events of a turn (or of a part of one, from Battle.iter_turn) of a live battle."""
+        self.battles[battle_id] = battle
+        self.views.pop(battle_id, None)
+        if self._listened(battle_id):
+            self._fan_out(battle_id, {"type": "events", "battle": battle_id, "turn": battle.turn, "events": events})
+
+    def close(self, battle_id, winner=None):
+        """The battle is over: subscribers get an "end" message and it stops being live."""
+        battle = self.battles.pop(battle_id, None)
+        self.views.pop(battle_id, None)
+        message = {"type": "end", "battle": battle_id, "turn": battle.turn if battle is not None else 0,
+                   "winner": winner}
+        self.results[battle_id] = message
+        if len(self.results) > RESULT_HISTORY:
+            del self.results[next(iter(self.results))]
+        if self._listened(battle_id):
+            self._fan_out(battle_id, message)
+
+def spectate_turn(hub, battle_id, battle, action):
+    """Plays one turn with Battle.iter_turn, publishing each batch of events as it is resolved."""
+    for events in battle.iter_turn(action):
+        hub.publish(battle_id, battle, events)
+    return battle.finished
+
+if __name__ == "__main__":
+    # Fan-out check: one battle loop feeding fast and slow local subscribers
+    import argparse
+    import time
+    from game.models.pokemon import Pokemon
+    from game.models.trainer import Player, Trainer
+    from game.logic.battle import Battle
+    from game.logic.ai import greedy_player
+
+    parser = argparse.ArgumentParser(description="Spectator hub fan-out benchmark")
+    parser.add_argument("--subscribers", type=int, default=2000)
+    parser.add_argument("--slow", type=float, default=0.5, help="fraction of subscribers that read every 20 ms")
+    parser.add_argument("--battles", type=int, default=50)
+    args = parser.parse_args()
+
+    party = [("Pyronite", 20), ("Aquaria", 20), ("Florac", 20)]
+
+    async def reader(sub, delay, counts):
+        while True:
+            message = await sub.get()
+            if message is None:
+                return
+            counts[message["type"]] = counts.get(message["type"], 0) + 1
+            if delay:
+                await asyncio.sleep(delay)
+
+    async def main():
+        hub = SpectatorHub()
+        n_slow = int(args.subscribers * args.slow)
+        fast_counts, slow_counts = {}, {}
+        subs = [hub.subscribe() for _ in range(args.subscribers)]
+        readers = [asyncio.create_task(reader(sub, 0.02 if i < n_slow else 0, slow_counts if i < n_slow else fast_counts))
+                   for i, sub in enumerate(subs)]
+        turns = 0
+        worst = 0.0
+        start = time.perf_counter()
+        for b in range(args.battles):
+            battle = Battle(Player("Red", [Pokemon(s, level=l) for s, l in party]),
+                            Trainer("Blue", [Pokemon(s, level=l) for s, l in party]), seed=b)
+            hub.open(b, battle)
+            while not battle.finished and battle.turn < 200:
+                t0 = time.perf_counter()
+                spectate_turn(hub, b, battle, greedy_player(battle))
+                if not battle.finished and battle.active_player_mon.current_hp <= 0:
+                    hub.publish(b, battle, battle.send_out(battle._get_first_alive(battle.player.pokemon)))
+                worst = max(worst, time.perf_counter() - t0)
+                turns += 1
+                await asyncio.sleep(0) # let readers run between turns, like a server would
+            hub.close(b, "player" if battle.won else "opponent")
+        elapsed = time.perf_counter() - start
+        for sub in subs:
+            sub.close()
+        await asyncio.gather(*readers)
+        dropped = sum(sub.dropped for sub in subs[:n_slow])
+        print(f"{args.battles} battles, {turns} turns to {args.subscribers} subscribers in {elapsed:.2f}s "
+              f"({hub.stats['delivered']} deliveries, slowest turn incl. fan-out {worst * 1000:.2f} ms)")
+        print(f"fast readers: {fast_counts}")
+        print(f"slow readers: {slow_counts}, {dropped} messages coalesced away")
+
+    asyncio.run(main())
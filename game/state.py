@@ -1,7 +1,11 @@
 import json
 import os
-from game.models.trainer import Player
-from game.models.pokemon import Pokemon
+from game.models.trainer import Player, Trainer
+from game.models.pokemon import Pokemon, move_list
+from game.logic.rng import dump_state, load_state
+from game.logic.battle import Battle
+
+BATTLE_SAVE_VERSION = 1
 
 class GameState:
     @staticmethod
@@ -81,7 +85,7 @@ class GameState:
                 mon.status = mon_info["status"]
                 mon.exp = mon_info.get("exp", 0)
                 mon.exp_to_next = 50 + mon.level * 10
-                mon.moves = mon_info["moves"]
+                mon.moves = move_list(mon_info["moves"])
                 return mon
 
             party_objs = [reconstruct_mon(info) for info in data["party"]]
@@ -105,3 +109,163 @@ class GameState:
             return player, f"Game loaded. Welcome back, {player.name}!"
         except Exception as e:
             return None, f"Error reconstructing player: {e}"
+
+    # Mid-battle saves
+    # A live Battle is saved next to the profile as "<name>.battle" (compact JSON, a few KB).
+    # It holds everything the fight needs on top of the overworld save: the player's party and
+    # inventory as they are mid-fight, the opponent roster, active Pokemon, turn counter,
+    # RNG state and the messages the UI had not shown yet.
+
+    @staticmethod
+    def battle_filename(player_name):
+        return f"{player_name}.battle"
+
+    @staticmethod
+    def pokemon_state(mon):
+        """Compact list form of a Pokemon: [species, level, hp, status, exp, moves]"""
+        return [mon.species, mon.level, mon.current_hp, mon.status, mon.exp, list(mon.moves)]
+
+    @staticmethod
+    def pokemon_from_state(state):
+        species, level, hp, status, exp, moves = state
+        mon = Pokemon(species, level=level)
+        mon.current_hp = hp
+        mon.status = status
+        mon.exp = exp
+        mon.moves = move_list(moves)
+        return mon
+
+    @staticmethod
+    def opponent_state(opponent, is_wild):
+        """Dict form of a battle opponent (wild Pokemon or Trainer with its roster)."""
+        if is_wild:
+            return {"party": [GameState.pokemon_state(opponent)]}
+        return {
+            "name": opponent.name,
+            "prize": opponent.prize,
+            "is_gym_leader": opponent.is_gym_leader,
+            "badge_reward": opponent.badge_reward,
+            "ai": opponent.ai,
+            "party": [GameState.pokemon_state(mon) for mon in opponent.pokemon]
+        }
+
+    @staticmethod
+    def opponent_from_state(state, is_wild):
+        party = [GameState.pokemon_from_state(s) for s in state["party"]]
+        if is_wild:
+            return party[0]
+        return Trainer(state["name"], party, prize=state["prize"], is_gym_leader=state["is_gym_leader"],
+                       badge_reward=state["badge_reward"], ai=state["ai"])
+
+    @staticmethod
+    def battle_state(battle):
+        """JSON-safe dict of everything needed to rebuild a live Battle (see battle_from_state)."""
+        player = battle.player
+        return {
+            "player_name": player.name,
+            "current_location": player.current_location,
+            "is_wild": battle.is_wild,
+            "link_battle": battle.link_battle,
+            "seed": battle.seed,
+            "turn": battle.turn,
+            "rng": dump_state(battle.rng),
+            "party": [GameState.pokemon_state(mon) for mon in player.pokemon],
+            "inventory": dict(player.inventory),
+            "active": battle._index_of(player.pokemon, battle.active_player_mon),
+            "opponent": GameState.opponent_state(battle.opponent, battle.is_wild),
+            "opponent_active": battle._index_of(battle._opponent_party(), battle.active_opponent_mon)
+        }
+
+    @staticmethod
+    def battle_from_state(player, data, quiet=False):
+        """
+        Rebuilds a Battle from battle_state() for player, whose party, inventory and location are replaced.
+        Without an "rng" entry the stream is restarted from the seed.
+        """
+        player.pokemon = [GameState.pokemon_from_state(s) for s in data["party"]]
+        player.inventory = dict(data["inventory"])
+        player.current_location = data["current_location"]
+
+        opp = data["opponent"]
+        opponent = GameState.opponent_from_state(opp, data["is_wild"])
+        opp_party = [opponent] if data["is_wild"] else opponent.pokemon
+
+        battle = Battle(player, opponent, is_wild=data["is_wild"], link_battle=data["link_battle"], seed=data["seed"],
+                        quiet=quiet)
+        # Battle start heals fainted trainer Pokemon; put the saved HP/status back
+        for mon, s in zip(opp_party, opp["party"]):
+            mon.current_hp = s[2]
+            mon.status = s[3]
+        if data["active"] is not None:
+            battle.active_player_mon = player.pokemon[data["active"]]
+        if data["opponent_active"] is not None:
+            battle.active_opponent_mon = opp_party[data["opponent_active"]]
+        battle.turn = data["turn"]
+        if "rng" in data:
+            load_state(battle.rng, data["rng"])
+        battle._begin_events() # Drop the intro events of the rebuilt battle
+        return battle
+
+    @staticmethod
+    def save_battle(battle, message_queue=None, meta=None, filename=None):
+        """
+        Saves a live Battle.
+        message_queue: log lines not shown yet. meta: small JSON-safe dict kept for the UI (e.g. story flag to set on win).
+        Returns (success, message)
+        """
+        data = GameState.battle_state(battle)
+        data["version"] = BATTLE_SAVE_VERSION
+        data["message_queue"] = list(message_queue or [])
+        data["meta"] = meta or {}
+        if not filename:
+            filename = GameState.battle_filename(battle.player.name)
+
+        try:
+            with open(filename, "w") as f:
+                json.dump(data, f, separators=(",", ":"))
+            return True, f"Battle saved as {filename}."
+        except Exception as e:
+            return False, f"Error saving battle: {e}"
+
+    @staticmethod
+    def load_battle(player, filename=None):
+        """
+        Resumes a battle saved with save_battle for an already loaded player.
+        The player's party, inventory and location are replaced by the ones from the battle save.
+        Returns ({'battle': Battle, 'message_queue': list[str], 'meta': dict}, message) or (None, error_message)
+        """
+        if not filename:
+            filename = GameState.battle_filename(player.name)
+        try:
+            with open(filename, "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None, "No battle to resume."
+        except Exception as e:
+            return None, f"Error loading battle: {e}"
+
+        try:
+            if data["version"] != BATTLE_SAVE_VERSION:
+                return None, "Battle save is from an incompatible version."
+            if data["player_name"] != player.name:
+                return None, "Battle save belongs to another player."
+            battle = GameState.battle_from_state(player, data)
+            resume = {
+                "battle": battle,
+                "message_queue": data["message_queue"],
+                "meta": data["meta"]
+            }
+            return resume, f"Battle resumed (turn {battle.turn})."
+        except Exception as e:
+            return None, f"Error reconstructing battle: {e}"
+
+    @staticmethod
+    def clear_battle(player_name, filename=None):
+        """Deletes the battle save (battle over). Returns True if a file was removed."""
+        if not filename:
+            filename = GameState.battle_filename(player_name)
+        try:
+            os.remove(filename)
+            return True
+        except FileNotFoundError:
+            return False
@@ -1,18 +1,48 @@
+import queue
 import pygame
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from game.ui.screens.base_screen import BaseScreen
 from game.logic.battle import Battle
+from game.state import GameState
+from game.logic.replay import ReplayRecorder, ReplayPlayer
+from game.logic.events import format_events
+from game.logic.damage_calc import expected_damage, ko_probability
 from game.ui.components.dialogue_box import DialogueBox
+from game.data.items_data import items as item_data
+try:
+    from game.logic.catch_analytics import catch_odds, warm_tables
+except ImportError:
+    catch_odds = None # numpy not installed: no catch hints in the bag
+
+REPLAY_MESSAGE_MS = 1200 # how long each message stays up while watching a replay
+THINKING_INDICATOR_MS = 150 # turns resolved faster than this never show the indicator
 
 class BattleScreen(BaseScreen):
-    def __init__(self, window, encounter_event):
+    def __init__(self, window, encounter_event=None, resume=None, replay=None):
         super().__init__(window)
         
         # Setup Battle Logic
-        self.battle = Battle(
-            window.player, 
-            encounter_event["opponent"], 
-            is_wild=encounter_event["is_wild"]
-        )
+        self.replay_player = None
+        if replay:
+            # Watch a recorded battle: actions come from the replay instead of the keyboard
+            self.replay_player = ReplayPlayer(replay, quiet=False)
+            self.replay_timer = 0
+            self.battle = self.replay_player.battle
+            window.player = self.battle.player
+            encounter_event = {"opponent": self.battle.opponent, "is_wild": self.battle.is_wild}
+        elif resume:
+            # Continue a battle from GameState.load_battle
+            self.battle = resume["battle"]
+            encounter_event = dict(resume["meta"])
+            encounter_event["opponent"] = self.battle.opponent
+            encounter_event["is_wild"] = self.battle.is_wild
+        else:
+            self.battle = Battle(
+                window.player, 
+                encounter_event["opponent"], 
+                is_wild=encounter_event["is_wild"]
+            )
         self.encounter_event = encounter_event
         
         # Determine Background
@@ -36,9 +66,33 @@ class BattleScreen(BaseScreen):
         self.menu_box = self.manager.get_ui_image("battle_menu_box.png")
         
         # State
-        self.state = "INTRO" 
-        self.message_queue = list(self.battle.logs) # Start with intro logs
-        self.battle.logs = [] # Clear logic logs
+        if replay:
+            self.message_queue = deque([f"Replay: {self.battle.opponent_name} {self.battle.active_opponent_mon.species}!"])
+            self.state = "INTRO"
+        elif resume:
+            self.message_queue = deque(resume["message_queue"])
+            self.state = "TEXT_WAIT" if self.message_queue else "MAIN_MENU"
+        else:
+            self.state = "INTRO" 
+            self.message_queue = deque(format_events(self.battle.events)) # Start with intro events
+        self.battle.clear_events() # Clear logic events
+        
+        # Turns are resolved on a worker thread so search AIs never stall the 60 FPS loop.
+        # While the state is THINKING the worker owns the battle: menus are closed and update()
+        # polls turn_results, which the worker fills with (kind, payload) as the turn streams in
+        # (see Battle.iter_turn), so the first hit is shown while the rest is still resolving.
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.turn_results = queue.Queue()
+        if catch_odds is not None and self.battle.is_wild:
+            # Catch tables are NumPy grids: build them now, off the UI thread, not when the bag opens
+            self.executor.submit(warm_tables)
+        self.thinking_ms = 0
+        
+        # Every live battle is recorded (seed + actions) and saved as a replay when it ends
+        self.recorder = None
+        if not replay:
+            self.recorder = ReplayRecorder(self.battle)
+            self.autosave()
         
         # Layout Constants
         self.opp_pos = (500, 50)
@@ -55,11 +109,24 @@ class BattleScreen(BaseScreen):
         self.audio.play_bgm(track)
         
     def update(self, dt):
+        if self.state == "THINKING":
+            self.thinking_ms += dt
+            self.poll_turn()
+
+        # Replay: messages advance on their own (any key still skips ahead)
+        if self.replay_player and self.dialogue_ui.visible:
+            self.replay_timer += dt
+            if self.replay_timer >= REPLAY_MESSAGE_MS:
+                self.dialogue_ui.hide()
+                self.replay_timer = 0
+
         # Message Queue Management
         if not self.dialogue_ui.visible:
             if self.message_queue:
-                msg = self.message_queue.pop(0)
+                msg = self.message_queue.popleft()
                 self.dialogue_ui.show_message(msg)
+            elif self.state == "THINKING":
+                pass # Rest of the turn not resolved yet
             elif self.battle.finished:
                 self.end_battle()
             elif self.state == "TEXT_WAIT":
@@ -69,8 +136,71 @@ class BattleScreen(BaseScreen):
         if self.state == "INTRO" and not self.message_queue and not self.dialogue_ui.visible:
             self.state = "MAIN_MENU"
 
+        # Replay: play the next recorded action whenever the UI is ready for input
+        if self.replay_player and self.state == "MAIN_MENU" and not self.dialogue_ui.visible:
+            self.submit_turn(None)
+
+    def submit_turn(self, action):
+        """Hands a turn to the worker thread. update() picks up the result."""
+        self.state = "THINKING"
+        self.thinking_ms = 0
+        self.executor.submit(self.resolve_turn, action)
+
+    def resolve_turn(self, action):
+        # Worker thread: posts ("events", batch)... then ("done", None), or ("error", exception)
+        results = self.turn_results
+        try:
+            if self.replay_player:
+                events = self.replay_player.step()
+                if events is None:
+                    results.put(("replay_over", None))
+                    return
+                results.put(("events", events))
+            else:
+                for events in self.battle.iter_turn(action):
+                    results.put(("events", events))
+            results.put(("done", None))
+        except Exception as e:
+            results.put(("error", e))
+
+    def poll_turn(self):
+        while True:
+            try:
+                kind, payload = self.turn_results.get_nowait()
+            except queue.Empty:
+                return
+            if kind == "events":
+                self.message_queue.extend(format_events(payload))
+                self.thinking_ms = 0
+            elif kind == "done":
+                self.state = "TEXT_WAIT"
+                self.autosave()
+                return
+            elif kind == "replay_over":
+                self.window.running = False # Replay over (recording stopped before the battle ended)
+                return
+            else:
+                raise payload # Engine bugs surface on the main thread, as before
+
+    def autosave(self):
+        if self.replay_player:
+            return
+        # Small JSON file (a few KB, well under a millisecond), written after every turn
+        # so quitting mid-fight can be resumed from the title screen
+        if self.battle.finished:
+            GameState.clear_battle(self.window.player.name)
+            return
+        meta = {k: v for k, v in self.encounter_event.items() if k not in ("opponent", "is_wild")}
+        GameState.save_battle(self.battle, self.message_queue, meta)
+
     def end_battle(self):
+        self.executor.shutdown(wait=False)
+        if self.replay_player:
+            self.window.running = False # Nothing to apply, the watched battle is over
+            return
         # Result handling
+        GameState.clear_battle(self.window.player.name)
+        self.recorder.save()
         if self.battle.won:
             if self.encounter_event.get("flag_on_win"):
                 self.window.player.story_flags[self.encounter_event["flag_on_win"]] = True
@@ -97,6 +227,7 @@ class BattleScreen(BaseScreen):
             return
 
         if event.type != pygame.KEYDOWN: return
+        if self.replay_player: return # Replay drives the menus
         key = event.key
             
         if self.state == "MAIN_MENU":
@@ -107,8 +238,7 @@ class BattleScreen(BaseScreen):
             elif key == pygame.K_3: # Pokemon
                 self.state = "PKMN_MENU"
             elif key == pygame.K_4: # Run
-                res = self.battle.execute_turn(("run",))
-                self.process_turn_result(res)
+                self.submit_turn(("run",))
                 
         elif self.state == "MOVE_MENU":
             moves = self.battle.active_player_mon.moves
@@ -159,9 +289,7 @@ class BattleScreen(BaseScreen):
                  # But checking recent file view of `battle.py` would help.
                  # I'll assume standard `execute_turn` logic: action=("item", item_name, target_index?).
                  # Simplest valid implementation: 
-                 res = self.battle.execute_turn(("item", item_name))
-                 self.process_turn_result(res)
-                 self.state = "TEXT_WAIT"
+                 self.submit_turn(("item", item_name))
 
         elif self.state == "PKMN_MENU":
             if key == pygame.K_ESCAPE or key == pygame.K_x:
@@ -176,19 +304,12 @@ class BattleScreen(BaseScreen):
                 # Switch
                 # Logic: Is it valid?
                 if party[idx].current_hp > 0 and party[idx] != self.battle.active_player_mon:
-                     res = self.battle.execute_turn(("switch", idx))
-                     self.process_turn_result(res)
-                     self.state = "TEXT_WAIT"
+                     self.submit_turn(("switch", party[idx]))
                 else:
                     self.message_queue.append("Cannot switch to that Pokemon!")
 
-    def process_turn_result(self, res):
-        self.message_queue.extend(res['logs'])
-        self.state = "TEXT_WAIT"
-        
     def do_move(self, move_name):
-        res = self.battle.execute_turn(("fight", move_name))
-        self.process_turn_result(res)
+        self.submit_turn(("fight", move_name))
 
     def draw(self, surface):
         # Draw BG
@@ -221,7 +342,16 @@ class BattleScreen(BaseScreen):
         # If State is MAIN_MENU or MOVE_MENU, Dialogue should be hidden usually.
         
         if not self.dialogue_ui.visible:
-            if self.state == "MAIN_MENU":
+            if self.state == "THINKING":
+                if self.thinking_ms >= THINKING_INDICATOR_MS:
+                    menu_rect = pygame.Rect(0, 420, 800, 180)
+                    pygame.draw.rect(surface, (255, 255, 255), menu_rect)
+                    pygame.draw.rect(surface, (0, 0, 0), menu_rect, 4)
+                    dots = "." * (1 + (self.thinking_ms // 300) % 3)
+                    title = self.font.render(f"Thinking{dots}", True, (0, 0, 0))
+                    surface.blit(title, (30, 450))
+
+            elif self.state == "MAIN_MENU":
                 # Draw Main Menu
                 # Use the menu_box or a simple rect
                 menu_rect = pygame.Rect(0, 420, 800, 180) # Bottom area
@@ -263,6 +393,16 @@ class BattleScreen(BaseScreen):
                     # Move Name
                     name_surf = self.font.render(m, True, (0, 0, 0))
                     surface.blit(name_surf, (x, y))
+                    
+                    # Expected damage hint (memoized, cheap to query every frame)
+                    opp_mon = self.battle.active_opponent_mon
+                    exp_dmg = expected_damage(m, self.battle.active_player_mon, opp_mon)
+                    ko = ko_probability(m, self.battle.active_player_mon, opp_mon)
+                    hint = f"~{exp_dmg:.0f} dmg"
+                    if ko > 0:
+                        hint += f" (KO {ko:.0%})"
+                    hint_surf = self.small_font.render(hint, True, (80, 80, 80))
+                    surface.blit(hint_surf, (x, y + 28))
 
             elif self.state == "BAG_MENU":
                 # Background
@@ -282,6 +422,10 @@ class BattleScreen(BaseScreen):
                         txt = f"[{i+1}] {item} x{self.window.player.inventory[item]}"
                         ts = self.font.render(txt, True, color)
                         surface.blit(ts, (100, 100 + i * 40))
+                        hint = self.catch_hint(item)
+                        if hint:
+                            hs = self.small_font.render(hint, True, (200, 200, 200))
+                            surface.blit(hs, (120 + ts.get_width(), 106 + i * 40))
                 
                 if not items:
                     ts = self.font.render("Bag is empty!", True, (255, 255, 255))
@@ -312,6 +456,18 @@ class BattleScreen(BaseScreen):
                 hint = self.small_font.render("[ESC] Cancel", True, (200, 200, 200))
                 surface.blit(hint, (50, 550))
 
+    def catch_hint(self, item_name):
+        """Catch odds text for a ball in a wild battle (table lookup, cheap every frame), else None."""
+        item = item_data.get(item_name)
+        if catch_odds is None or not self.battle.is_wild or item is None or item.category != "ball":
+            return None
+        target = self.battle.active_opponent_mon
+        try:
+            odds = catch_odds(item_name, target.species, target.level, target.current_hp)
+        except ValueError: # fainted, or outside the table (level > 100)
+            return None
+        return f"{odds['chance']:.0%} per ball, ~{odds['expected_balls']:.1f} balls (${odds['expected_cost']:.0f})"
+
     def draw_hp_bar(self, surface, mon, x, y, is_opponent):
         # Name
         name_txt = self.font.render(mon.species, True, (0, 0, 0))
@@ -80,6 +80,12 @@ class TitleScreen(BaseScreen):
         player, msg = GameState.load_game("Ash.json")
         if player:
             self.window.player = player
+            # Quit in the middle of a fight? Continue it.
+            resume, msg = GameState.load_battle(player)
+            if resume:
+                from game.ui.screens.battle_screen import BattleScreen
+                self.window.set_screen(BattleScreen, resume=resume)
+                return
             from game.ui.screens.map_screen import MapScreen
             self.window.set_screen(MapScreen)
         else:
@@ -0,0 +1,57 @@
+import argparse
+import glob
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from game.logic.replay import REPLAY_DIR, load_replay, sweep
+
+# Replay player.
+#   python play_replay.py                      # verify every replay in replays/ headless, at full speed
+#   python play_replay.py some.replay --ui     # watch one replay in the battle screen
+
+def watch(filename):
+    import pygame
+    from game.ui.window import GameWindow
+    from game.ui.screens.battle_screen import BattleScreen
+
+    replay, msg = load_replay(filename)
+    if replay is None:
+        print(msg)
+        return 1
+    pygame.init()
+    window = GameWindow(800, 600)
+    window.set_screen(BattleScreen, replay=replay)
+    try:
+        window.run()
+    finally:
+        pygame.quit()
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Play back battle replays")
+    parser.add_argument("files", nargs="*", help=f"replay files or globs (default: {REPLAY_DIR}/*.replay)")
+    parser.add_argument("--ui", action="store_true", help="watch the first replay in the battle screen")
+    args = parser.parse_args()
+
+    files = []
+    for pattern in args.files or [os.path.join(REPLAY_DIR, "*.replay")]:
+        files.extend(sorted(glob.glob(pattern)))
+    if not files:
+        print("No replays found.")
+        return 1
+    if args.ui:
+        return watch(files[0])
+
+    res = sweep(files)
+    print(f"{res['replays']} replays in {res['elapsed']:.3f}s ({res['per_sec']:,.0f}/s)")
+    for filename in res['mismatches']:
+        print(f"MISMATCH {filename}: outcome differs from the recording")
+    for filename, msg in res['errors']:
+        print(f"ERROR {filename}: {msg}")
+    return 1 if res['mismatches'] or res['errors'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,16 +4,17 @@ from game.models.pokemon import Pokemon
 from game.models.trainer import Player
 from game.logic.exploration import ExplorationLogic
 from game.logic.battle import Battle
+from game.logic.events import format_events
 from game.logic.shop import ShopLogic
 
 # Simple Terminal UI specific to modernization verification
-def print_logs(logs):
-    for log in logs:
+def print_events(events):
+    for log in format_events(events):
         print(log)
 
 def run_battle(player, opponent, is_wild):
     battle = Battle(player, opponent, is_wild)
-    print_logs(battle.logs)
+    print_events(battle.events)
     
     while not battle.finished:
         print("\n--- Battle ---")
@@ -43,9 +44,10 @@ def run_battle(player, opponent, is_wild):
              action = ("run",)
              
         if action:
-            res = battle.execute_turn(action)
-            print_logs(res['logs'])
-            if res['ended']:
+            # Print each part of the turn as soon as it is resolved
+            for events in battle.iter_turn(action):
+                print_events(events)
+            if battle.finished:
                 break
         else:
             print("Invalid input.")